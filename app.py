@@ -4,11 +4,19 @@ import pandas as pd
 from autodocstring.parser import parse_file
 from autodocstring.generator import generate_docstring
 from autodocstring.coverage import coverage_report
+from autodocstring.aggregate import CoverageTable
 from autodocstring.compliance import analyze_docstring
 from autodocstring.pydoc_report import run_pydocstyle
 from autodocstring.pep257_fixer import run_full_pep257
 from autodocstring.injector import inject_docstrings
+from autodocstring.config import load_config
+from autodocstring.tiers import TierPolicy
+from autodocstring.budget import TokenBudget
+from autodocstring.router import ModelRouter
+from autodocstring.llm_generator import get_client, warm_up
 import subprocess
+import threading
+import time
 
 if "show_code" not in st.session_state:
     st.session_state.show_code = False
@@ -128,6 +136,9 @@ if uploaded_file is not None:
         unsafe_allow_html=True,
     )
 
+    # Load the model while the file is parsed, so applying starts at once
+    warm_up(style)
+
     with st.spinner("Analyzing your code..."):
         raw = uploaded_file.read()
         source_code = raw.decode("utf-8")
@@ -209,6 +220,8 @@ if uploaded_file is not None:
                         st.success("PEP-257 Compliant")
                     else:
                         st.error("Missing: " + ", ".join(result["missing_sections"]))
+                    for warning in result["warnings"]:
+                        st.caption(f"⚠️ {warning}")
 
                     col1, col2 = st.columns(2)
                     with col1:
@@ -241,6 +254,8 @@ if uploaded_file is not None:
                                 st.error(
                                     "Missing: " + ", ".join(result["missing_sections"])
                                 )
+                            for warning in result["warnings"]:
+                                st.caption(f"⚠️ {warning}")
 
                             col1, col2 = st.columns(2)
                             with col1:
@@ -299,6 +314,11 @@ if uploaded_file is not None:
 
         st.markdown("</div>", unsafe_allow_html=True)
 
+        st.markdown("**Breakdown by Kind**")
+        table = CoverageTable()
+        table.add(file_path, parsed_data, report)
+        st.dataframe(pd.DataFrame(table.group_by("kind")), use_container_width=True)
+
         report_df = pd.DataFrame(report.items(), columns=["Metric", "Value"])
         st.download_button(
             label="⬇️ Download Coverage Report",
@@ -452,10 +472,96 @@ if uploaded_file is not None:
     if st.button(
         "✨ Apply Generated Docstrings", type="primary", use_container_width=True
     ):
+        failures = []
+        # Generation runs in a thread so this script can show each docstring
+        # as it streams in (Streamlit calls must stay in the script thread)
+        partial = {}
+        outcome = {}
+        tiers = {}
+        config = load_config()
+        budget = TokenBudget.from_config(config)
+        router = ModelRouter.from_config(config)
+
+        def run_injection():
+            try:
+                outcome["updated"] = inject_docstrings(
+                    source_code,
+                    style,
+                    errors=failures,
+                    progress=lambda name, text: partial.__setitem__(name, text),
+                    batch_tokens=config["llm_batch_tokens"],
+                    policy=TierPolicy.from_config(config),
+                    tiers=tiers,
+                    budget=budget,
+                    router=router,
+                )
+            except Exception as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=run_injection, daemon=True)
+        live = st.empty()
         with st.spinner("Generating and injecting docstrings..."):
-            updated = inject_docstrings(source_code, style)
+            worker.start()
+            while worker.is_alive():
+                if partial:
+                    name, text = list(partial.items())[-1]
+                    live.code(f"# {name}\n{text}", language="markdown")
+                time.sleep(0.2)
+            worker.join()
+        live.empty()
+        if "error" in outcome:
+            raise outcome["error"]
+        updated = outcome["updated"]
+
+        streamed = get_client().stream_summary()
+        if streamed["streams"]:
+            st.caption(
+                f"First token after {streamed['mean first token ms']:.0f} ms on "
+                f"average; {streamed['stopped early']} answer(s) stopped early, "
+                f"saving up to {streamed['tokens saved']} tokens"
+            )
+        avoided = sum(tiers.get(t, 0) for t in ("kept", "templated", "skipped"))
+        if avoided:
+            st.caption(
+                f"{avoided} LLM call(s) avoided: {tiers.get('kept', 0)} compliant "
+                f"docstring(s) kept, {tiers.get('templated', 0)} templated, "
+                f"{tiers.get('skipped', 0)} nested helper(s) skipped; "
+                f"{tiers.get('llm', 0)} sent to the LLM"
+            )
+        if budget is not None:
+            saved = budget.summary()
+            st.caption(
+                f"Token budget: {saved['outlined']} long function(s) outlined, "
+                f"{saved['prompt tokens saved']} prompt and "
+                f"{saved['reply tokens saved']} reply tokens saved"
+            )
+        if router is not None:
+            for model, route in router.summary().items():
+                if route["calls"]:
+                    st.caption(
+                        f"`{model}`: {route['calls']} call(s), "
+                        f"{route['acceptance']:.0%} accepted, "
+                        f"{route['mean ms']:.0f} ms on average, "
+                        f"{route['cache hits']} cache hit(s)"
+                    )
+                elif route["cache hits"]:
+                    st.caption(f"`{model}`: {route['cache hits']} cache hit(s)")
+        prompts = get_client().prompt_summary()
+        if prompts["prompt evals"]:
+            st.caption(
+                f"Prompt evaluation took {prompts['mean prompt eval ms']:.0f} ms "
+                f"for {prompts['mean prompt tokens']:.0f} new tokens on average"
+            )
 
-        st.success("Docstrings generated and injected successfully!", icon="🎉")
+        if failures:
+            st.warning(
+                f"{len(failures)} function(s) kept their original docstring:",
+                icon="⚠️",
+            )
+            for name, line, message in failures:
+                st.caption(f"`{name}` (line {line}): {message}")
+        else:
+            st.success("Docstrings generated and injected successfully!", icon="🎉")
 
         col1, col2 = st.columns(2)
         with col1:
@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for autodocstring.
+
+    python -m benchmarks.run --help
+
+corpus.py writes seeded synthetic source trees; run.py times every
+pipeline stage on one and compares the numbers with a stored baseline.
+prompt_eval.py measures the LLM server's prompt-eval time with and
+without prompt-prefix reuse (it needs a running server); llm_load.py
+measures injection throughput against the bundled mock server.
+"""
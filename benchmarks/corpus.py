@@ -0,0 +1,112 @@
+"""
+Seeded generator for synthetic Python corpora.
+
+The same seed and options always produce byte-identical files, so
+benchmark runs on different commits measure the same input.
+"""
+
+import random
+from pathlib import Path
+
+DECORATORS = ["@staticmethod", "@property", "@functools.lru_cache(maxsize=None)"]
+TYPES = ["int", "str", "float", "list[int]", "dict[str, int]", "None"]
+
+
+class _Module:
+    def __init__(self, rng, functions, depth, decorators, docstrings):
+        self.rng = rng
+        self.depth = depth
+        self.decorators = decorators
+        self.docstrings = docstrings
+        self.remaining = functions
+        self.lines = ["import functools", ""]
+
+    def docstring(self, pad, name, params=()):
+        if self.rng.random() >= self.docstrings:
+            return
+        self.lines.append(f'{pad}"""')
+        self.lines.append(f"{pad}Compute {name}.")
+        if params:
+            self.lines.extend(["", f"{pad}Args:"])
+            self.lines.extend(f"{pad}    {p}: A value." for p in params)
+        self.lines.append(f'{pad}"""')
+
+    def function(self, pad, level, in_class):
+        rng = self.rng
+        name = f"func_{self.remaining}"
+        self.remaining -= 1
+        if rng.random() < self.decorators:
+            decorator = rng.choice(DECORATORS) if in_class else DECORATORS[2]
+            self.lines.append(f"{pad}{decorator}")
+        names = [f"p{i}" for i in range(rng.randint(0, 4))]
+        params = ["self"] if in_class else []
+        params += [f"{p}: {rng.choice(TYPES)}" for p in names]
+        self.lines.append(
+            f"{pad}def {name}({', '.join(params)}) -> {rng.choice(TYPES)}:"
+        )
+        self.docstring(pad + "    ", name, names)
+        self.body(pad + "    ", level + 1)
+
+    def body(self, pad, level):
+        rng = self.rng
+        self.lines.append(f"{pad}total = 0")
+        self.lines.append(f"{pad}for i in range(10):")
+        self.lines.append(f"{pad}    total += i * {rng.randint(1, 9)}")
+        if rng.random() < 0.2:
+            self.lines.append(f"{pad}if total < 0:")
+            self.lines.append(f"{pad}    raise ValueError(total)")
+        if level < self.depth and self.remaining and rng.random() < 0.3:
+            self.function(pad, level, in_class=False)
+        if rng.random() < 0.1:
+            self.lines.append(f"{pad}yield total")
+        else:
+            self.lines.append(f"{pad}return total")
+
+    def klass(self, level):
+        rng = self.rng
+        self.lines.append(f"class Class{self.remaining}:")
+        self.docstring("    ", f"Class{self.remaining}")
+        self.lines.append(f"    limit = {rng.randint(1, 99)}")
+        for _ in range(rng.randint(1, 5)):
+            if not self.remaining:
+                break
+            self.lines.append("")
+            self.function("    ", level + 1, in_class=True)
+
+    def build(self):
+        while self.remaining:
+            if self.depth > 1 and self.rng.random() < 0.4:
+                self.klass(0)
+            else:
+                self.function("", 0, in_class=False)
+            self.lines.extend(["", ""])
+        return "\n".join(self.lines) + "\n"
+
+
+def generate_module(rng, functions=20, depth=2, decorators=0.2, docstrings=0.5):
+    """
+    Source text of one module with `functions` defs in total.
+
+    `depth` caps how deep defs and classes nest (1 = top-level functions
+    only), `decorators` and `docstrings` are the fraction of defs that get
+    a decorator or a docstring.
+    """
+    return _Module(rng, functions, depth, decorators, docstrings).build()
+
+
+def generate_corpus(root, files=100, seed=0, packages=4, **options):
+    """
+    Write `files` modules under `root`, spread over `packages` packages,
+    and return their paths. Extra options go to generate_module().
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    paths = []
+    for i in range(files):
+        package = root / f"pkg{i % packages}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / "__init__.py").touch()
+        path = package / f"module_{i}.py"
+        path.write_text(generate_module(rng, **options), encoding="utf-8")
+        paths.append(path)
+    return paths
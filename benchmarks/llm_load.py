@@ -0,0 +1,96 @@
+"""
+Load-test docstring injection against the bundled mock LLM server.
+
+Run with:  python -m benchmarks.llm_load [--concurrency 1 2 4 8] [--slots 4]
+
+No model is needed: the mock server answers after --latency seconds at
+--tokens-per-s and fails a seeded --error-rate fraction of requests.
+For each concurrency level the same synthetic modules are injected
+(without the LLM cache) and the table shows functions/s, the peak
+number of requests the server saw at once, and the client's retries
+and failed functions.
+"""
+
+import sys
+import time
+import random
+import argparse
+
+from autodocstring import injector, llm_generator
+from autodocstring.llm_generator import LLMClient
+from autodocstring.mock_llm import MockLLMServer
+
+from benchmarks.corpus import generate_module
+
+
+def run(sources, concurrency, backend="ollama", **server_options):
+    """Throughput and server/client counters for one concurrency level."""
+    with MockLLMServer(**server_options) as server:
+        client = LLMClient(server.url(backend), backend=backend, backoff=0.05)
+        llm_generator.set_client(client)
+        failed = []
+        started = time.perf_counter()
+        for source in sources:
+            injector.inject_docstrings(
+                source, concurrency=concurrency, errors=failed, cache=None
+            )
+        elapsed = time.perf_counter() - started
+        llm_generator.set_client(None)
+    return {
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        # Every answered request is one function (nothing is batched)
+        "functions_per_s": (
+            (server.stats["requests"] - server.stats["errors"]) / elapsed
+        ),
+        "peak concurrent": server.stats["peak concurrent"],
+        "requests": server.stats["requests"],
+        "retries": client.stats["retries"],
+        "failed": len(failed),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--files", type=int, default=5)
+    parser.add_argument("--functions", type=int, default=12, help="defs per file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--backend", choices=["ollama", "openai"], default="ollama")
+    server = parser.add_argument_group("mock server")
+    server.add_argument("--latency", type=float, default=0.05, help="seconds")
+    server.add_argument("--tokens-per-s", type=float, default=400.0)
+    server.add_argument("--error-rate", type=float, default=0.0, metavar="RATIO")
+    server.add_argument("--slots", type=int, help="requests answered at once")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    sources = [
+        generate_module(rng, functions=args.functions, docstrings=0.0)
+        for _ in range(args.files)
+    ]
+    print(
+        f"{'jobs':>5} {'seconds':>9} {'funcs/s':>9} {'peak':>6} "
+        f"{'requests':>9} {'retries':>8} {'failed':>7}"
+    )
+    for concurrency in args.concurrency:
+        r = run(
+            sources,
+            concurrency,
+            args.backend,
+            latency=args.latency,
+            tokens_per_s=args.tokens_per_s,
+            error_rate=args.error_rate,
+            slots=args.slots,
+            seed=args.seed,
+        )
+        print(
+            f"{concurrency:>5} {r['seconds']:>9.3f} {r['functions_per_s']:>9.1f} "
+            f"{r['peak concurrent']:>6} {r['requests']:>9} {r['retries']:>8} "
+            f"{r['failed']:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Benchmark CodeParser on pathologically nested functions.
+
+Run with:  python benchmarks/parser_nesting.py
+
+Every file holds the same number of functions, arranged as chains of
+nested defs of increasing depth. A parser that walks each function's
+whole subtree (the old per-function ast.walk) does O(depth) work per
+function; the single-pass CodeParser should stay flat per node.
+"""
+
+import ast
+import time
+
+from autodocstring.parser import CodeParser
+
+FUNCTIONS = 1800
+DEPTHS = [1, 10, 30, 60, 90]  # the tokenizer allows at most 100 indent levels
+REPEAT = 5
+
+
+def nested_source(depth, functions=FUNCTIONS):
+    chains = []
+    for c in range(functions // depth):
+        lines = []
+        for d in range(depth):
+            pad = "    " * d
+            lines.append(f"{pad}def f{c}_{d}(a, b: int) -> int:")
+            lines.append(f"{pad}    if a:")
+            lines.append(f"{pad}        raise ValueError(a)")
+        lines.append(f"{'    ' * depth}yield a")
+        chains.append("\n".join(lines))
+    return "\n\n".join(chains) + "\n"
+
+
+def walk_per_function(tree):
+    """Reference: the old approach, one ast.walk per function."""
+    count = 0
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            for child in ast.walk(node):
+                if isinstance(child, (ast.Raise, ast.Yield)):
+                    count += 1
+    return count
+
+
+def best_time(fn, arg):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(
+        f"{'depth':>5} {'nodes':>8} {'CodeParser ms':>14} {'us/node':>8} "
+        f"{'walk/func ms':>13} {'us/node':>8}"
+    )
+    for depth in DEPTHS:
+        tree = ast.parse(nested_source(depth))
+        nodes = sum(1 for _ in ast.walk(tree))
+
+        single = best_time(lambda t: CodeParser().visit(t), tree)
+        naive = best_time(walk_per_function, tree)
+
+        print(
+            f"{depth:>5} {nodes:>8} "
+            f"{single * 1e3:>14.1f} {single / nodes * 1e6:>8.2f} "
+            f"{naive * 1e3:>13.1f} {naive / nodes * 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare the server's prompt-eval time with and without prompt-prefix reuse.
+
+Run with:  python -m benchmarks.prompt_eval [--functions 20] [--url URL]
+
+Needs a running Ollama server (the configured one by default). The same
+functions are sent twice, each time with a fresh client:
+
+    one-piece   instructions and code in one prompt, no keep-alive or
+                warm-up (how requests were sent before)
+    prefix      instructions as the system part, an explicit keep-alive
+                and a warm-up request first
+
+and the mean prompt tokens evaluated and prompt-eval ms per answer are
+printed for both. Answers are not streamed, so every one reports timings.
+"""
+
+import sys
+import ast
+import random
+import argparse
+
+from autodocstring.llm_generator import (
+    GENERATE_OPTIONS,
+    LLMClient,
+    build_prompt,
+    build_system_prompt,
+    build_user_prompt,
+)
+
+from benchmarks.corpus import generate_module
+
+
+def _functions(count, seed):
+    source = generate_module(random.Random(seed), functions=count, depth=1)
+    return [
+        ast.unparse(node)
+        for node in ast.parse(source).body
+        if isinstance(node, ast.FunctionDef)
+    ]
+
+
+def run(codes, style, url=None, model=None):
+    """Prompt-eval summaries of both modes, keyed by mode name."""
+    results = {}
+
+    client = LLMClient(url, model, stream=False, keep_alive=None)
+    for code in codes:
+        client.generate(build_prompt(code, style), GENERATE_OPTIONS)
+    results["one-piece"] = client.prompt_summary()
+    client.close()
+
+    client = LLMClient(url, model, stream=False)
+    system = build_system_prompt(style)
+    client.warm_up(system)
+    for code in codes:
+        client.generate(build_user_prompt(code), GENERATE_OPTIONS, system=system)
+    results["prefix"] = client.prompt_summary()
+    client.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--functions", type=int, default=20)
+    parser.add_argument("--style", default="Google")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="(default: the configured endpoint)")
+    parser.add_argument("--model", help="(default: the configured model)")
+    args = parser.parse_args(argv)
+
+    configured = LLMClient.from_config()
+    results = run(
+        _functions(args.functions, args.seed),
+        args.style,
+        args.url or configured.url,
+        args.model or configured.model,
+    )
+    print(f"{'mode':<10} {'answers':>8} {'tokens':>8} {'eval ms':>9}")
+    for mode, r in results.items():
+        tokens, ms = r["mean prompt tokens"], r["mean prompt eval ms"]
+        print(
+            f"{mode:<10} {r['prompt evals']:>8} "
+            f"{tokens if tokens is None else f'{tokens:.0f}':>8} "
+            f"{ms if ms is None else f'{ms:.1f}':>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
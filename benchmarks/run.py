@@ -0,0 +1,250 @@
+"""
+Time every pipeline stage on a synthetic corpus.
+
+Run with:  python -m benchmarks.run [--files 200] [--baseline FILE]
+
+Each stage is timed best-of-N (throughput in files/s and functions/s),
+then run once more under tracemalloc for its peak memory. Results are
+written as JSON; with a baseline, any stage that got slower or bigger
+by more than --threshold is reported and the exit code is 1.
+
+    python -m benchmarks.run --update-baseline   # store current numbers
+    python -m benchmarks.run                     # compare against them
+
+benchmarks/baseline.json holds the numbers of the default corpus as
+last recorded; timings only compare on similar hardware, so re-record
+it on the machine that runs the comparison.
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+from autodocstring.coverage import coverage_report
+from autodocstring.fastscan import fast_coverage_report
+from autodocstring.generator import generate_docstring
+from autodocstring.parser import parse_file
+from autodocstring.pep257_rules import check_file
+
+from benchmarks.corpus import generate_corpus
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_OUTPUT = HERE / "results.json"
+DEFAULT_BASELINE = HERE / "baseline.json"
+# Metrics where a bigger number is worse
+COMPARED = ("seconds", "peak_kib")
+
+
+# ---------- STAGES ----------
+# Each stage takes the corpus (paths, parsed files) and returns a
+# callable that does the work once.
+def _parse(paths, parsed):
+    return lambda: [parse_file(str(p)) for p in paths]
+
+
+def _coverage(paths, parsed):
+    return lambda: [coverage_report(p) for p in parsed]
+
+
+def _fast(paths, parsed):
+    return lambda: [fast_coverage_report(str(p)) for p in paths]
+
+
+def _pep257(paths, parsed):
+    return lambda: [check_file(str(p)) for p in paths]
+
+
+def _generate(paths, parsed):
+    funcs = [
+        (f, c["class_name"]) for p in parsed for c in p["classes"] for f in c["methods"]
+    ]
+    funcs += [(f, None) for p in parsed for f in p["functions"]]
+    return lambda: [generate_docstring(f, name) for f, name in funcs]
+
+
+def _inject(paths, parsed):
+    # The LLM call is replaced by a canned answer: only the AST rewrite
+    # and unparse are timed, not the model
+    from autodocstring import injector
+
+    injector.generate_docstring_llm = lambda source, style, **kw: "Do the thing."
+    sources = [p.read_text(encoding="utf-8") for p in paths]
+    return lambda: [injector.inject_docstrings(s, cache=None) for s in sources]
+
+
+def _cli(paths, parsed):
+    root = paths[0].parent.parent
+    command = [sys.executable, "-m", "autodocstring", str(root), "--no-cache"]
+    return lambda: subprocess.run(command, capture_output=True, check=False)
+
+
+STAGES = {
+    "parse": _parse,
+    "coverage": _coverage,
+    "fast": _fast,
+    "pep257": _pep257,
+    "generate": _generate,
+    "inject": _inject,
+    "cli": _cli,
+}
+# Memory of a subprocess is not visible to tracemalloc
+NO_PEAK = {"cli"}
+
+
+def _best_time(work, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        work()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_kib(work):
+    tracemalloc.start()
+    try:
+        work()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(root, stages, repeat=3, **corpus):
+    """Generate the corpus under `root` and measure each of `stages`."""
+    paths = generate_corpus(root, **corpus)
+    parsed = [parse_file(str(p)) for p in paths]
+    functions = sum(
+        len(p["functions"]) + sum(len(c["methods"]) for c in p["classes"])
+        for p in parsed
+    )
+
+    results = {}
+    for name in stages:
+        try:
+            work = STAGES[name](paths, parsed)
+        except ImportError as e:  # e.g. the injector needs requests
+            print(f"  {name}: skipped ({e})", file=sys.stderr)
+            continue
+        seconds = _best_time(work, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "files_per_s": len(paths) / seconds,
+            "functions_per_s": functions / seconds,
+            "peak_kib": None if name in NO_PEAK else _peak_kib(work),
+        }
+    return {"files": len(paths), "functions": functions, "stages": results}
+
+
+def compare(results, baseline, threshold):
+    """
+    Regression messages for stages whose seconds or peak memory grew by
+    more than `threshold` (a fraction) over `baseline`.
+    """
+    regressions = []
+    for name, new in results["stages"].items():
+        old = baseline["stages"].get(name)
+        if old is None:
+            continue
+        for metric in COMPARED:
+            if not old.get(metric) or new.get(metric) is None:
+                continue
+            change = new[metric] / old[metric] - 1
+            if change > threshold:
+                regressions.append(
+                    f"{name}: {metric} {old[metric]:.4g} -> {new[metric]:.4g} "
+                    f"(+{change:.0%}, threshold {threshold:.0%})"
+                )
+    return regressions
+
+
+def _print_table(results, file=sys.stdout):
+    print(
+        f"{'stage':<10} {'seconds':>9} {'files/s':>10} {'functions/s':>12} "
+        f"{'peak KiB':>10}",
+        file=file,
+    )
+    for name, r in results["stages"].items():
+        peak = "-" if r["peak_kib"] is None else f"{r['peak_kib']:.0f}"
+        print(
+            f"{name:<10} {r['seconds']:>9.4f} {r['files_per_s']:>10.1f} "
+            f"{r['functions_per_s']:>12.1f} {peak:>10}",
+            file=file,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    corpus = parser.add_argument_group("corpus")
+    corpus.add_argument("--files", type=int, default=200)
+    corpus.add_argument("--functions", type=int, default=20, help="defs per file")
+    corpus.add_argument("--depth", type=int, default=2, help="max nesting of defs")
+    corpus.add_argument("--decorators", type=float, default=0.2, metavar="RATIO")
+    corpus.add_argument("--docstrings", type=float, default=0.5, metavar="RATIO")
+    corpus.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=list(STAGES),
+        default=list(STAGES),
+        help="stages to run (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown/growth over the baseline, as a fraction",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results to --baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    options = {
+        "files": args.files,
+        "functions": args.functions,
+        "depth": args.depth,
+        "decorators": args.decorators,
+        "docstrings": args.docstrings,
+        "seed": args.seed,
+    }
+    with tempfile.TemporaryDirectory(prefix="autodocstring-bench-") as root:
+        results = run_benchmarks(root, args.stages, repeat=args.repeat, **options)
+    results["corpus"] = options
+    results["python"] = platform.python_version()
+    _print_table(results)
+
+    target = args.baseline if args.update_baseline else args.output
+    target.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nWrote {target}")
+    if args.update_baseline:
+        return 0
+
+    if not args.baseline.is_file():
+        print(f"No baseline at {args.baseline}; create one with --update-baseline")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("corpus") != options:
+        print("Baseline was recorded with different corpus options; not comparing")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
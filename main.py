@@ -1,7 +1,10 @@
 import argparse
+from pathlib import Path
 from autodocstring.parser import parse_file
 from autodocstring.generator import generate_docstring
 from autodocstring.coverage import coverage_report
+from autodocstring.config import load_config
+from autodocstring.walker import Matcher, iter_files
 
 
 def main():
@@ -9,10 +12,24 @@ def main():
         description="Automated Python Docstring Generator (CLI)"
     )
 
-    parser.add_argument("path", help="Path to the Python file to analyze")
+    parser.add_argument(
+        "path", help="Python file, or folder to analyze every file under"
+    )
 
     args = parser.parse_args()
-    parsed_data = parse_file(args.path)
+    if not Path(args.path).is_dir():
+        report_file(args.path)
+        return
+
+    # Same folders and files as the CLI: ignore-dirs, .gitignore, globs
+    matcher = Matcher.from_config(load_config())
+    for file_path in iter_files([args.path], matcher):
+        print(f"\n===== {file_path} =====")
+        report_file(str(file_path))
+
+
+def report_file(path):
+    parsed_data = parse_file(path)
 
     print("\nGenerated Docstrings:\n")
 
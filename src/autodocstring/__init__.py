@@ -1 +1,16 @@
 __version__ = "0.1.0"
+
+# Public names, imported on first use so that `autodocstring --daemon`
+# does not pay for the checker's imports
+_LAZY = {
+    "iter_scan": "autodocstring.scanner",
+    "CoverageTable": "autodocstring.aggregate",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module 'autodocstring' has no attribute {name!r}")
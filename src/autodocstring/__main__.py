@@ -1,4 +1,33 @@
-from autodocstring.cli import main
+import sys
+
+
+def main(argv=None):
+    """
+    Entry point. `serve`, `llm-cache`, `mock-llm` and `--daemon` are dispatched
+    before importing the checker so the daemon client starts fast.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        from autodocstring.daemon import serve_main
+
+        return serve_main(argv[1:])
+    if argv[:1] == ["llm-cache"]:
+        from autodocstring.llm_cache import main as llm_cache_main
+
+        return llm_cache_main(argv[1:])
+    if argv[:1] == ["mock-llm"]:
+        from autodocstring.mock_llm import main as mock_llm_main
+
+        return mock_llm_main(argv[1:])
+    if "--daemon" in argv and "--watch" not in argv:
+        from autodocstring.daemon import client_main
+
+        return client_main([a for a in argv if a != "--daemon"])
+
+    from autodocstring.cli import run
+
+    return run(argv)
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,336 @@
+from array import array
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback below
+    np = None
+
+from autodocstring.walker import compile_pattern
+
+KINDS = ("function", "method", "class")
+SECTIONS = ("Parameters", "Returns", "Raises", "Yields", "Attributes")
+GROUP_KEYS = ("kind", "directory", "package", "owner", "file")
+CODEOWNERS_PATHS = ("CODEOWNERS", ".github/CODEOWNERS", "docs/CODEOWNERS")
+
+# compliant column: 1/0, or UNKNOWN for coverage-only results (--fast)
+UNKNOWN = -1
+_FUNCTION, _METHOD, _CLASS = range(3)
+
+
+def _section_mask(missing_sections):
+    # "Missing Sections" in coverage_report is "None" or "Parameters, Returns"
+    mask = 0
+    for name in missing_sections.split(", "):
+        if name in SECTIONS:
+            mask |= 1 << SECTIONS.index(name)
+    return mask
+
+
+def item_facts(parsed, report):
+    """
+    Yield (kind, documented, compliant, missing mask) for every function,
+    method and class of one file.
+
+    Compliance is not recomputed: coverage_report already lists the
+    non-compliant functions and methods in traversal order, so they are
+    matched back onto the parsed records.
+    """
+    methods = [m for c in parsed["classes"] for m in c["methods"]]
+    non_compliant = iter(report.get("Non-Compliant Items") or [])
+    pending = next(non_compliant, None)
+    coverage_only = report.get("PEP-257 Compliant") is None
+
+    for kind, items in ((_FUNCTION, parsed["functions"]), (_METHOD, methods)):
+        for item in items:
+            if coverage_only:
+                yield kind, bool(item["has_docstring"]), UNKNOWN, 0
+                continue
+            name = item["name"]
+            if item.get("class"):
+                name = f"{item['class']}.{name}"
+            if pending is not None and pending["Name"] == name:
+                mask = _section_mask(pending["Missing Sections"])
+                pending = next(non_compliant, None)
+                yield kind, bool(item["has_docstring"]), 0, mask
+            else:
+                yield kind, bool(item["has_docstring"]), 1, 0
+
+    for c in parsed["classes"]:
+        yield _CLASS, bool(c["has_docstring"]), UNKNOWN, 0
+
+
+def report_facts(report):
+    """
+    Per-item facts rebuilt from the counts of a report alone, for results
+    that carry no parsed records (--fast). Compliance is unknown.
+    """
+    for kind, total, key in (
+        (_FUNCTION, report["Functions"], "Function Coverage (%)"),
+        (_METHOD, report["Methods"], "Method Coverage (%)"),
+        (_CLASS, report["Classes"], "Class Coverage (%)"),
+    ):
+        documented = round(report[key] * total / 100)
+        for i in range(total):
+            yield kind, i < documented, UNKNOWN, 0
+
+
+# ---------- GROUP KEYS ----------
+def load_codeowners(root="."):
+    """
+    Read the first CODEOWNERS file found under `root` (GitHub locations)
+    into (compiled pattern, owners) rules. Returns [] if there is none.
+    """
+    for name in CODEOWNERS_PATHS:
+        path = Path(root) / name
+        if not path.is_file():
+            continue
+        rules = []
+        for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+            fields = line.split("#", 1)[0].split()
+            if fields:
+                rules.append((compile_pattern(fields[0]), " ".join(fields[1:])))
+        return rules
+    return []
+
+
+def _owner(path, rules):
+    # As on GitHub, the last matching rule wins
+    owners = None
+    for pattern, names in rules:
+        if pattern.match(path):
+            owners = names
+    return owners or "(unowned)"
+
+
+def _package(path):
+    # Dotted package of the directory, following __init__.py files upwards
+    parts = []
+    directory = Path(path).parent
+    while (directory / "__init__.py").is_file():
+        parts.append(directory.name)
+        if directory.parent == directory:
+            break
+        directory = directory.parent
+    return ".".join(reversed(parts)) or "(no package)"
+
+
+class CoverageTable:
+    """
+    Per-item coverage facts for a whole run, stored column by column.
+
+    Each function, method or class is one row in compact typed arrays
+    (file index, kind, documented, compliant, missing-section bitmask),
+    so a repository with hundreds of thousands of items costs a few bytes
+    per item. Totals and group-bys are computed over whole columns with
+    NumPy when it is installed, and with plain loops otherwise.
+    """
+
+    def __init__(self, root="."):
+        self.root = Path(root)
+        self.files = []
+        self.file_id = array("I")
+        self.kind = array("b")
+        self.documented = array("b")
+        self.compliant = array("b")
+        self.missing = array("B")
+        self._owners = None
+
+    def __len__(self):
+        return len(self.kind)
+
+    def add(self, path, parsed=None, report=None):
+        """Append the items of one file (parse_file + coverage_report output)."""
+        if parsed is not None:
+            facts = item_facts(parsed, report or {})
+        else:
+            facts = report_facts(report)
+        file_id = len(self.files)
+        self.files.append(str(path))
+        for kind, documented, compliant, missing in facts:
+            self.file_id.append(file_id)
+            self.kind.append(kind)
+            self.documented.append(documented)
+            self.compliant.append(compliant)
+            self.missing.append(missing)
+
+    def add_result(self, result):
+        """Append one iter_checks()/iter_scan() result; errors are skipped."""
+        if result["error"] is None:
+            self.add(result["path"], result["parsed"], result["report"])
+
+    # ---------- GROUP KEYS ----------
+    def _file_keys(self, by):
+        if by == "file":
+            return self.files
+        if by == "directory":
+            return [str(Path(f).parent) for f in self.files]
+        if by == "package":
+            return [_package(f) for f in self.files]
+        if by == "owner":
+            if self._owners is None:
+                self._owners = load_codeowners(self.root)
+            keys = []
+            for f in self.files:
+                try:
+                    rel = Path(f).resolve().relative_to(self.root.resolve())
+                except ValueError:
+                    rel = Path(f)
+                keys.append(_owner(rel.as_posix(), self._owners))
+            return keys
+        raise ValueError(f"unknown group key {by!r}, expected one of {GROUP_KEYS}")
+
+    def _group_codes(self, by):
+        """Group label list and one group code per file (or per kind)."""
+        if by == "kind":
+            return list(KINDS), None
+        labels = {}
+        codes = [labels.setdefault(k, len(labels)) for k in self._file_keys(by)]
+        return list(labels), codes
+
+    # ---------- AGGREGATION ----------
+    def _counts(self, by=None):
+        """
+        Sum the columns per group. Each group gets one list of counters:
+        items per kind (3), documented per kind (3), items with known
+        compliance, compliant items, then one count per missing section.
+        """
+        if by is None:
+            labels, codes = [None], None
+        else:
+            labels, codes = self._group_codes(by)
+        n = len(labels)
+        if np is not None:
+            return labels, self._counts_numpy(by, codes, n)
+
+        counts = [[0] * (8 + len(SECTIONS)) for _ in range(n)]
+        if by == "kind":
+            groups = self.kind
+        elif codes is None:
+            groups = bytes(len(self))
+        else:
+            groups = [codes[i] for i in self.file_id]
+        for g, kind, documented, compliant, missing in zip(
+            groups, self.kind, self.documented, self.compliant, self.missing
+        ):
+            c = counts[g]
+            c[kind] += 1
+            c[3 + kind] += documented
+            if compliant != UNKNOWN:
+                c[6] += 1
+                c[7] += compliant
+                for bit in range(len(SECTIONS)):
+                    c[8 + bit] += missing >> bit & 1
+        return labels, counts
+
+    def _counts_numpy(self, by, codes, n):
+        kind = np.frombuffer(self.kind, dtype=np.int8).astype(np.intp)
+        if by == "kind":
+            groups = kind
+        elif codes is None:
+            groups = np.zeros(len(self), dtype=np.intp)
+        else:
+            file_id = np.frombuffer(self.file_id, dtype=np.uint32)
+            groups = np.asarray(codes, dtype=np.intp)[file_id]
+
+        documented = np.frombuffer(self.documented, dtype=np.int8)
+        compliant = np.frombuffer(self.compliant, dtype=np.int8)
+        missing = np.frombuffer(self.missing, dtype=np.uint8)
+        known = compliant != UNKNOWN
+
+        # One bincount per column over (group, kind) cells
+        cells = groups * 3 + kind
+        items = np.bincount(cells, minlength=n * 3).reshape(n, 3)
+        docs = np.bincount(cells, weights=documented, minlength=n * 3).reshape(n, 3)
+        columns = [
+            items,
+            docs,
+            np.bincount(groups, weights=known, minlength=n)[:, None],
+            np.bincount(groups, weights=compliant * known, minlength=n)[:, None],
+        ]
+        for bit in range(len(SECTIONS)):
+            flagged = (missing >> bit & 1) * known
+            columns.append(np.bincount(groups, weights=flagged, minlength=n)[:, None])
+        return np.hstack(columns).astype(np.int64).tolist()
+
+    @staticmethod
+    def _row(c):
+        functions, methods, classes = c[0], c[1], c[2]
+        documented = c[3] + c[4]
+        total = functions + methods
+        checked, compliant = c[6], c[7]
+
+        def pct(done, count):
+            return done / count * 100 if count else 0
+
+        return {
+            "Functions": functions,
+            "Methods": methods,
+            "Classes": classes,
+            "Total": total,
+            "Documented": documented,
+            "Missing": total - documented,
+            "Coverage (%)": pct(documented, total),
+            "Class Coverage (%)": pct(c[5], classes),
+            "PEP-257 Compliant": compliant if checked else None,
+            "PEP-257 Compliance (%)": pct(compliant, checked) if checked else None,
+            **{
+                f"Missing {name}": c[8 + bit] if checked else None
+                for bit, name in enumerate(SECTIONS)
+            },
+        }
+
+    def totals(self):
+        """Repository-wide counts and percentages, like one big coverage_report."""
+        _, counts = self._counts()
+        return self._row(counts[0])
+
+    def group_by(self, by):
+        """
+        One row per group for `by` (see GROUP_KEYS), sorted by group.
+        Groups with no items (e.g. files without defs) are left out.
+        """
+        labels, counts = self._counts(by)
+        rows = [
+            {by.capitalize(): label, **self._row(c)}
+            for label, c in zip(labels, counts)
+            if c[0] or c[1] or c[2]
+        ]
+        return sorted(rows, key=lambda row: row[by.capitalize()])
+
+    def to_frame(self):
+        """The raw per-item columns as a pandas DataFrame (requires pandas)."""
+        import pandas as pd
+
+        files = pd.Categorical.from_codes(list(self.file_id), self.files)
+        return pd.DataFrame(
+            {
+                "file": files,
+                "kind": pd.Categorical.from_codes(list(self.kind), KINDS),
+                "documented": pd.array(list(self.documented), dtype="bool"),
+                "compliant": pd.array(
+                    [None if c == UNKNOWN else bool(c) for c in self.compliant],
+                    dtype="boolean",
+                ),
+                "missing_sections": list(self.missing),
+            }
+        )
+
+
+def format_summary(rows, by):
+    """Plain-text table of group_by() rows for the CLI."""
+    key = by.capitalize()
+    width = max([len(key)] + [len(str(row[key])) for row in rows])
+    lines = [
+        f"{key:<{width}}  {'Total':>7}  {'Missing':>7}  {'Coverage':>8}  "
+        f"{'Classes':>7}  {'Coverage':>8}  PEP-257"
+    ]
+    for row in rows:
+        compliance = row["PEP-257 Compliance (%)"]
+        compliance = "n/a" if compliance is None else f"{compliance:.2f}%"
+        lines.append(
+            f"{row[key]:<{width}}  {row['Total']:>7}  {row['Missing']:>7}  "
+            f"{row['Coverage (%)']:>7.2f}%  {row['Classes']:>7}  "
+            f"{row['Class Coverage (%)']:>7.2f}%  {compliance}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,157 @@
+"""
+Token budgets for LLM requests.
+
+A function's source goes into the prompt as written, unless it is
+longer than the budget: then the model gets an outline built from the
+AST instead (signature, raised exceptions, yields, returns and the most
+frequent calls), which is all a docstring needs. The reply is capped
+(num_predict) by what the docstring has to contain: a summary, plus a
+section entry per parameter, return value, exception and yield.
+"""
+
+import ast
+import copy
+import threading
+from collections import Counter, deque
+
+from autodocstring import profiling
+from autodocstring.llm_generator import GENERATE_OPTIONS, estimate_tokens
+
+DEFAULT_PROMPT_TOKENS = 768  # function source, on top of the instructions
+# Reply tokens: the summary, then each section entry
+SUMMARY_TOKENS = 48
+ENTRY_TOKENS = 24
+MIN_PREDICT = 64
+MAX_PREDICT = GENERATE_OPTIONS["num_predict"]
+
+_NESTED_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+
+def _own_nodes(node):
+    """Nodes of a def's body, without those of nested defs and classes."""
+    queue = deque(node.body)
+    while queue:
+        child = queue.popleft()
+        if isinstance(child, _NESTED_SCOPES):
+            continue
+        yield child
+        queue.extend(ast.iter_child_nodes(child))
+
+
+def _call_name(call):
+    try:
+        return ast.unparse(call.func)
+    except Exception:  # e.g. a synthesized node unparse cannot handle
+        return None
+
+
+def outline(node, calls=8, returns=3):
+    """
+    Source of `node` with its body reduced to what a docstring needs:
+    raise statements, a yield, up to `returns` return statements and the
+    `calls` most frequent calls (as a comment).
+    """
+    header = copy.copy(node)
+    header.body = [ast.Pass()]
+    lines = ast.unparse(header).splitlines()[:-1]  # without the pass
+    docstring = ast.get_docstring(node)
+    if docstring:
+        lines.append(f"    {ast.unparse(ast.Constant(docstring))}")
+
+    raises, yields, results, called = [], False, [], Counter()
+    for child in _own_nodes(node):
+        if isinstance(child, ast.Raise):
+            raises.append(ast.unparse(child))
+        elif isinstance(child, (ast.Yield, ast.YieldFrom)):
+            yields = True
+        elif isinstance(child, ast.Return) and child.value is not None:
+            results.append(ast.unparse(child))
+        elif isinstance(child, ast.Call):
+            name = _call_name(child)
+            if name:
+                called[name] += 1
+
+    body_lines = (node.end_lineno or node.lineno) - node.lineno
+    lines.append(f"    # body outlined ({body_lines} lines)")
+    if called:
+        names = ", ".join(name for name, _ in called.most_common(calls))
+        lines.append(f"    # calls: {names}")
+    lines += [f"    {r}" for r in dict.fromkeys(raises)]
+    if yields:
+        lines.append("    yield ...")
+    lines += [f"    {r}" for r in list(dict.fromkeys(results))[:returns]]
+    return "\n".join(lines)
+
+
+class TokenBudget:
+    """
+    Fits each function's source into `prompt_tokens` (estimated, see
+    llm_generator.estimate_tokens) and sizes its reply between
+    `min_predict` and `max_predict` tokens. `stats` counts the functions
+    outlined and the prompt and reply tokens saved.
+    """
+
+    def __init__(
+        self,
+        prompt_tokens=DEFAULT_PROMPT_TOKENS,
+        min_predict=MIN_PREDICT,
+        max_predict=MAX_PREDICT,
+    ):
+        self.prompt_tokens = prompt_tokens
+        self.min_predict = min_predict
+        self.max_predict = max_predict
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """Budget for a load_config() result, or None when llm-budget = false."""
+        if not config.get("llm_budget"):
+            return None
+        return cls(
+            prompt_tokens=config.get("llm_prompt_tokens") or DEFAULT_PROMPT_TOKENS,
+            max_predict=config.get("llm_max_predict") or MAX_PREDICT,
+        )
+
+    def _count(self, name, n):
+        with self._lock:
+            self.stats[name] += n
+        profiling.count(name, n)
+
+    def fit(self, node, source=None):
+        """The source to send for `node`: as written if it fits, else outlined."""
+        source = ast.unparse(node) if source is None else source
+        full = estimate_tokens(source)
+        if full <= self.prompt_tokens:
+            return source
+        calls, returns = 8, 3
+        short = outline(node, calls, returns)
+        while estimate_tokens(short) > self.prompt_tokens and (calls or returns):
+            calls, returns = calls // 2, returns // 2
+            short = outline(node, calls, returns)
+        self._count("outlined", 1)
+        self._count("prompt tokens saved", max(0, full - estimate_tokens(short)))
+        return short
+
+    def predict(self, record, node):
+        """num_predict for a def: its summary and section entries."""
+        params = [p for p in record.params if p.name not in ("self", "cls")]
+        returns = record.returns not in (None, "None") or any(
+            isinstance(child, ast.Return) and child.value is not None
+            for child in _own_nodes(node)
+        )
+        entries = len(params) + len(record.raises)
+        entries += returns or record.is_generator
+        wanted = SUMMARY_TOKENS + ENTRY_TOKENS * entries
+        n = max(self.min_predict, min(self.max_predict, wanted))
+        saved = GENERATE_OPTIONS["num_predict"] - n
+        self._count("reply tokens saved", max(0, saved))
+        return n
+
+    def summary(self):
+        with self._lock:
+            return {
+                "outlined": self.stats["outlined"],
+                "prompt tokens saved": self.stats["prompt tokens saved"],
+                "reply tokens saved": self.stats["reply tokens saved"],
+            }
@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
+from autodocstring import __version__
+
+CACHE_DIR = ".autodocstring_cache"
+# Bump the suffix whenever the shape of cached payloads changes
+CACHE_VERSION = f"{__version__}-6"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Files whose results a MemoryCache keeps (least recently used are dropped)
+DEFAULT_MAX_ENTRIES = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    digest TEXT, kind TEXT, payload TEXT, size INTEGER, last_used REAL,
+    PRIMARY KEY (digest, kind)
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+def content_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of per-file analysis results, keyed by content hash.
+
+    A file whose mtime and size match the last lookup skips hashing
+    entirely. Entries are stored per "kind" (e.g. "coverage", "pep257"),
+    wiped when CACHE_VERSION changes, and evicted least-recently-used
+    first once the stored payloads exceed `max_bytes`.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "fast_hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+        self._touched = {}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.directory / "results.sqlite"), timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        self._check_version()
+        self._total = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def _check_version(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row and row[0] == CACHE_VERSION:
+            return
+        with self.db:
+            self.db.execute("DELETE FROM entries")
+            self.db.execute("DELETE FROM files")
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (CACHE_VERSION,)
+            )
+
+    # ---------- LOOKUP / STORE ----------
+    def lookup(self, file_path, kind):
+        """
+        Return (payload, token). payload is None on a miss; pass the token
+        to store() once the result has been computed.
+        """
+        key = os.path.abspath(file_path)
+        st = os.stat(key)
+
+        row = self.db.execute(
+            "SELECT mtime_ns, size, digest FROM files WHERE path = ?", (key,)
+        ).fetchone()
+        fast = row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size
+        if fast:
+            digest = row[2]
+        else:
+            with open(key, "rb") as f:
+                digest = content_digest(f.read())
+
+        token = (key, st.st_mtime_ns, st.st_size, digest)
+        entry = self.db.execute(
+            "SELECT payload FROM entries WHERE digest = ? AND kind = ?", (digest, kind)
+        ).fetchone()
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None, token
+
+        self.stats["hits"] += 1
+        if fast:
+            self.stats["fast_hits"] += 1
+        else:
+            with self.db:
+                self._remember_file(token)
+        self._touched[(digest, kind)] = time.time()
+        return json.loads(entry[0]), token
+
+    def store(self, token, kind, payload):
+        data = json.dumps(payload)
+        digest = token[3]
+        with self.db:
+            old = self.db.execute(
+                "SELECT size FROM entries WHERE digest = ? AND kind = ?", (digest, kind)
+            ).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (digest, kind, data, len(data), time.time()),
+            )
+            self._remember_file(token)
+        self._total += len(data) - (old[0] if old else 0)
+        self.stats["stored"] += 1
+
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def _remember_file(self, token):
+        self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", token)
+
+    def _evict(self):
+        # Drop least recently used entries until we are at 90% of the budget
+        self._flush_touched()
+        target = self.max_bytes * 0.9
+        rows = self.db.execute(
+            "SELECT digest, kind, size FROM entries ORDER BY last_used"
+        ).fetchall()
+        doomed = []
+        for digest, kind, size in rows:
+            if self._total <= target:
+                break
+            doomed.append((digest, kind))
+            self._total -= size
+
+        with self.db:
+            self.db.executemany(
+                "DELETE FROM entries WHERE digest = ? AND kind = ?", doomed
+            )
+            self.db.execute(
+                "DELETE FROM files WHERE digest NOT IN (SELECT digest FROM entries)"
+            )
+        self.stats["evicted"] += len(doomed)
+
+    def _flush_touched(self):
+        if not self._touched:
+            return
+        with self.db:
+            self.db.executemany(
+                "UPDATE entries SET last_used = ? WHERE digest = ? AND kind = ?",
+                [(t, d, k) for (d, k), t in self._touched.items()],
+            )
+        self._touched.clear()
+
+    # ---------- HOUSEKEEPING ----------
+    def summary(self):
+        entries = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {**self.stats, "entries": entries, "bytes": self._total}
+
+    def close(self):
+        self._flush_touched()
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemoryCache:
+    """
+    In-process cache in front of an optional ResultCache, for long-lived
+    processes such as the daemon.
+
+    Results are kept as decoded payloads keyed by path and kind, and stay
+    valid while the file's mtime and size are unchanged, so a repeated
+    lookup costs one stat() and no SQLite query or JSON decoding. Misses
+    fall through to `backing` and are stored in both layers.
+    """
+
+    def __init__(self, backing=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.backing = backing
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.stats = {"hits": 0, "fast_hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def lookup(self, file_path, kind):
+        key = (os.path.abspath(file_path), kind)
+        st = os.stat(key[0])
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            self.stats["fast_hits"] += 1
+            return entry[1], None
+
+        payload, token = None, None
+        if self.backing is not None:
+            payload, token = self.backing.lookup(file_path, kind)
+        if payload is None:
+            self.stats["misses"] += 1
+            return None, (key, stamp, token)
+
+        self.stats["hits"] += 1
+        self._remember(key, stamp, payload)
+        return payload, None
+
+    def store(self, token, kind, payload):
+        key, stamp, backing_token = token
+        self._remember(key, stamp, payload)
+        self.stats["stored"] += 1
+        if self.backing is not None and backing_token is not None:
+            self.backing.store(backing_token, kind, payload)
+
+    def _remember(self, key, stamp, payload):
+        self.entries[key] = (stamp, payload)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    def summary(self):
+        # Entries/bytes describe the on-disk cache when there is one
+        backing = self.backing.summary() if self.backing is not None else {}
+        return {
+            **self.stats,
+            "entries": backing.get("entries", len(self.entries)),
+            "bytes": backing.get("bytes", 0),
+        }
+
+    def close(self):
+        if self.backing is not None:
+            self.backing.close()
+
+
+def open_cache(directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """Open the result cache, or return None if the directory is not usable."""
+    try:
+        return ResultCache(directory, max_bytes)
+    except (OSError, sqlite3.Error):
+        return None
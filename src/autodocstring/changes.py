@@ -0,0 +1,155 @@
+import re
+import subprocess
+from pathlib import Path
+
+# "@@ -12,3 +14,5 @@" -> old and new start lines and optional line counts
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def _git(args, cwd=None):
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+        )
+    except FileNotFoundError as e:
+        raise GitError("git executable not found") from e
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.strip() or f"git {args[0]} failed") from e
+    return result.stdout
+
+
+def parse_hunks(diff_text, root):
+    """
+    Turn `git diff --unified=0` output into
+    {Path: [(old_start, old_count, new_start, new_count), ...]}.
+    """
+    hunks = {}
+    current = None
+
+    for line in diff_text.splitlines():
+        if line.startswith("+++ "):
+            target = line[4:]
+            current = None
+            if target != "/dev/null":
+                current = (root / target[2:]).resolve()  # strip "b/"
+                hunks.setdefault(current, [])
+            continue
+
+        match = _HUNK.match(line)
+        if match and current is not None:
+            old_start, old_count, new_start, new_count = (
+                int(g) if g is not None else 1 for g in match.groups()
+            )
+            hunks[current].append((old_start, old_count, new_start, new_count))
+
+    return hunks
+
+
+def parse_diff(diff_text, root):
+    """
+    Turn `git diff --unified=0` output into {Path: [(start, end), ...]}.
+    Pure deletions are recorded as the single line they happened at.
+    """
+    changed = {}
+    for path, hunks in parse_hunks(diff_text, root).items():
+        changed[path] = []
+        for _, _, start, count in hunks:
+            if count == 0:
+                changed[path].append((max(start, 1), max(start, 1)))
+            else:
+                changed[path].append((start, start + count - 1))
+    return changed
+
+
+def _map_line(line, hunks):
+    """
+    The (first, last) lines of the new side that `line` of the old side
+    became, given the hunks of the diff between them.
+    """
+    delta = 0
+    for old_start, old_count, new_start, new_count in hunks:
+        if old_count == 0:  # lines inserted after old_start
+            if line <= old_start:
+                break
+        elif line < old_start:
+            break
+        elif line < old_start + old_count:  # the line itself was edited
+            last = new_start + new_count - 1 if new_count else new_start
+            return max(new_start, 1), max(last, 1)
+        delta += new_count - old_count
+    return line + delta, line + delta
+
+
+def map_ranges(ranges, hunks):
+    """Move old-side line ranges to the new side of a diff's hunks."""
+    return [(_map_line(lo, hunks)[0], _map_line(hi, hunks)[1]) for lo, hi in ranges]
+
+
+def _diff(target, cwd):
+    return _git(
+        [
+            "diff",
+            "--unified=0",
+            "--no-color",
+            "--no-ext-diff",
+            "--diff-filter=AMR",
+            *target,
+            "--",
+            "*.py",
+        ],
+        cwd,
+    )
+
+
+def changed_lines(ref=None, staged=False, cwd=None):
+    """
+    Return changed line ranges per Python file, using the local git binary.
+
+    staged=True compares the index with HEAD (what a commit would contain);
+    otherwise the working tree is compared with the merge base of `ref` and
+    HEAD, which is what a branch changed relative to `ref`. Line numbers
+    are always those of the working tree, which is what gets parsed: with
+    staged=True, unstaged edits are used to move the index's lines.
+    """
+    root = Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+
+    if not staged:
+        base = _git(["merge-base", ref, "HEAD"], cwd).strip()
+        return parse_diff(_diff([base], cwd), root)
+
+    changed = parse_diff(_diff(["--cached"], cwd), root)
+    unstaged = parse_hunks(_diff([], cwd), root)
+    return {
+        path: map_ranges(ranges, unstaged.get(path, []))
+        for path, ranges in changed.items()
+    }
+
+
+def _touches(item, ranges):
+    start = item["lineno"]
+    end = item.get("end_lineno") or start
+    return any(lo <= end and hi >= start for lo, hi in ranges)
+
+
+def filter_changed(parsed_data, ranges):
+    """
+    Keep only the functions, methods and classes whose lineno/end_lineno
+    span overlaps one of the changed line ranges.
+    """
+    functions = [f for f in parsed_data["functions"] if _touches(f, ranges)]
+
+    classes = []
+    for cls in parsed_data["classes"]:
+        if not _touches(cls, ranges):
+            continue
+        methods = [m for m in cls["methods"] if _touches(m, ranges)]
+        if isinstance(cls, dict):
+            classes.append({**cls, "methods": methods})
+        else:
+            classes.append(cls.replace(methods=methods))
+
+    return {**parsed_data, "functions": functions, "classes": classes}
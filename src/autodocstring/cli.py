@@ -1,12 +1,56 @@
 import sys
+import json
 import argparse
 from pathlib import Path
 
-from autodocstring.parser import parse_file
+from autodocstring import profiling
+from autodocstring.aggregate import GROUP_KEYS, CoverageTable, format_summary
+from autodocstring.cache import open_cache
+from autodocstring.changes import GitError, changed_lines, filter_changed
+from autodocstring.config import load_config
 from autodocstring.coverage import coverage_report
+from autodocstring.scanner import iter_checks, iter_python_files, resolve_jobs
+from autodocstring.walker import Matcher
 
 
-def main():
+def _changed_files(changed, paths, matcher):
+    """Changed files, restricted to `paths` when any were given."""
+    roots = [Path(p).resolve() for p in paths]
+    files = []
+    for file_path in sorted(changed):
+        if not file_path.is_file():
+            continue
+        if roots and not any(r == file_path or r in file_path.parents for r in roots):
+            continue
+        if not matcher.wants(file_path):
+            continue
+        try:
+            files.append(file_path.relative_to(Path.cwd().resolve()))
+        except ValueError:
+            files.append(file_path)
+    return files
+
+
+def _emit_jsonl(file_path, status, report=None, error=None):
+    record = {
+        "path": str(file_path),
+        "status": status,
+        "error": error,
+        "report": report,
+    }
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def run(argv=None, cache=None):
+    """
+    Run the checker with command-line arguments `argv` (default:
+    sys.argv[1:]) and return the exit code. Output goes to sys.stdout and
+    sys.stderr. A `cache` passed in (e.g. the daemon's in-memory cache)
+    is used instead of opening .autodocstring_cache/ and is left open.
+    Defaults come from [tool.autodocstring] in ./pyproject.toml.
+    """
+    config = load_config()
     parser = argparse.ArgumentParser(
         description="Docstring coverage checker and reporter",
         epilog="Example: python cli.py samples/ --style Google --min-coverage 80 --verbose",
@@ -14,77 +58,357 @@ def main():
     parser.add_argument(
         "paths",
         nargs="*",
-        default=["samples"],
         help="Path(s) to check (folder or files). Default: samples",
     )
     parser.add_argument(
         "--min-coverage",
         type=float,
-        default=80.0,
-        help="Minimum coverage per file (default: 80.0)",
+        default=float(config["min_coverage"]),
+        help="Minimum coverage per file (default: %(default)s)",
     )
     parser.add_argument(
         "--style",
-        default="Google",
+        default=config["style"],
         choices=["Google", "NumPy", "reST"],
-        help="Docstring style (default: Google)",
+        help="Docstring style (default: %(default)s)",
     )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Print detailed output for each file",
     )
+    parser.add_argument(
+        "--jobs",
+        default="1",
+        metavar="N",
+        help="Number of worker processes, or 'auto' for one per CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Per-file time limit (default: 60 with --jobs, none otherwise)",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Memory cap per worker process when using --jobs",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip files and folders matching GLOB (gitignore syntax), on top of "
+        "ignore-dirs and exclude in pyproject.toml; repeatable",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only check files matching GLOB instead of *.py; repeatable",
+    )
+    parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Also check files and folders listed in .gitignore files",
+    )
+    parser.add_argument(
+        "--walk-jobs",
+        type=int,
+        default=config["walk_jobs"],
+        metavar="N",
+        help="Threads listing folders (default: 1, or 16 on network file systems)",
+    )
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only check functions changed since the merge base with REF (git)",
+    )
+    changes.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only check functions changed in the git index (for pre-commit)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-analyze every file instead of using .autodocstring_cache/",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print cache hits, misses and size after the run",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Coverage only, read straight from the source without building an AST "
+        "(ignored with --changed-since/--staged)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "jsonl"],
+        default="text",
+        help="jsonl: write one JSON record per file to stdout as soon as it is "
+        "checked; messages and the summary go to stderr (default: text)",
+    )
+    parser.add_argument(
+        "--summary-by",
+        action="append",
+        choices=GROUP_KEYS,
+        default=[],
+        metavar="KEY",
+        help="After the run, print coverage rolled up by KEY: "
+        f"{', '.join(GROUP_KEYS)} (owner reads CODEOWNERS); repeatable",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the first run, re-check changed files as they are saved and "
+        "print how the totals move (Ctrl+C to stop)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run through the warm background process for this directory, "
+        "starting it if needed (see: autodocstring serve --help)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time per stage, counters and the slowest files after the run",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="FILE",
+        help="Write the --profile data as JSON to FILE",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of slowest files to list when profiling (default: 10)",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        metavar="FILE",
+        help="Run under cProfile and save pstats data to FILE "
+        "(main process only; use with --jobs 1 to see parsing)",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    files = []
-    for p in args.paths:
-        path = Path(p)
-        if path.is_dir():
-            files.extend(path.rglob("*.py"))
-        elif path.is_file() and path.suffix.lower() == ".py":
-            files.append(path)
-        else:
-            if args.verbose:
-                print(f"Skipping non-Python path: {path}")
+    if args.daemon and args.watch:
+        parser.error("--watch runs in the foreground; drop --daemon")
+    if args.daemon:
+        from autodocstring.daemon import client_main
 
-    if not files:
-        print("No Python files found.")
-        sys.exit(1)
+        argv = sys.argv[1:] if argv is None else argv
+        return client_main([a for a in argv if a != "--daemon"])
 
-    failed = []
-    print(f"Checking {len(files)} file(s)")
+    jsonl = args.format == "jsonl"
+    # With --format jsonl stdout carries only records
+    log = sys.stderr if jsonl else sys.stdout
 
-    for file_path in files:
-        try:
-            parsed = parse_file(str(file_path))
-            report = coverage_report(parsed)
+    if args.watch and (args.changed_since or args.staged or jsonl):
+        parser.error(
+            "--watch cannot be combined with --changed-since, --staged "
+            "or --format jsonl"
+        )
+
+    try:
+        jobs = resolve_jobs(args.jobs)
+    except ValueError:
+        parser.error(f"--jobs expects a positive number or 'auto', got {args.jobs!r}")
 
-            # Safe access to keys with defaults
-            coverage_pct = report.get("Coverage (%)", 0.0)
-            missing_count = report.get("Missing", 0)
+    profile = None
+    if args.profile or args.profile_json:
+        profile = profiling.enable()
 
-            if coverage_pct < args.min_coverage:
-                failed.append((file_path, coverage_pct, missing_count))
-                print(
-                    f"  {file_path}: {coverage_pct:.2f}% - missing {missing_count} items"
+    matcher = Matcher.from_config(
+        config, args.exclude, args.include, gitignore=not args.no_gitignore
+    )
+
+    changed = None
+    if args.changed_since or args.staged:
+        try:
+            changed = changed_lines(args.changed_since, staged=args.staged)
+        except GitError as e:
+            print(f"git: {e}", file=log)
+            return 1
+
+        files = _changed_files(changed, args.paths, matcher)
+        if not files:
+            print("No changed Python files.", file=log)
+            return 0
+    else:
+        skipped = []
+        with profiling.stage("discover"):
+            files = list(
+                iter_python_files(
+                    args.paths or ["samples"], skipped, matcher, args.walk_jobs
                 )
-            else:
-                if args.verbose:
-                    print(f"  {file_path}: {coverage_pct:.2f}%  OK")
+            )
+        if args.verbose:
+            for path in skipped:
+                print(f"Skipping non-Python path: {path}", file=log)
+
+        if not files:
+            print("No Python files found.", file=log)
+            return 1
+
+    totals = stamps = None
+    if args.watch:
+        from autodocstring.watch import Totals, file_stamps
+
+        # Stamped before the first run so edits made during it are re-checked
+        totals, stamps = Totals(), file_stamps(files)
+
+    cprofile = None
+    if args.profile_dump:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    failed = []
+    print(f"Checking {len(files)} file(s)", file=log)
+
+    shared = cache is not None
+    if args.no_cache:
+        cache = None
+    elif not shared:
+        cache = open_cache()
+    if cache is None and not args.no_cache and args.verbose:
+        print("Result cache unavailable, analyzing all files", file=log)
 
-        except Exception as e:
-            print(f"Error processing {file_path}: {type(e).__name__}: {str(e)}")
+    results = iter_checks(
+        files,
+        jobs=jobs,
+        timeout=args.timeout,
+        max_memory_mb=args.max_memory,
+        cache=cache,
+        # Changed-function filtering needs the full parser's line spans
+        fast=args.fast and changed is None,
+    )
+
+    table = CoverageTable() if args.summary_by else None
+
+    for result in results:
+        file_path = result["path"]
+
+        if result["error"]:
+            print(f"Error processing {file_path}: {result['error']}", file=log)
             failed.append((file_path, 0.0, "error"))
+            if jsonl:
+                _emit_jsonl(file_path, "error", error=result["error"])
+            continue
+
+        report = result["report"]
+
+        if changed is not None:
+            ranges = changed[Path(file_path).resolve()]
+            parsed = filter_changed(result["parsed"], ranges)
+            if not parsed["functions"] and not any(
+                c["methods"] for c in parsed["classes"]
+            ):
+                if args.verbose:
+                    print(f"  {file_path}: no changed functions", file=log)
+                if jsonl:
+                    _emit_jsonl(file_path, "skipped")
+                continue
+            report = coverage_report(parsed)
+            result = {**result, "parsed": parsed, "report": report}
+
+        if table is not None:
+            table.add_result(result)
+        if totals is not None:
+            totals.update(file_path, report)
+
+        # Safe access to keys with defaults
+        coverage_pct = report.get("Coverage (%)", 0.0)
+        missing_count = report.get("Missing", 0)
+
+        passed = coverage_pct >= args.min_coverage
+        if jsonl:
+            _emit_jsonl(file_path, "passed" if passed else "failed", report)
+
+        if not passed:
+            failed.append((file_path, coverage_pct, missing_count))
+            print(
+                f"  {file_path}: {coverage_pct:.2f}% - missing {missing_count} items",
+                file=log,
+            )
+        else:
+            if args.verbose:
+                print(f"  {file_path}: {coverage_pct:.2f}%  OK", file=log)
+
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(args.profile_dump)
+        print(
+            f"cProfile data written to {args.profile_dump} "
+            f"(view with: python -m pstats {args.profile_dump})",
+            file=log,
+        )
+
+    if profile is not None:
+        profiling.disable()
+        if args.profile:
+            print(f"\n{profile.format_table(args.profile_top)}", file=log)
+        if args.profile_json:
+            with open(args.profile_json, "w", encoding="utf-8") as f:
+                json.dump(profile.to_dict(args.profile_top), f, indent=2)
+
+    for by in args.summary_by:
+        print(f"\n{format_summary(table.group_by(by), by)}", file=log)
+
+    if cache is not None:
+        if args.cache_stats:
+            stats = cache.summary()
+            print(
+                f"Cache: {stats['hits']} hit(s) ({stats['fast_hits']} by mtime), "
+                f"{stats['misses']} miss(es), {stats['evicted']} evicted, "
+                f"{stats['entries']} entries / {stats['bytes'] / 1024:.1f} KiB",
+                file=log,
+            )
+        if not shared:
+            cache.close()
 
     if failed:
         print(
-            f"\nFailed: {len(failed)} file(s) below {args.min_coverage}% or had errors"
+            f"\nFailed: {len(failed)} file(s) below {args.min_coverage}% or had errors",
+            file=log,
+        )
+    else:
+        print("All checked files passed coverage check.", file=log)
+
+    if args.watch:
+        from autodocstring.watch import watch
+
+        return watch(
+            args.paths or ["samples"],
+            totals,
+            stamps,
+            timeout=args.timeout,
+            fast=args.fast,
+            min_coverage=args.min_coverage,
+            verbose=args.verbose,
+            log=log,
+            matcher=matcher,
         )
-        sys.exit(1)
+    return 1 if failed else 0
+
 
-    print("All checked files passed coverage check.")
-    sys.exit(0)
+def main():
+    sys.exit(run())
 
 
 if __name__ == "__main__":
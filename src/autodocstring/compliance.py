@@ -1,27 +1,49 @@
+from autodocstring.docsections import parse_docstring
+
+
 def analyze_docstring(func, style=None):
+    # func is a FunctionRecord or an equivalent dict
+    if func.get("docstring") is None and func.get("docstring_hash"):
+        raise ValueError(
+            f"{func['name']}: docstring body was not kept (coverage-only parse)"
+        )
+
     raw_doc = func.get("docstring") or ""
-    doc = raw_doc.lower()
+    parsed = parse_docstring(raw_doc)
     missing = []
     formatting_issues = []
     warnings = []
     # ---------- SECTION COMPLETENESS ----------
-    if func["params"] and not any(k in doc for k in ["param", "args", "parameters"]):
+    params = [p["name"] if not isinstance(p, str) else p for p in func["params"]]
+    if func.get("class") and params and params[0] in ("self", "cls"):
+        params = params[1:]
+    if params and not parsed.documents("Parameters"):
         missing.append("Parameters")
+    elif params:
+        documented = parsed.entries("Parameters")
+        for param in params:
+            if param not in documented:
+                warnings.append(f"param `{param}` declared but undocumented")
 
-    if func["returns"] and "return" not in doc:
+    returns = func["returns"] not in (None, "", "None")
+    if returns and not func["is_generator"] and not parsed.documents("Returns"):
         missing.append("Returns")
 
-    if func["raises"] and "raise" not in doc:
+    if func["raises"] and not parsed.documents("Raises"):
         missing.append("Raises")
 
-    if func["is_generator"] and "yield" not in doc:
+    if func["is_generator"] and not parsed.documents("Yields"):
         missing.append("Yields")
 
-    if func.get("class") and func.get("attributes") and "attribute" not in doc:
+    if (
+        func.get("class")
+        and func.get("attributes")
+        and not parsed.documents("Attributes")
+    ):
         missing.append("Attributes")
     # ---------- SUMMARY LINE CHECK ----------
     if raw_doc:
-        first_line = raw_doc.strip().split("\n")[0].strip()
+        first_line = parsed.summary
 
         if not first_line:
             formatting_issues.append("Empty summary line")
@@ -37,13 +59,15 @@ def analyze_docstring(func, style=None):
         formatting_issues.append("Missing summary line")
     # ---------- STYLE-SPECIFIC CHECK ----------
     if style and raw_doc:
-        if style == "Google" and "args:" not in doc:
+        # Only a Parameters section written in another style is a mismatch
+        found = parsed.styles.get("Parameters")
+        if style == "Google" and found != "Google":
             warnings.append("Google style expects 'Args:' section")
 
-        if style == "NumPy" and "parameters" not in doc:
+        if style == "NumPy" and found != "NumPy":
             warnings.append("NumPy style expects 'Parameters' section")
 
-        if style == "reST" and ":param" not in doc:
+        if style == "reST" and found != "reST":
             warnings.append("reST style expects ':param:' fields")
     return {
         "missing_sections": missing,
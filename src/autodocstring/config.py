@@ -1,14 +1,47 @@
 import tomllib
 from pathlib import Path
 
+from autodocstring.tiers import DEFAULT_TEMPLATE_BELOW
+from autodocstring.walker import DEFAULT_INCLUDE
 
-def load_config():
-    path = Path("pyproject.toml")
+
+def load_config(path="pyproject.toml"):
+    """
+    Settings from the [tool.autodocstring] table of `path`, over the
+    defaults. Keys are written with dashes in pyproject.toml
+    (min-coverage, ignore-dirs) and returned with underscores. The old
+    [tool.autodoc] table is still read, with lower priority.
+    """
+    path = Path(path)
 
     defaults = {
         "style": "Google",
         "min_coverage": 80,
         "enforce_pep257": True,
+        "ignore_dirs": [],  # on top of walker.DEFAULT_IGNORE_DIRS
+        "exclude": [],
+        "include": list(DEFAULT_INCLUDE),
+        "gitignore": True,
+        "walk_jobs": None,
+        "llm_backend": None,  # "ollama" (default) or "openai"
+        "llm_url": None,  # default: the backend's own endpoint
+        "llm_model": None,
+        "llm_keep_alive": None,  # default: llm_generator.DEFAULT_KEEP_ALIVE
+        "llm_batch_tokens": None,  # e.g. 2048 to batch small functions
+        # Token budgets (see budget.TokenBudget)
+        "llm_budget": False,
+        "llm_prompt_tokens": None,  # default: budget.DEFAULT_PROMPT_TOKENS
+        "llm_max_predict": None,  # default: budget.MAX_PREDICT
+        # Model routing (see router.ModelRouter): a list of
+        # {model, max-signature, max-lines, max-complexity, max-raises,
+        #  max-yields} tables, smallest model first
+        "llm_routes": [],
+        "llm_escalate": True,
+        # Tiered generation (see tiers.TierPolicy); off: everything to the LLM
+        "tiers": False,
+        "tier_keep_compliant": True,
+        "tier_template_below": DEFAULT_TEMPLATE_BELOW,
+        "tier_nested": "template",
     }
 
     if not path.exists():
@@ -17,4 +50,8 @@ def load_config():
     with open(path, "rb") as f:
         data = tomllib.load(f)
 
-    return {**defaults, **data.get("tool", {}).get("autodoc", {})}
+    tool = data.get("tool", {})
+    config = dict(defaults)
+    for table in (tool.get("autodoc", {}), tool.get("autodocstring", {})):
+        config.update({key.replace("-", "_"): value for key, value in table.items()})
+    return config
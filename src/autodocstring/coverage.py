@@ -2,6 +2,7 @@ from autodocstring.compliance import analyze_docstring
 
 
 def coverage_report(parsed_data):
+    # Accepts parse_file() output: FunctionRecord/ClassRecord lists or plain dicts
     functions = parsed_data["functions"]
     classes = parsed_data["classes"]
     methods = [m for c in classes for m in c["methods"]]
@@ -11,7 +12,10 @@ def coverage_report(parsed_data):
     # ✅ NEW: collect non-compliant details
     non_compliant_items = []
 
-    for item in all_items:
+    # Coverage-only parses keep no docstring bodies, so compliance is unknown
+    coverage_only = parsed_data.get("coverage_only", False)
+
+    for item in [] if coverage_only else all_items:
         result = analyze_docstring(item)
 
         if result["pep257_compliant"]:
@@ -61,10 +65,12 @@ def coverage_report(parsed_data):
             documented_classes / len(classes) * 100 if classes else 0
         ),
         # ---------- COMPLIANCE ----------
-        "PEP-257 Compliant": compliant,
-        "PEP-257 Compliance (%)": (compliant / total * 100) if total else 0,
+        "PEP-257 Compliant": None if coverage_only else compliant,
+        "PEP-257 Compliance (%)": (
+            None if coverage_only else (compliant / total * 100) if total else 0
+        ),
         # ---------- MISSING SECTIONS ----------
-        **{f"Missing {k}": v for k, v in missing.items()},
+        **{f"Missing {k}": None if coverage_only else v for k, v in missing.items()},
         # ---------- ✅ NEW ADDITION ----------
         "Non-Compliant Items": non_compliant_items,
     }
@@ -0,0 +1,318 @@
+"""
+Warm analysis daemon and its thin client.
+
+`autodocstring serve` listens on a Unix domain socket and runs checks in
+a long-lived process, so repeated invocations (e.g. one pre-commit batch
+after another) skip interpreter start-up and imports and reuse results
+held in memory. `autodocstring --daemon ...` sends its arguments to the
+daemon for the current directory, starting one if none is running, and
+streams back the same output and exit code the CLI would produce.
+
+Protocol: one JSON object per line. The client sends {"argv", "cwd",
+"version"} (or {"stop": true}); the daemon answers with {"out": text}
+and {"err": text} chunks and a final {"exit": code}, or {"restart": true}
+when it was started by a different version.
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import socket
+import hashlib
+import argparse
+from contextlib import redirect_stderr, redirect_stdout
+
+from autodocstring import __version__
+
+# The daemon exits after this many seconds without a request
+DEFAULT_IDLE_TIMEOUT = 600.0
+# How long a client waits for a freshly spawned daemon to accept
+SPAWN_TIMEOUT = 10.0
+
+
+def runtime_dir():
+    """The current user's directory for daemon sockets (created 0700)."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if not base:
+        import tempfile
+
+        base = tempfile.gettempdir()
+    return os.path.join(base, f"autodocstring-{os.getuid()}")
+
+
+def default_socket_path(root=None):
+    """Socket of the daemon for `root` (default: the current directory)."""
+    root = os.path.realpath(root or os.getcwd())
+    digest = hashlib.blake2b(root.encode(), digest_size=8).hexdigest()
+    # AF_UNIX paths are limited to ~100 bytes, so they never go under root
+    return os.path.join(runtime_dir(), f"{digest}.sock")
+
+
+def _send(conn, message):
+    conn.sendall(json.dumps(message).encode() + b"\n")
+
+
+class _SocketStream:
+    """Text stream that forwards complete lines to the client as they come."""
+
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+        self.pending = ""
+
+    def write(self, text):
+        self.pending += text
+        if "\n" in self.pending:
+            head, _, self.pending = self.pending.rpartition("\n")
+            _send(self.conn, {self.name: head + "\n"})
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            _send(self.conn, {self.name: self.pending})
+            self.pending = ""
+
+    def isatty(self):
+        return False
+
+
+# ---------- SERVER ----------
+def _private_dir(path):
+    """Create `path` 0700, or check that the existing one is ours and private."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or st.st_uid != os.getuid()
+        or stat.S_IMODE(st.st_mode) & 0o077
+    ):
+        raise PermissionError(f"{path} is not a private directory of this user")
+
+
+def _listen(socket_path):
+    """Bound listening socket, or None if a live daemon already owns the path."""
+    # Other users cannot reach a socket in a private directory, from bind on
+    if os.path.dirname(socket_path) == runtime_dir():
+        _private_dir(runtime_dir())
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(socket_path)
+    except OSError:
+        if _connect(socket_path) is not None:
+            sock.close()
+            return None
+        os.unlink(socket_path)  # stale, left behind by a daemon that died
+        sock.bind(socket_path)
+    sock.listen(16)
+    return sock
+
+
+def _run_request(request, conn, cache):
+    from autodocstring import cli, profiling
+
+    out = _SocketStream(conn, "out")
+    err = _SocketStream(conn, "err")
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                code = cli.run(request["argv"], cache=cache)
+            except SystemExit as e:  # argparse errors and --help
+                code = e.code
+                if isinstance(code, str):
+                    print(code, file=sys.stderr)
+                    code = 1
+                code = code or 0
+            except Exception:
+                import traceback
+
+                traceback.print_exc()
+                code = 1
+            out.flush()
+            err.flush()
+    finally:
+        # Never let one request's --profile leak into the next
+        profiling.disable()
+    _send(conn, {"exit": code})
+
+
+def _handle(conn, cache):
+    """Serve one connection; returns False when the daemon should exit."""
+    with conn.makefile("rb") as reader:
+        line = reader.readline()
+    if not line:
+        return True
+    request = json.loads(line)
+
+    if request.get("stop"):
+        _send(conn, {"exit": 0})
+        return False
+    if request.get("version") != __version__ or request.get("cwd") != os.getcwd():
+        _send(conn, {"restart": True})
+        return False
+
+    _run_request(request, conn, cache)
+    return True
+
+
+def serve(socket_path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Run the daemon in the current directory until it has been idle for
+    `idle_timeout` seconds or is told to stop. Requests are handled one
+    at a time. Returns 0, also when another daemon already serves the path.
+    """
+    from autodocstring.cache import MemoryCache, open_cache
+
+    socket_path = socket_path or default_socket_path()
+    sock = _listen(socket_path)
+    if sock is None:
+        return 0
+    inode = os.stat(socket_path).st_ino
+    cache = MemoryCache(open_cache())
+    sock.settimeout(idle_timeout)
+
+    try:
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except socket.timeout:
+                break
+            with conn:
+                conn.settimeout(None)
+                try:
+                    if not _handle(conn, cache):
+                        break
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client went away (e.g. Ctrl+C); keep serving
+    finally:
+        sock.close()
+        try:
+            # Only remove the socket if a newer daemon has not replaced it
+            if os.stat(socket_path).st_ino == inode:
+                os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+        cache.close()
+    return 0
+
+
+def serve_main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="autodocstring serve",
+        description="Keep a warm analysis process for `autodocstring --daemon`",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Unix socket path, in a directory only you can access "
+        "(default: derived from the current directory)",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        metavar="SECONDS",
+        help="Exit after this long without requests "
+        f"(default: {DEFAULT_IDLE_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the daemon for the current directory and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        conn = _connect(args.socket or default_socket_path())
+        if conn is None:
+            print("No daemon running.", file=sys.stderr)
+            return 1
+        with conn:
+            _send(conn, {"stop": True})
+            conn.makefile("rb").readline()
+        return 0
+    return serve(args.socket, args.idle_timeout)
+
+
+# ---------- CLIENT ----------
+def _connect(socket_path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _spawn(socket_path, idle_timeout):
+    import subprocess
+
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "autodocstring",
+            "serve",
+            "--socket",
+            socket_path,
+            "--idle-timeout",
+            str(idle_timeout),
+        ],
+        cwd=os.getcwd(),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        conn = _connect(socket_path)
+        if conn is not None:
+            return conn
+        time.sleep(0.02)
+    return None
+
+
+def _request(conn, argv):
+    """Send argv and relay the reply; returns the exit code or None (restart)."""
+    with conn:
+        _send(conn, {"argv": argv, "cwd": os.getcwd(), "version": __version__})
+        for line in conn.makefile("rb"):
+            message = json.loads(line)
+            if "out" in message:
+                sys.stdout.write(message["out"])
+                sys.stdout.flush()
+            elif "err" in message:
+                sys.stderr.write(message["err"])
+                sys.stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+            elif message.get("restart"):
+                return None
+    raise ConnectionError("daemon closed the connection")
+
+
+def client_main(argv, socket_path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Run the CLI with `argv` through the daemon for the current directory,
+    starting it if needed. Falls back to running in this process when Unix
+    sockets are unavailable or the daemon cannot be reached.
+    """
+    if hasattr(socket, "AF_UNIX"):
+        socket_path = socket_path or default_socket_path()
+        for _ in range(2):  # a second try after a version-mismatch restart
+            conn = _connect(socket_path) or _spawn(socket_path, idle_timeout)
+            if conn is None:
+                break
+            try:
+                code = _request(conn, argv)
+            except (ConnectionError, ValueError):
+                break
+            if code is not None:
+                return code
+            time.sleep(0.05)  # let the old daemon release the socket
+
+    from autodocstring.cli import run
+
+    return run(argv)
@@ -0,0 +1,166 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Section header (any style, lowercased) -> canonical section name
+SECTION_ALIASES = {
+    "args": "Parameters",
+    "arguments": "Parameters",
+    "parameters": "Parameters",
+    "params": "Parameters",
+    "keyword args": "Parameters",
+    "keyword arguments": "Parameters",
+    "other parameters": "Parameters",
+    "returns": "Returns",
+    "return": "Returns",
+    "yields": "Yields",
+    "yield": "Yields",
+    "raises": "Raises",
+    "raise": "Raises",
+    "exceptions": "Raises",
+    "attributes": "Attributes",
+    "examples": "Examples",
+    "example": "Examples",
+    "notes": "Notes",
+    "note": "Notes",
+    "see also": "See Also",
+    "references": "References",
+    "warnings": "Warnings",
+    "warning": "Warnings",
+    "warns": "Warns",
+    "todo": "Todo",
+    "methods": "Methods",
+}
+
+# reST field name -> canonical section name (":type x:" etc. add nothing new)
+REST_FIELDS = {
+    "param": "Parameters",
+    "parameter": "Parameters",
+    "arg": "Parameters",
+    "argument": "Parameters",
+    "key": "Parameters",
+    "keyword": "Parameters",
+    "returns": "Returns",
+    "return": "Returns",
+    "rtype": "Returns",
+    "yields": "Yields",
+    "yield": "Yields",
+    "ytype": "Yields",
+    "raises": "Raises",
+    "raise": "Raises",
+    "except": "Raises",
+    "exception": "Raises",
+    "ivar": "Attributes",
+    "cvar": "Attributes",
+    "var": "Attributes",
+}
+
+# Sections whose entries are names worth checking
+_NAMED = ("Parameters", "Raises", "Attributes")
+_REST_FIELD = re.compile(r":(\w+)([^:]*):")
+_GOOGLE_HEADER = re.compile(r"([A-Za-z][A-Za-z ]*?)\s*:$")
+_NUMPY_UNDERLINE = re.compile(r"-{3,}$")
+# "name (type): ...", "*args: ...", "x, y : int", "ValueError: ...", "pkg.Error"
+_ENTRY = re.compile(r"\*{0,2}([\w.]+(?:\s*,\s*\*{0,2}[\w.]+)*)\s*(?:\(|:|$)")
+
+
+class DocstringSections(NamedTuple):
+    """
+    A docstring split into summary and sections.
+
+    `sections` maps canonical names ("Parameters", "Returns", ...) to the
+    entry names listed under them; `styles` maps the same names to the
+    style they were written in ("Google", "NumPy" or "reST"). Instances are
+    cached and shared, so treat them as read-only.
+    """
+
+    summary: str
+    sections: dict
+    styles: dict
+
+    def documents(self, section):
+        return section in self.sections
+
+    def entries(self, section):
+        return self.sections.get(section, ())
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip())
+
+
+def _entry_names(text):
+    match = _ENTRY.match(text)
+    if match is None:
+        return []
+    return [name.strip().lstrip("*") for name in match.group(1).split(",")]
+
+
+@lru_cache(maxsize=4096)
+def parse_docstring(docstring):
+    """
+    Parse a (cleaned) docstring once; Google, NumPy and reST sections are
+    all recognised, so the result does not depend on the configured style.
+    """
+    docstring = (docstring or "").strip()
+    lines = docstring.expandtabs().splitlines()
+    summary = lines[0].strip() if lines else ""
+    sections = {}
+    styles = {}
+
+    def add(name, style, entries=()):
+        styles.setdefault(name, style)
+        sections.setdefault(name, []).extend(entries)
+
+    # Open section: (canonical name, style, header indent, entry indent)
+    current = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        i += 1
+        if not stripped:
+            continue
+        indent = _indent(line)
+
+        field = _REST_FIELD.match(stripped)
+        if field and field.group(1).lower() in REST_FIELDS:
+            name = REST_FIELDS[field.group(1).lower()]
+            # ":param int x:" documents x, ":raises ValueError:" ValueError
+            entries = field.group(2).split()[-1:] if name in _NAMED else []
+            add(name, "reST", entries)
+            current = None
+            continue
+
+        alias = SECTION_ALIASES.get(stripped.lower())
+        if alias and i < len(lines) and _NUMPY_UNDERLINE.match(lines[i].strip()):
+            add(alias, "NumPy")
+            current = (alias, "NumPy", indent, indent)
+            i += 1  # skip the underline
+            continue
+
+        header = _GOOGLE_HEADER.match(stripped)
+        alias = header and SECTION_ALIASES.get(header.group(1).lower())
+        if alias:
+            add(alias, "Google")
+            current = (alias, "Google", indent, None)
+            continue
+
+        if current is None:
+            continue
+        name, style, header_indent, entry_indent = current
+        if style == "Google":
+            if indent <= header_indent:
+                current = None  # dedent back to the text closes the section
+                continue
+            if entry_indent is None:
+                entry_indent = indent
+                current = (name, style, header_indent, entry_indent)
+        if indent == entry_indent:
+            sections[name].extend(_entry_names(stripped))
+
+    return DocstringSections(
+        summary,
+        {name: tuple(entries) for name, entries in sections.items()},
+        styles,
+    )
@@ -0,0 +1,192 @@
+import re
+
+from autodocstring import profiling
+from autodocstring.parser import parse_file
+from autodocstring.coverage import coverage_report
+
+# Any string literal, with an optional prefix (captured to spot f/b strings)
+_STRING = (
+    r"(?<![\w])(?P<prefix>[rRbBuUfF]{0,2})"
+    r"(?:\"\"\"(?:\\[\s\S]|[^\\])*?\"\"\"|'''(?:\\[\s\S]|[^\\])*?'''"
+    r"|\"(?:\\[\s\S]|[^\"\\\n])*\"|'(?:\\[\s\S]|[^'\\\n])*')"
+)
+# What the scanner stops at: comments, strings (to skip their contents)
+# and compound statement keywords at the start of a line, which is where
+# blocks open and close
+_TOKEN = re.compile(
+    rf"(?P<comment>#[^\n]*)|(?P<string>{_STRING})"
+    r"|^(?P<indent>[ \t]*)(?:async[ \t]+)?(?P<keyword>def|class|if|elif|else"
+    r"|for|while|with|try|except|finally|match|case)\b",
+    re.M,
+)
+_HEADER_TOKEN = re.compile(rf"#[^\n]*|{_STRING}|\\\n|[()\[\]{{}}:\n]")
+_NAME = re.compile(r"[ \t]+\w+[ \t]*(?P<next>.)")
+_LINE_REST = re.compile(r"[ \t]*(?:#[^\n]*)?")
+_BLANK_LINES = re.compile(r"(?:[ \t]*(?:#[^\n]*)?\n)*(?P<indent>[ \t]*)")
+_ONE_STRING = re.compile(_STRING)
+_STATEMENT_END = re.compile(r"[ \t]*(?:#[^\n]*)?(?:\n|;|$)")
+_CONCAT = re.compile(r"[ \t]*(?:\\\n[ \t]*)?")
+_CONTINUED = re.compile(r"[ \t]*\\\n")
+
+
+class NeedsFullParse(Exception):
+    """The source is unusual enough that only ast.parse can decide."""
+
+
+def _width(indent):
+    return len(indent.expandtabs(8))
+
+
+def _header_end(text, pos, keyword):
+    """Index just past the ':' that closes a def/class header."""
+    name = _NAME.match(text, pos)
+    if name is None:
+        raise NeedsFullParse(f"malformed {keyword} header")
+    if keyword == "def" and name.group("next") not in "([":
+        raise NeedsFullParse("malformed def header")
+
+    brackets = 0
+    pos = name.start("next")
+    while True:
+        m = _HEADER_TOKEN.search(text, pos)
+        if m is None:
+            raise NeedsFullParse(f"unterminated {keyword} header")
+        tok = m.group()
+        pos = m.end()
+        if tok in "([{":
+            brackets += 1
+        elif tok in ")]}":
+            brackets -= 1
+        elif tok == ":" and brackets == 0:
+            # "def f(): \" puts the body (and any docstring) on the next line
+            if _CONTINUED.match(text, pos):
+                raise NeedsFullParse(f"{keyword} header continued with a backslash")
+            return pos
+        elif tok == "\n" and brackets == 0:
+            raise NeedsFullParse(f"unterminated {keyword} header")
+
+
+def _opens_with_docstring(text, pos):
+    """Whether the statement starting at `pos` is a lone plain string."""
+    if text.startswith("(", pos):
+        raise NeedsFullParse("parenthesized first statement")
+
+    seen = False
+    while True:
+        m = _ONE_STRING.match(text, pos)
+        if m is None:
+            break
+        # f-strings and bytes are not docstrings (ast.get_docstring returns None)
+        if set(m.group("prefix").lower()) & {"b", "f"}:
+            return False
+        seen = True
+        pos = _CONCAT.match(text, m.end()).end()
+
+    return seen and _STATEMENT_END.match(text, pos) is not None
+
+
+def scan_source(source):
+    """
+    Count defs/classes and how many open with a docstring, straight from
+    the source text: only comments, strings and def/class keywords are
+    looked at, so no tokens or AST nodes are built.
+
+    Uses the same rules as CodeParser: a def whose innermost enclosing
+    def/class is a class counts as a method, every other def as a function.
+    Does not validate syntax beyond the headers; raises NeedsFullParse when
+    the text cannot be decided safely.
+    """
+    if isinstance(source, bytes):
+        try:
+            source = source.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            raise NeedsFullParse(str(e)) from e
+    source = source.replace("\r\n", "\n").replace("\r", "\n")
+
+    kinds = ["functions", "methods", "classes"]
+    counts = dict.fromkeys(kinds + [f"documented_{k}" for k in kinds], 0)
+    scopes = []  # (keyword, indent width) of the enclosing defs/classes
+    pos = 0
+
+    while True:
+        m = _TOKEN.search(source, pos)
+        if m is None:
+            break
+        pos = m.end()
+        keyword = m.group("keyword")
+        if keyword is None:
+            continue
+
+        indent = _width(m.group("indent"))
+        while scopes and scopes[-1][1] >= indent:
+            scopes.pop()
+        if keyword not in ("def", "class"):
+            continue
+
+        if keyword == "class":
+            kind = "classes"
+        elif scopes and scopes[-1][0] == "class":
+            kind = "methods"
+        else:
+            kind = "functions"
+        counts[kind] += 1
+
+        body = _LINE_REST.match(source, _header_end(source, pos, keyword)).end()
+        if body < len(source) and source[body] == "\n":
+            first = _BLANK_LINES.match(source, body + 1)
+            if first.end() == len(source) or _width(first.group("indent")) <= indent:
+                raise NeedsFullParse("expected an indented block")
+            scopes.append((keyword, indent))
+            body = first.end()
+
+        if _opens_with_docstring(source, body):
+            counts[f"documented_{kind}"] += 1
+
+    return counts
+
+
+def fast_coverage_report(file_path):
+    """
+    Coverage-only report for one file, built without an AST.
+
+    Has the same keys as coverage_report(); compliance fields are None.
+    Falls back to parse_file + coverage_report (coverage-only) when the
+    text is not conclusive, e.g. for malformed def/class headers.
+    """
+    with profiling.stage("read"):
+        with open(file_path, "rb") as f:
+            source = f.read()
+    profiling.count("bytes read", len(source))
+
+    try:
+        with profiling.stage("fastscan"):
+            c = scan_source(source)
+    except NeedsFullParse:
+        return coverage_report(parse_file(file_path, coverage_only=True))
+
+    functions, methods, classes = c["functions"], c["methods"], c["classes"]
+    total = functions + methods
+    documented = c["documented_functions"] + c["documented_methods"]
+
+    def pct(done, count):
+        return done / count * 100 if count else 0
+
+    return {
+        "Functions": functions,
+        "Classes": classes,
+        "Methods": methods,
+        "Total": total,
+        "Documented": documented,
+        "Missing": total - documented,
+        "Coverage (%)": pct(documented, total),
+        "Function Coverage (%)": pct(c["documented_functions"], functions),
+        "Method Coverage (%)": pct(c["documented_methods"], methods),
+        "Class Coverage (%)": pct(c["documented_classes"], classes),
+        "PEP-257 Compliant": None,
+        "PEP-257 Compliance (%)": None,
+        **{
+            f"Missing {k}": None
+            for k in ["Parameters", "Returns", "Raises", "Yields", "Attributes"]
+        },
+        "Non-Compliant Items": [],
+    }
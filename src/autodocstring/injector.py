@@ -1,64 +1,296 @@
 import ast
-from autodocstring.llm_generator import generate_docstring_llm
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from autodocstring.llm_cache import get_cache
+from autodocstring.llm_generator import (
+    generate_docstring_llm,
+    generate_docstrings_batch,
+)
+from autodocstring.tiers import function_record, template_docstring
+
+# LLM requests in flight at once; Ollama queues whatever it cannot run
+# in parallel (OLLAMA_NUM_PARALLEL), so a few more cost nothing
+DEFAULT_CONCURRENCY = 4
+
+
+def _docstring_node(raw_body):
+    # Strip any triple quotes the LLM might have added
+    body = raw_body.strip()
+    for q in ['"""', "'''"]:
+        if body.startswith(q) and body.endswith(q):
+            body = body[len(q) : -len(q)].strip()
+
+    # Remove any leading/trailing junk
+    body = body.strip()
+
+    # Build clean docstring (we add the quotes here only once)
+    docstring = f"\n{    body}\n    "
+
+    return ast.Expr(value=ast.Constant(value=docstring))
+
+
+def _set_docstring(node, doc_node):
+    # Replace existing docstring or insert at the beginning
+    if node.body and isinstance(node.body[0], ast.Expr):
+        if isinstance(node.body[0].value, ast.Constant) and isinstance(
+            node.body[0].value.value, str
+        ):
+            # Replace old docstring
+            node.body[0] = doc_node
+        else:
+            # Insert new one
+            node.body.insert(0, doc_node)
+    else:
+        node.body.insert(0, doc_node)
 
 
 class DocstringInjector(ast.NodeTransformer):
-    """Injects clean PEP 257 docstrings into functions and methods."""
+    """
+    Injects clean PEP 257 docstrings into functions and methods.
+
+    Works in two phases: visiting the tree only collects the functions
+    (inner ones before the function containing them), then inject()
+    asks the LLM for all of them at once, at most `concurrency` requests
+    at a time, and splices the answers back in that same order. With a
+    `cache`, unchanged and duplicated functions are not sent again.
+
+    With `batch_tokens`, the functions of one module or class body are
+    packed several to a request (see generate_docstrings_batch), as many
+    as fit in that many tokens, so the instructions are evaluated once
+    per batch instead of once per function.
 
-    def __init__(self, style: str = "Google"):
+    With a `policy` (tiers.TierPolicy), compliant docstrings are kept,
+    simple functions get an instant template and only the rest go to
+    the LLM; `tiers` counts the functions that went to each tier.
+
+    With a `budget` (budget.TokenBudget), long functions are sent as an
+    outline and each reply is capped by the sections it needs. With a
+    `router` (router.ModelRouter), each function goes to the model its
+    size and shape call for (batches use the default model).
+    """
+
+    def __init__(
+        self,
+        style: str = "Google",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        cache=None,
+        progress=None,
+        batch_tokens=None,
+        policy=None,
+        budget=None,
+        router=None,
+    ):
         self.style = style
+        self.concurrency = max(1, concurrency)
+        self.cache = cache  # LLMCache, or None
+        # Called as progress(function name, partial docstring) while streaming
+        self.progress = progress
+        self.batch_tokens = batch_tokens
+        self.policy = policy
+        self.budget = budget
+        self.router = router
+        self.tiers = Counter()
+        self.targets = []
+        self.scopes = []  # enclosing class/function of each target
+        self.nested = []  # whether each target is inside another function
+        self._scope = []
+        self._targets = []  # (name, source) pairs being generated
+        # (function name, line, "ExceptionName: message") per failed function
+        self.errors = []
 
-    def visit_FunctionDef(self, node):
+    def _visit_scope(self, node):
+        self._scope.append(node)
         self.generic_visit(node)
+        self._scope.pop()
 
-        try:
-            source = ast.unparse(node)
-            raw_body = generate_docstring_llm(source, self.style)
-
-            # Strip any triple quotes the LLM might have added
-            body = raw_body.strip()
-            for q in ['"""', "'''"]:
-                if body.startswith(q) and body.endswith(q):
-                    body = body[len(q) : -len(q)].strip()
-
-            # Remove any leading/trailing junk
-            body = body.strip()
-
-            # Build clean docstring (we add the quotes here only once)
-            docstring = f"\n{    body}\n    "
-
-            doc_node = ast.Expr(value=ast.Constant(value=docstring))
-
-            # Replace existing docstring or insert at the beginning
-            if node.body and isinstance(node.body[0], ast.Expr):
-                if isinstance(node.body[0].value, ast.Constant) and isinstance(
-                    node.body[0].value.value, str
-                ):
-                    # Replace old docstring
-                    node.body[0] = doc_node
-                else:
-                    # Insert new one
-                    node.body.insert(0, doc_node)
-            else:
-                node.body.insert(0, doc_node)
-
-        except Exception as e:
-            print(f"Docstring generation failed for {node.name}: {e}")
+    def visit_ClassDef(self, node):
+        self._visit_scope(node)
+        return node
 
+    def visit_FunctionDef(self, node):
+        self._visit_scope(node)
+        self.targets.append(node)
+        self.scopes.append(self._scope[-1] if self._scope else None)
+        self.nested.append(any(isinstance(s, ast.FunctionDef) for s in self._scope))
         return node
 
+    def _generate_one(self, target):
+        name, source, options = target
+        on_progress = None
+        if self.progress is not None:
+
+            def on_progress(text):
+                self.progress(name, text)
+
+        generate = generate_docstring_llm
+        if self.router is not None:
+            generate = self.router.generate
+        try:
+            return generate(
+                source,
+                self.style,
+                cache=self.cache,
+                on_progress=on_progress,
+                **options,
+            )
+        except Exception as e:  # reported per function by inject()
+            return e
+
+    def _generate_group(self, group):
+        results = generate_docstrings_batch(
+            [source for _, source, _ in group],
+            self.style,
+            cache=self.cache,
+            budget=self.batch_tokens,
+        )
+        if self.progress is not None:
+            for (name, _, _), result in zip(group, results):
+                if not isinstance(result, Exception):
+                    self.progress(name, result)
+        return results
+
+    def _jobs(self, scopes):
+        """Groups of target indexes sent together (one each unless batching)."""
+        if self.batch_tokens is None:
+            return [[i] for i in range(len(scopes))]
+        # One job per module/class body; it is split by the token budget
+        groups = {}
+        for i, scope in enumerate(scopes):
+            groups.setdefault(id(scope), []).append(i)
+        return list(groups.values())
+
+    def _run(self, job):
+        if self.batch_tokens is None:
+            return [self._generate_one(self._targets[job[0]])]
+        return self._generate_group([self._targets[i] for i in job])
+
+    def _generate(self, targets, scopes):
+        """
+        One docstring or exception per (name, source, options), in the
+        order given; options are extra arguments of the generate call.
+        """
+        self._targets = targets
+        jobs = self._jobs(scopes)
+        if self.concurrency == 1 or len(jobs) < 2:
+            done = [self._run(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(min(self.concurrency, len(jobs))) as pool:
+                done = list(pool.map(self._run, jobs))
+
+        results = [None] * len(targets)
+        for job, answers in zip(jobs, done):
+            for i, answer in zip(job, answers):
+                results[i] = answer
+        return results
 
-def inject_docstrings(source_code: str, style: str = "Google") -> str:
+    def _record(self, i):
+        scope = self.scopes[i]
+        return function_record(
+            self.targets[i], scope.name if isinstance(scope, ast.ClassDef) else None
+        )
+
+    def _tier(self, i):
+        """The tier of target i and its FunctionRecord (None without a policy)."""
+        if self.policy is None:
+            return "llm", None
+        record = self._record(i)
+        tier = self.policy.choose(record, self.targets[i], self.style, self.nested[i])
+        return tier, record
+
+    def inject(self, tree):
+        """
+        Add a docstring to every function in `tree` (in place), except
+        those the policy keeps or skips.
+        """
+        self.targets, self.scopes, self.nested = [], [], []
+        self.visit(tree)
+        # Sources are taken before any docstring is spliced in, so every
+        # request sees the code as written
+        sources = [ast.unparse(node) for node in self.targets]
+        pending = []
+        for i, node in enumerate(self.targets):
+            tier, record = self._tier(i)
+            self.tiers[tier] += 1
+            if tier == "llm":
+                pending.append((i, record))
+            elif tier == "templated":
+                doc = template_docstring(record, self.style)
+                _set_docstring(node, _docstring_node(doc))
+
+        targets = []
+        for i, record in pending:
+            node, options = self.targets[i], {}
+            if record is None and (self.budget is not None or self.router is not None):
+                record = self._record(i)
+            if self.budget is not None:
+                sources[i] = self.budget.fit(node, sources[i])
+                options["num_predict"] = self.budget.predict(record, node)
+            if self.router is not None:
+                options.update(record=record, node=node)
+            targets.append((node.name, sources[i], options))
+
+        nodes = [self.targets[i] for i, _ in pending]
+        results = self._generate(targets, [self.scopes[i] for i, _ in pending])
+        for node, result in zip(nodes, results):
+            if isinstance(result, Exception):
+                print(f"Docstring generation failed for {node.name}: {result}")
+                self.errors.append(
+                    (node.name, node.lineno, f"{type(result).__name__}: {result}")
+                )
+                continue
+            _set_docstring(node, _docstring_node(result))
+        return tree
+
+
+def inject_docstrings(
+    source_code: str,
+    style: str = "Google",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    errors=None,
+    cache=True,
+    progress=None,
+    batch_tokens=None,
+    policy=None,
+    tiers=None,
+    budget=None,
+    router=None,
+) -> str:
     """
     Parse source code and inject docstrings into all functions/methods.
+
+    Up to `concurrency` LLM requests run at once. A function whose
+    docstring could not be generated is left as it was and, if `errors`
+    is a list, (name, line, message) is appended to it. Answers are
+    reused from `cache`: True for the shared .autodocstring_cache/ one,
+    an LLMCache, or None to always ask the model. `progress(name, text)`
+    is called with each function's partial docstring as it streams in.
+    With `batch_tokens`, small functions of the same class or module are
+    asked for together in prompts of about that many tokens.
+
+    A tiers.TierPolicy as `policy` keeps compliant docstrings and
+    templates simple functions instead of asking the LLM; if `tiers` is
+    a dict, the number of functions per tier is added to it. A
+    budget.TokenBudget as `budget` outlines long functions and caps each
+    reply; its stats add up the tokens saved. A router.ModelRouter as
+    `router` picks the model per function.
     """
     try:
         tree = ast.parse(source_code)
     except SyntaxError as e:
         raise SyntaxError(f"Invalid Python code: {str(e)}")
 
-    transformer = DocstringInjector(style=style)
-    new_tree = transformer.visit(tree)
+    if cache is True:
+        cache = get_cache()
+    transformer = DocstringInjector(
+        style, concurrency, cache, progress, batch_tokens, policy, budget, router
+    )
+    new_tree = transformer.inject(tree)
+    if errors is not None:
+        errors.extend(transformer.errors)
+    if tiers is not None:
+        for tier, count in transformer.tiers.items():
+            tiers[tier] = tiers.get(tier, 0) + count
 
     ast.fix_missing_locations(new_tree)
     return ast.unparse(new_tree)
@@ -0,0 +1,112 @@
+"""
+Wire formats of the LLM servers LLMClient can talk to.
+
+A backend turns a request into the JSON body its server expects and
+reads answers back, streamed or not, as (text, done, timings) where
+timings is (prompt tokens, prompt-eval seconds) or None. The client
+keeps everything else (connection pool, retries, circuit breaker,
+stop checks) the same for every backend.
+
+    ollama   Ollama's /api/generate
+    openai   an OpenAI-compatible /v1/chat/completions (llama.cpp
+             server, vLLM, LM Studio, ...)
+"""
+
+import json
+
+
+class LLMError(RuntimeError):
+    """The LLM server could not produce an answer (after retries)."""
+
+
+class OllamaBackend:
+    name = "ollama"
+    default_url = "http://localhost:11434/api/generate"
+
+    def payload(self, model, prompt, system, options, stream, keep_alive=None):
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": options,
+        }
+        if keep_alive is not None:  # None: the server's own default
+            payload["keep_alive"] = keep_alive
+        if system is not None:
+            payload["system"] = system
+        return payload
+
+    def event(self, line):
+        """The decoded JSON of one line of a streamed answer (NDJSON)."""
+        return json.loads(line)
+
+    def read(self, data):
+        if data.get("error"):
+            raise LLMError(f"LLM server error: {data['error']}")
+        timings = None
+        # Timings come with the last chunk (or the whole answer) only
+        if data.get("done"):
+            timings = (
+                data.get("prompt_eval_count", 0),
+                data.get("prompt_eval_duration", 0) / 1e9,
+            )
+        return data.get("response", ""), bool(data.get("done")), timings
+
+
+class OpenAIBackend:
+    name = "openai"
+    default_url = "http://localhost:8080/v1/chat/completions"
+    # Ollama option names and their OpenAI equivalents
+    OPTIONS = {
+        "temperature": "temperature",
+        "top_p": "top_p",
+        "num_predict": "max_tokens",
+    }
+
+    def payload(self, model, prompt, system, options, stream, keep_alive=None):
+        # keep_alive has no equivalent: such servers keep their model loaded
+        messages = [{"role": "user", "content": prompt}]
+        if system is not None:
+            messages.insert(0, {"role": "system", "content": system})
+        payload = {"model": model, "messages": messages, "stream": stream}
+        for name, value in options.items():
+            if name in self.OPTIONS:
+                payload[self.OPTIONS[name]] = value
+        return payload
+
+    def event(self, line):
+        """The decoded JSON of one server-sent event, or None for others."""
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.startswith("data:"):
+            return None  # comments and other SSE fields
+        data = line[5:].strip()
+        return {"done": True} if data == "[DONE]" else json.loads(data)
+
+    def read(self, data):
+        if data.get("error"):
+            error = data["error"]
+            raise LLMError(f"LLM server error: {error.get('message', error)}")
+        choice = (data.get("choices") or [{}])[0]
+        message = choice.get("message")
+        text = (message or choice.get("delta") or {}).get("content") or ""
+        # llama.cpp's server adds prompt timings to the last chunk
+        timings = data.get("timings")
+        if timings and "prompt_n" in timings:
+            timings = (timings["prompt_n"], timings.get("prompt_ms", 0) / 1e3)
+        else:
+            timings = None
+        return text, message is not None or bool(data.get("done")), timings
+
+
+BACKENDS = {backend.name: backend for backend in (OllamaBackend, OpenAIBackend)}
+
+
+def get_backend(name):
+    """A backend instance by name (see BACKENDS)."""
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown LLM backend {name!r}; choose from {', '.join(BACKENDS)}"
+        ) from None
@@ -0,0 +1,287 @@
+"""
+Persistent cache of generated docstrings.
+
+Entries are keyed by a hash of everything that decides the answer: the
+normalized function source (ast.unparse output), the style, the model
+and a hash of the prompt template. Unchanged functions and helpers
+duplicated across modules are therefore generated once. The cache
+lives next to the result cache (.autodocstring_cache/llm.sqlite) and
+can be exported to / imported from a JSON-lines file to share a warmed
+cache within a team:
+
+    autodocstring llm-cache export warm.jsonl
+    autodocstring llm-cache import warm.jsonl
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from autodocstring.cache import CACHE_DIR, content_digest
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Entries are regenerated after this long even if still used
+DEFAULT_MAX_AGE = 30 * 24 * 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY, payload TEXT, size INTEGER,
+    created REAL, last_used REAL
+);
+CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used);
+"""
+
+
+def cache_key(*parts):
+    """Hash of the parts (source, style, model, prompt version) of a request."""
+    return content_digest(json.dumps(parts).encode())
+
+
+class LLMCache:
+    """
+    SQLite store of LLM answers, safe to share between threads.
+
+    Entries older than `max_age` seconds are treated as missing and
+    purged; once the stored answers exceed `max_bytes` the least recently
+    used ones are dropped. get() also merges concurrent requests: while
+    one thread generates the answer for a key, other threads asking for
+    the same key wait for it instead of sending their own request.
+    """
+
+    def __init__(
+        self,
+        directory=CACHE_DIR,
+        max_bytes=DEFAULT_MAX_BYTES,
+        max_age=DEFAULT_MAX_AGE,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "merged": 0,
+            "stored": 0,
+            "evicted": 0,
+            "expired": 0,
+        }
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Future of the thread generating it
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(
+            str(self.directory / "llm.sqlite"), timeout=30, check_same_thread=False
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        with self.db:
+            self._expire()
+        self._total = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM answers"
+        ).fetchone()[0]
+
+    # ---------- LOOKUP / STORE ----------
+    def _expire(self):
+        cursor = self.db.execute(
+            "DELETE FROM answers WHERE created < ?", (time.time() - self.max_age,)
+        )
+        self.stats["expired"] += cursor.rowcount
+
+    def lookup(self, key):
+        """The cached answer for `key`, or None."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT payload, created FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None or row[1] < now - self.max_age:
+                self.stats["misses"] += 1
+                return None
+            with self.db:
+                self.db.execute(
+                    "UPDATE answers SET last_used = ? WHERE key = ?", (now, key)
+                )
+            self.stats["hits"] += 1
+            return json.loads(row[0])
+
+    def store(self, key, payload, created=None):
+        data = json.dumps(payload)
+        now = time.time()
+        with self._lock:
+            with self.db:
+                old = self.db.execute(
+                    "SELECT size FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+                self.db.execute(
+                    "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), created or now, now),
+                )
+            self._total += len(data) - (old[0] if old else 0)
+            self.stats["stored"] += 1
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def get(self, key, generate):
+        """
+        The answer for `key`: from the cache, from a thread already
+        generating it, or from generate() (then stored). Exceptions from
+        generate() reach every caller waiting on it and are not cached.
+        """
+        payload = self.lookup(key)
+        if payload is not None:
+            return payload
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["merged"] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            payload = generate()
+            self.store(key, payload)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(payload)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return payload
+
+    def _evict(self):
+        # Drop least recently used answers until we are at 90% of the budget
+        target = self.max_bytes * 0.9
+        rows = self.db.execute(
+            "SELECT key, size FROM answers ORDER BY last_used"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._total <= target:
+                break
+            doomed.append((key,))
+            self._total -= size
+        with self.db:
+            self.db.executemany("DELETE FROM answers WHERE key = ?", doomed)
+        self.stats["evicted"] += len(doomed)
+
+    # ---------- SHARING ----------
+    def export(self, path):
+        """Write every live entry to `path` as JSON lines; returns the count."""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT key, payload, created FROM answers WHERE created >= ?",
+                (time.time() - self.max_age,),
+            ).fetchall()
+        with open(path, "w", encoding="utf-8") as f:
+            for key, payload, created in rows:
+                record = {"key": key, "payload": json.loads(payload)}
+                f.write(json.dumps({**record, "created": created}) + "\n")
+        return len(rows)
+
+    def import_entries(self, path):
+        """
+        Add the entries of an export() file, keeping their age. Existing
+        newer entries win. Returns the number of entries taken.
+        """
+        added = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                with self._lock:
+                    row = self.db.execute(
+                        "SELECT created FROM answers WHERE key = ?", (record["key"],)
+                    ).fetchone()
+                if row is not None and row[0] >= record["created"]:
+                    continue
+                if record["created"] < time.time() - self.max_age:
+                    continue
+                self.store(record["key"], record["payload"], record["created"])
+                added += 1
+        return added
+
+    # ---------- HOUSEKEEPING ----------
+    def clear(self):
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM answers")
+            self._total = 0
+
+    def summary(self):
+        with self._lock:
+            entries = self.db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        return {**self.stats, "entries": entries, "bytes": self._total}
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_llm_cache(directory=CACHE_DIR, **options):
+    """Open the LLM cache, or return None if the directory is not usable."""
+    try:
+        return LLMCache(directory, **options)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_cache():
+    """The process-wide LLM cache (opened on first use; None if unusable)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = open_llm_cache() or False
+        return _shared or None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="autodocstring llm-cache",
+        description="Inspect, share or clear the cache of generated docstrings",
+    )
+    parser.add_argument("--dir", default=CACHE_DIR, help=f"(default: {CACHE_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Print the number and size of entries")
+    commands.add_parser("clear", help="Remove every entry")
+    export = commands.add_parser("export", help="Write entries to a JSONL file")
+    export.add_argument("file")
+    imported = commands.add_parser("import", help="Add entries from a JSONL file")
+    imported.add_argument("file")
+    args = parser.parse_args(argv)
+
+    cache = open_llm_cache(args.dir)
+    if cache is None:
+        print(f"Cannot open the LLM cache in {args.dir}", file=sys.stderr)
+        return 1
+    with cache:
+        if args.command == "stats":
+            stats = cache.summary()
+            print(f"{stats['entries']} entries / {stats['bytes'] / 1024:.1f} KiB")
+        elif args.command == "clear":
+            cache.clear()
+        elif args.command == "export":
+            print(f"Exported {cache.export(args.file)} entries to {args.file}")
+        else:
+            added = cache.import_entries(args.file)
+            print(f"Imported {added} entries from {args.file}")
+    return 0
@@ -1,18 +1,435 @@
-import requests
+import os
 import re
+import json
+import time
+import random
 import textwrap
+import threading
+from collections import Counter
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "qwen2.5-coder:3b"
+import requests
+from requests.adapters import HTTPAdapter
 
+from autodocstring.cache import content_digest
+from autodocstring.llm_backends import LLMError, OllamaBackend, get_backend
+from autodocstring.llm_cache import cache_key
 
-def build_prompt(code: str, style: str) -> str:
+# Used when neither the environment nor [tool.autodocstring] names one
+DEFAULT_BACKEND = OllamaBackend.name
+DEFAULT_URL = OllamaBackend.default_url
+DEFAULT_MODEL = "qwen2.5-coder:3b"
+URL_ENV = "AUTODOCSTRING_LLM_URL"
+MODEL_ENV = "AUTODOCSTRING_LLM_MODEL"
+BACKEND_ENV = "AUTODOCSTRING_LLM_BACKEND"
+
+# Seconds the server keeps the model loaded after a request (its own
+# default, 5 minutes, unloads it between sporadic runs)
+DEFAULT_KEEP_ALIVE = 1800
+
+# Answers worth asking again: timeouts, overload, a restarting server
+RETRY_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(LLMError):
+    """Raised without a request while the server is considered down."""
+
+
+class LLMClient:
     """
-    Build a strong, clear prompt optimized for qwen2.5-coder:3b
+    HTTP client for a local LLM server.
+
+    `backend` ("ollama", "openai" or a backend object, see llm_backends)
+    decides the wire format and, without a `url`, the default endpoint.
+
+    One requests.Session with a keep-alive pool of `pool_size`
+    connections is shared by every call (and thread), so consecutive
+    functions reuse the same TCP connection. Connection errors, timeouts
+    and RETRY_STATUS answers are retried up to `retries` times, sleeping
+    a random ("full jitter") fraction of an exponential backoff, or the
+    server's Retry-After. After `failure_threshold` calls in a row have
+    failed, the circuit opens: calls fail at once with CircuitOpenError
+    for `reset_after` seconds, then one trial call decides whether it
+    closes again.
+
+    With `stream` (the default) the answer is read as its chunks
+    arrive: a caller's `stop` check can end the request as soon as
+    the useful part is complete, which closes the connection and makes
+    the server stop generating. Time to first token and tokens received
+    or left ungenerated are added to `stats` (see stream_summary()).
+
+    Every request asks the server to keep the model loaded for
+    `keep_alive` seconds, and warm_up() loads it (and evaluates a system
+    prompt) ahead of the first real request. The prompt-eval time the
+    server reports with each complete answer is added to `stats` (see
+    prompt_summary()).
     """
+
+    def __init__(
+        self,
+        url=None,
+        model=None,
+        connect_timeout=3.05,
+        read_timeout=120.0,
+        retries=3,
+        backoff=0.5,
+        max_backoff=8.0,
+        failure_threshold=5,
+        reset_after=30.0,
+        pool_size=8,
+        session=None,
+        stream=True,
+        keep_alive=DEFAULT_KEEP_ALIVE,
+        backend=DEFAULT_BACKEND,
+    ):
+        if isinstance(backend, str):
+            backend = get_backend(backend)
+        self.backend = backend
+        self.url = url or backend.default_url
+        self.model = model or DEFAULT_MODEL
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.stream = stream
+        self.keep_alive = keep_alive
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        # requests, retries, failures, short-circuited; when streaming also
+        # streams, stopped early, tokens, tokens saved, first token s;
+        # prompt evals, prompt tokens, prompt eval s; warm-ups
+        self.stats = Counter()
+
+        self._lock = threading.Lock()
+        self._failures = 0  # consecutive failed calls
+        self._opened_at = None  # when the circuit opened
+        self._trial = False  # a half-open trial call is in flight
+        self._warmed = set()  # system prompts warm_up() was asked for
+
+    @classmethod
+    def from_config(cls, config=None, **options):
+        """
+        Client for the backend, endpoint and model set in the environment
+        (AUTODOCSTRING_LLM_BACKEND, AUTODOCSTRING_LLM_URL,
+        AUTODOCSTRING_LLM_MODEL), else in [tool.autodocstring]
+        (llm-backend, llm-url, llm-model), else the defaults.
+        Streaming follows llm-stream (default: on) and the model is kept
+        loaded for llm-keep-alive seconds.
+        """
+        if config is None:
+            from autodocstring.config import load_config
+
+            config = load_config()
+        keep_alive = config.get("llm_keep_alive")
+        if keep_alive is None:
+            keep_alive = DEFAULT_KEEP_ALIVE  # 0 (unload at once) is valid
+        return cls(
+            url=os.environ.get(URL_ENV) or config.get("llm_url"),
+            model=os.environ.get(MODEL_ENV) or config.get("llm_model"),
+            **{
+                "backend": (
+                    os.environ.get(BACKEND_ENV)
+                    or config.get("llm_backend")
+                    or DEFAULT_BACKEND
+                ),
+                "stream": config.get("llm_stream", True),
+                "keep_alive": keep_alive,
+                **options,
+            },
+        )
+
+    # ---------- CIRCUIT BREAKER ----------
+    def _admit(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited >= self.reset_after and not self._trial:
+                self._trial = True  # half-open: let this one call through
+                return
+            self.stats["short-circuited"] += 1
+        raise CircuitOpenError(
+            f"LLM server at {self.url} is unavailable; not retrying for "
+            f"{max(0.0, self.reset_after - waited):.0f}s"
+        )
+
+    def _record(self, ok):
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self.stats["failures"] += 1
+            self._failures += 1
+            if self._failures >= self.failure_threshold or self._opened_at:
+                self._opened_at = time.monotonic()
+
+    # ---------- REQUESTS ----------
+    def _count(self, name, n=1):
+        with self._lock:
+            self.stats[name] += n
+
+    def _delay(self, attempt, response=None):
+        retry_after = response is not None and response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _post(self, payload):
+        """
+        The decoded JSON answer (when streaming: the open response),
+        retrying transient failures. Once a stream has started it is not
+        retried, since part of the answer has been handed out.
+        """
+        stream = payload["stream"]
+        attempt = 0
+        while True:
+            response = None
+            self._count("requests")
+            try:
+                response = self.session.post(
+                    self.url, json=payload, timeout=self.timeout, stream=stream
+                )
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response if stream else response.json()
+                response.content  # read the body so the connection is reused
+                error = LLMError(f"HTTP {response.status_code} from {self.url}")
+            except (requests.ConnectionError, requests.Timeout, ValueError) as e:
+                # ValueError: a truncated or garbled JSON body
+                error = e
+            if attempt >= self.retries:
+                raise error
+            time.sleep(self._delay(attempt, response))
+            attempt += 1
+            self._count("retries")
+
+    def _read_stream(self, response, budget, on_text, stop):
+        """Collect a streamed answer, ending early when `stop` says so."""
+        started = time.perf_counter()
+        text, tokens, stopped = "", 0, False
+        with response:  # closing mid-stream cancels the generation
+            for line in response.iter_lines():
+                event = self.backend.event(line) if line else None
+                if event is None:
+                    continue
+                piece, _, timings = self.backend.read(event)
+                self._count_prompt_eval(timings)
+                if piece:
+                    if not tokens:
+                        self._count("first token s", time.perf_counter() - started)
+                    tokens += 1
+                    text += piece
+                    end = stop(text) if stop is not None else None
+                    if end is not None:
+                        text, stopped = text[:end], True
+                    if on_text is not None:
+                        on_text(text)
+                if stopped:
+                    break
+            # Otherwise the body was read to its end and the connection is
+            # returned to the pool when the response is closed
+
+        self._count("streams")
+        self._count("tokens", tokens)
+        if stopped:
+            self._count("stopped early")
+            # Upper bound: the model might have ended sooner by itself
+            self._count("tokens saved", max(0, (budget or 0) - tokens))
+        return text
+
+    def _count_prompt_eval(self, timings):
+        # Servers report timings with the last chunk (or the whole answer),
+        # so answers cut short by a stop check have none
+        if timings is None:
+            return
+        with self._lock:
+            self.stats["prompt evals"] += 1
+            self.stats["prompt tokens"] += timings[0]
+            self.stats["prompt eval s"] += timings[1]
+
+    def _payload(self, prompt, options, system, stream):
+        return self.backend.payload(
+            self.model, prompt, system, options, stream, self.keep_alive
+        )
+
+    def generate(self, prompt, options=None, on_text=None, stop=None, system=None):
+        """
+        The model's answer to `prompt` (raises LLMError on failure).
+
+        `system` carries the instructions shared by many requests; sent
+        apart from the prompt, it stays a reusable prefix on the server.
+        When streaming, `on_text` is called with the text received so far
+        after every chunk, and `stop(text)` may return an index to cut the
+        answer at, which ends the request there.
+        """
+        self._admit()
+        options = options or {}
+        payload = self._payload(prompt, options, system, self.stream)
+        try:
+            data = self._post(payload)
+            if self.stream:
+                text = self._read_stream(
+                    data, options.get("num_predict"), on_text, stop
+                )
+            else:
+                text, _, timings = self.backend.read(data)
+                self._count_prompt_eval(timings)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and status < 500:
+                # The server is up but refused this request (4xx)
+                self._record(True)
+                raise LLMError(f"LLM request rejected: {e}") from e
+            # A server error not worth retrying (e.g. 501, 507) still counts
+            self._record(False)
+            raise LLMError(f"LLM request failed: {e}") from e
+        except (LLMError, requests.RequestException, ValueError) as e:
+            self._record(False)
+            if isinstance(e, LLMError):
+                raise
+            raise LLMError(f"LLM request failed: {e}") from e
+        except Exception:
+            # e.g. an odd payload or a failing on_text/stop callback; recorded
+            # so a half-open trial cannot stay in flight forever
+            self._record(False)
+            raise
+        self._record(True)
+        return text
+
+    def stream_summary(self):
+        """Streaming totals: mean time to first token (ms) and tokens saved."""
+        with self._lock:
+            streams = self.stats["streams"]
+            first = self.stats["first token s"]
+            return {
+                "streams": streams,
+                "stopped early": self.stats["stopped early"],
+                "mean first token ms": first / streams * 1e3 if streams else None,
+                "tokens": self.stats["tokens"],
+                "tokens saved": self.stats["tokens saved"],
+            }
+
+    def prompt_summary(self):
+        """Prompt-eval totals: mean prompt tokens and ms per complete answer."""
+        with self._lock:
+            evals = self.stats["prompt evals"]
+            return {
+                "prompt evals": evals,
+                "warm-ups": self.stats["warm-ups"],
+                "mean prompt tokens": (
+                    self.stats["prompt tokens"] / evals if evals else None
+                ),
+                "mean prompt eval ms": (
+                    self.stats["prompt eval s"] / evals * 1e3 if evals else None
+                ),
+            }
+
+    def warm_up(self, system=None):
+        """
+        Load the model and evaluate `system` with a one-token request, so
+        the first real request finds both ready. Does nothing for a
+        system prompt already warmed; failures are ignored (the real
+        request will report them). Returns whether the server answered.
+        """
+        with self._lock:
+            if system in self._warmed or self._opened_at is not None:
+                return False
+            self._warmed.add(system)
+        payload = self._payload(
+            build_user_prompt("pass"), {"num_predict": 1}, system, False
+        )
+        try:
+            self._post(payload)
+        except (LLMError, requests.RequestException, ValueError):
+            with self._lock:
+                self._warmed.discard(system)
+            return False
+        self._count("warm-ups")
+        return True
+
+    def with_model(self, model):
+        """
+        A client for another model on the same server, sharing this one's
+        connection pool (closing either closes the pool).
+        """
+        return type(self)(
+            self.url,
+            model,
+            *self.timeout,
+            retries=self.retries,
+            backoff=self.backoff,
+            max_backoff=self.max_backoff,
+            failure_threshold=self.failure_threshold,
+            reset_after=self.reset_after,
+            session=self.session,
+            stream=self.stream,
+            keep_alive=self.keep_alive,
+            backend=self.backend,
+        )
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """The shared client, created from the configuration on first use."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = LLMClient.from_config()
+        return _default_client
+
+
+def warm_up(style: str = "Google", client=None):
+    """
+    Warm the model up for `style` in a background thread (returned), e.g.
+    while files are still being parsed.
+    """
+
+    def run():
+        (client or get_client()).warm_up(build_system_prompt(style))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def set_client(client):
+    """Use `client` (an LLMClient, or None to reconfigure) from now on."""
+    global _default_client
+    with _default_lock:
+        previous, _default_client = _default_client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def _style_name(style: str) -> str:
     style = style.lower()
     if style in ["rst", "restructuredtext"]:
         style = "reST"
+    return style
+
+
+def build_system_prompt(style: str) -> str:
+    """
+    Build a strong, clear prompt optimized for qwen2.5-coder:3b
+
+    These are the instructions, the same for every function of a style.
+    They are sent as the system part so the server can keep them
+    evaluated (in its KV cache) from one request to the next.
+    """
+    style = _style_name(style)
 
     return f"""You are an expert Python docstring generator.
 
@@ -48,17 +465,24 @@ STRICT OUTPUT RULES - YOU MUST OBEY:
 - Do NOT add extra text, examples, explanations or markup
 - Return pure text only
 
+Style: {style}
+"""
 
 
-Code:
+def build_user_prompt(code: str) -> str:
+    """The part of the prompt that changes per function."""
+    return f"""Code:
 {code}
 
-Style: {style}
-
 Respond with ONLY the docstring content. No other text.
 """
 
 
+def build_prompt(code: str, style: str) -> str:
+    """The whole prompt in one piece, for servers without a system part."""
+    return build_system_prompt(style) + "\n\n" + build_user_prompt(code)
+
+
 def clean_docstring(raw: str) -> str:
     """
     Clean LLM output and ensure it becomes a valid docstring.
@@ -106,54 +530,302 @@ def clean_docstring(raw: str) -> str:
     return "\n".join(result)
 
 
-def generate_docstring_llm(code: str, style: str = "Google") -> str:
+# Lines (at column 0) that start code rather than docstring text: a code
+# fence or a repeated signature
+_DRIFT = re.compile(r"```|(async\s+)?def\s+\w+\s*\(|class\s+\w+")
+_QUOTES = ('"""', "'''")
+
+
+def docstring_end(text: str):
+    """
+    Where a streamed answer stops being a docstring, or None while it
+    may still go on.
+
+    Only complete lines are judged. Before the first line of text an
+    opening fence or bare quotes are allowed; after it, the answer is cut
+    before a line that starts code (see _DRIFT), or after a line that
+    closes the triple quotes.
+    """
+    started = False
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        if not line.endswith("\n"):
+            break
+        stripped = line.strip()
+        if not started:
+            started = (
+                bool(stripped)
+                and not stripped.startswith("```")
+                and stripped not in _QUOTES
+            )
+            opened = stripped[3:] if stripped.startswith(_QUOTES) else stripped
+            if started and opened.endswith(_QUOTES):
+                return pos + len(line)  # e.g. a one-line docstring
+        elif _DRIFT.match(line):
+            return pos
+        elif stripped.endswith(_QUOTES):
+            return pos + len(line)
+        pos += len(line)
+    return None
+
+
+# Sampling options sent with every request
+GENERATE_OPTIONS = {
+    "temperature": 0.0,
+    "top_p": 0.9,
+    "repeat_penalty": 1.1,
+    "num_predict": 512,  # enough for most docstrings
+}
+
+
+def generate_docstring_llm(
+    code: str,
+    style: str = "Google",
+    client=None,
+    cache=None,
+    on_progress=None,
+    num_predict=None,
+) -> str:
     """
     Generate a PEP 257 compliant docstring using Ollama + qwen2.5-coder:3b
 
     Args:
         code: Function/method code as string
         style: "Google", "NumPy", "reST"
+        client: LLMClient to use (default: the shared one, see get_client)
+        cache: LLMCache for the model's answers, or None to always ask
+        on_progress: Called with the partial answer while it streams in
+        num_predict: Reply token limit (default: GENERATE_OPTIONS')
 
     Returns:
         Properly formatted docstring string (with triple quotes)
+
+    Raises:
+        LLMError: If the server could not be reached or kept failing
     """
-    prompt = build_prompt(code, style)
+    client = client or get_client()
+    system = build_system_prompt(style)
+    prompt = build_user_prompt(code)
+    options = GENERATE_OPTIONS
+    if num_predict is not None:
+        options = {**GENERATE_OPTIONS, "num_predict": num_predict}
+
+    def ask():
+        return client.generate(
+            prompt,
+            options,
+            on_text=on_progress,
+            stop=docstring_end,
+            system=system,
+        )
+
+    if cache is None:
+        raw = ask()
+    else:
+        # The raw answer is cached, so clean_docstring fixes apply to hits
+        parts = (code, style, client.model, PROMPT_VERSION)
+        if num_predict is not None:  # a shorter limit may cut the answer
+            parts += (num_predict,)
+        raw = cache.get(cache_key(*parts), ask)
+    return _finish(raw)
+
+
+def _finish(raw):
+    """Cleaned docstring, with triple quotes, for a raw model answer."""
+    raw = raw.strip()
 
-    payload = {
-        "model": MODEL,
-        "prompt": prompt,
-        "stream": False,
-        "options": {
-            "temperature": 0.0,
-            "top_p": 0.9,
-            "repeat_penalty": 1.1,
-            "num_predict": 512,  # enough for most docstrings
-        },
-    }
+    if not raw:
+        return '"""\nGenerated docstring.\n"""'
 
-    try:
-        response = requests.post(OLLAMA_URL, json=payload, timeout=120)
-        response.raise_for_status()
+    cleaned = clean_docstring(raw)
+
+    # Final safety: ensure triple quotes
+    if not cleaned.startswith('"""'):
+        cleaned = '"""\n' + cleaned.lstrip()
+    if not cleaned.endswith('"""'):
+        cleaned = cleaned.rstrip() + '\n"""'
 
-        raw = response.json().get("response", "").strip()
+    return cleaned
 
-        if not raw:
-            return '"""\nGenerated docstring.\n"""'
 
-        cleaned = clean_docstring(raw)
+# ────────────────────────────────────────────────
+# Batched prompts
+# ────────────────────────────────────────────────
+# Rough size of a token for budgeting (code averages 3-4 characters)
+CHARS_PER_TOKEN = 3.5
+# Output tokens reserved per function in a batch
+TOKENS_PER_SLOT = 160
+MAX_BATCH = 8
+# Prompt + reply tokens per batched request; Ollama's default context
+# window is 2048 tokens and longer prompts are silently truncated
+DEFAULT_BATCH_TOKENS = 2048
 
-        # Final safety: ensure triple quotes
-        if not cleaned.startswith('"""'):
-            cleaned = '"""\n' + cleaned.lstrip()
-        if not cleaned.endswith('"""'):
-            cleaned = cleaned.rstrip() + '\n"""'
+_SLOT = re.compile(r"<<<DOCSTRING (\d+)>>>[ \t]*\n(.*?)\n?[ \t]*<<<END \1>>>", re.S)
 
-        return cleaned
 
-    except requests.exceptions.RequestException as e:
-        raise RuntimeError(f"Ollama connection failed: {e}") from e
-    except Exception as e:
-        raise RuntimeError(f"Docstring generation failed: {e}") from e
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def build_batch_system_prompt(style: str) -> str:
+    """Instructions for batched requests (the same for every batch)."""
+    style = _style_name(style)
+
+    return f"""You are an expert Python docstring generator.
+
+Write one PEP 257 compliant docstring for EACH of the numbered functions.
+
+RULES FOR EVERY DOCSTRING:
+- Start with one short imperative summary sentence. End with a period.
+- Then exactly one blank line.
+- Then only needed sections: Args/Parameters, Returns, Raises, Yields
+- Follow the selected style strictly: {style}
+- Use exactly 4 spaces for indentation under sections
+- Do NOT output triple quotes, code fences, examples or the function code
+
+Style reference:
+- google: Args:, Returns:, Raises:
+- numpy: Parameters\n----------, Returns\n-------, Raises\n------
+- reST: :param name:, :returns:, :raises:
+
+OUTPUT FORMAT - for every function, in order, exactly:
+<<<DOCSTRING n>>>
+the docstring text
+<<<END n>>>
+where n is the number of the function. Output nothing else.
+"""
+
+
+def build_batch_prompt(codes) -> str:
+    """The functions of one batch, numbered from 1."""
+    return "\n".join(
+        f"<<<FUNCTION {i}>>>\n{code.strip()}\n<<<END {i}>>>"
+        for i, code in enumerate(codes, 1)
+    )
+
+
+def prompt_version() -> str:
+    """
+    Digest of the prompt templates (single and batched, with the slot
+    format) and the options: batched answers share the cache with single
+    ones, so a change to either must not reuse older answers.
+    """
+    templates = [
+        build_prompt("{code}", "{style}"),
+        build_batch_system_prompt("{style}"),
+        build_batch_prompt(["{code}"]),
+        _SLOT.pattern,
+        GENERATE_OPTIONS,
+    ]
+    return content_digest(json.dumps(templates).encode())
+
+
+# Changes whenever a prompt template or the options do, so cached
+# answers to an older prompt are not reused
+PROMPT_VERSION = prompt_version()
+
+
+def parse_batch_reply(reply: str, count: int):
+    """
+    The docstring text of each slot 1..count in a batched reply, or None
+    for a slot that is missing or empty.
+    """
+    found = {}
+    for match in _SLOT.finditer(reply):
+        text = match[2].strip()
+        if text and "<<<" not in text:
+            found.setdefault(int(match[1]), text)
+    return [found.get(i) for i in range(1, count + 1)]
+
+
+def plan_batches(codes, budget=DEFAULT_BATCH_TOKENS, max_batch=MAX_BATCH):
+    """
+    Group the indexes of `codes` into consecutive batches whose estimated
+    prompt and reply fit in `budget` tokens. A function too big to share
+    a request gets a batch of its own.
+    """
+    preamble = estimate_tokens(build_batch_system_prompt("google"))
+    batches, current, used = [], [], preamble
+    for i, code in enumerate(codes):
+        cost = estimate_tokens(code) + TOKENS_PER_SLOT + 8  # + slot markers
+        if current and (used + cost > budget or len(current) >= max_batch):
+            batches.append(current)
+            current, used = [], preamble
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _batch_end(count):
+    closing = f"<<<END {count}>>>"
+
+    def stop(text):
+        # The last slot is closed: anything after it is rambling
+        at = text.find(closing, text.find(f"<<<DOCSTRING {count}>>>"))
+        return None if at < 0 else at + len(closing)
+
+    return stop
+
+
+def generate_docstrings_batch(
+    codes, style: str = "Google", client=None, cache=None, budget=DEFAULT_BATCH_TOKENS
+):
+    """
+    Docstrings for several functions (e.g. the small methods of a class)
+    with as few requests as `budget` allows: the instructions are sent
+    once per batch instead of once per function.
+
+    Returns one docstring (as generate_docstring_llm would) or exception
+    per code, in order. Slots the model left out or garbled are asked
+    again one function at a time; answers are cached per function under
+    the same key as single requests.
+    """
+    client = client or get_client()
+    results = [None] * len(codes)
+    keys = [cache_key(c, style, client.model, PROMPT_VERSION) for c in codes]
+    pending = []
+    for i, code in enumerate(codes):
+        raw = cache.lookup(keys[i]) if cache is not None else None
+        if raw is None:
+            pending.append(i)
+        else:
+            results[i] = _finish(raw)
+
+    single = []
+    for batch in plan_batches([codes[i] for i in pending], budget):
+        batch = [pending[j] for j in batch]
+        if len(batch) == 1:
+            single.extend(batch)
+            continue
+        options = {**GENERATE_OPTIONS, "num_predict": TOKENS_PER_SLOT * len(batch)}
+        prompt = build_batch_prompt([codes[i] for i in batch])
+        try:
+            reply = client.generate(
+                prompt,
+                options,
+                stop=_batch_end(len(batch)),
+                system=build_batch_system_prompt(style),
+            )
+        except Exception as e:
+            for i in batch:
+                results[i] = e
+            continue
+        for i, raw in zip(batch, parse_batch_reply(reply, len(batch))):
+            if raw is None:
+                single.append(i)  # malformed slot: ask for it on its own
+                continue
+            if cache is not None:
+                cache.store(keys[i], raw)
+            results[i] = _finish(raw)
+
+    for i in sorted(single):
+        try:
+            results[i] = generate_docstring_llm(codes[i], style, client, cache)
+        except Exception as e:
+            results[i] = e
+    return results
 
 
 # ────────────────────────────────────────────────
@@ -165,9 +837,19 @@ def add(a: int, b: int = 0) -> int:
     return a + b
 """
 
+    shown = []
+
+    def show(text):
+        # Print only what arrived since the last chunk
+        print(text[len(shown[0]) if shown else 0 :], end="", flush=True)
+        shown[:] = [text]
+
     try:
-        doc = generate_docstring_llm(sample, style="Google")
-        print("Generated docstring:\n")
+        print("Streaming:\n")
+        doc = generate_docstring_llm(sample, style="Google", on_progress=show)
+        print("\n\nGenerated docstring:\n")
         print(doc)
+        print(get_client().stream_summary())
+        print(get_client().prompt_summary())
     except Exception as e:
         print(f"Error: {e}")
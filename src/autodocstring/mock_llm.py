@@ -0,0 +1,308 @@
+"""
+Stand-in LLM server for tests and load tests.
+
+Answers both wire formats of llm_backends (POST /api/generate and
+/v1/chat/completions), streamed or not, without running a model. The
+first token is sent after `latency` seconds and the rest at
+`tokens_per_s`. A seeded `error_rate` fraction of requests gets a 503,
+and at most `slots` requests are answered at once (the rest wait, as
+with OLLAMA_NUM_PARALLEL). Answers come from a recording, a JSON-lines
+file of {"prompt": ..., "response": ...} objects keyed by the exact
+prompt, or else the canned `answer`. Batched prompts get one canned
+slot per function.
+
+    autodocstring mock-llm --port 11434 --latency 0.2 --tokens-per-s 40
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ANSWER = (
+    "Do the thing.\n\nArgs:\n    value: The value.\n\nReturns:\n    The result."
+)
+PATHS = {"/api/generate": "ollama", "/v1/chat/completions": "openai"}
+
+_TOKEN = re.compile(r"\s*\S+|\s+")
+_FUNCTION = re.compile(r"<<<FUNCTION (\d+)>>>")
+
+
+def load_responses(path):
+    """{prompt: answer} from a JSON-lines recording."""
+    responses = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                responses[record["prompt"]] = record["response"]
+    return responses
+
+
+class MockLLMServer:
+    """
+    The server, run from a background thread by start() (or as a context
+    manager). `stats` counts requests, injected errors, tokens sent and
+    the peak number of requests in flight ("peak concurrent").
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        tokens_per_s=None,
+        error_rate=0.0,
+        slots=None,
+        answer=DEFAULT_ANSWER,
+        responses=None,
+        seed=0,
+    ):
+        self.latency = latency
+        self.tokens_per_s = tokens_per_s
+        self.error_rate = error_rate
+        self.answer = answer
+        self.responses = dict(responses or {})
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._slots = threading.Semaphore(slots) if slots else None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    def url(self, backend="ollama"):
+        """The endpoint for `backend` ("ollama" or "openai")."""
+        host, port = self.httpd.server_address[:2]
+        path = next(p for p, name in PATHS.items() if name == backend)
+        return f"http://{host}:{port}{path}"
+
+    # ---------- ANSWERS ----------
+    def reply_for(self, prompt):
+        if prompt in self.responses:
+            return self.responses[prompt]
+        slots = _FUNCTION.findall(prompt)
+        if slots:
+            return "\n".join(
+                f"<<<DOCSTRING {n}>>>\n{self.answer}\n<<<END {n}>>>" for n in slots
+            )
+        return self.answer
+
+    def _fails(self):
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            self.stats["errors"] += failed
+        return failed
+
+    def _enter(self):
+        with self._lock:
+            self._active += 1
+            self.stats["requests"] += 1
+            self.stats["peak concurrent"] = max(
+                self.stats["peak concurrent"], self._active
+            )
+
+    def _leave(self):
+        with self._lock:
+            self._active -= 1
+
+    def _tokens(self, text):
+        """Yield the tokens of `text`, paced like a model generating them."""
+        time.sleep(self.latency)
+        for token in _TOKEN.findall(text):
+            if self.tokens_per_s:
+                time.sleep(1 / self.tokens_per_s)
+            with self._lock:
+                self.stats["tokens"] += 1
+            yield token
+
+    # ---------- HTTP ----------
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, chunked streams
+
+            def do_POST(self):
+                backend = PATHS.get(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if backend is None:
+                    return self._send(404, {"error": f"no endpoint {self.path}"})
+
+                server._enter()
+                try:
+                    if server._slots is not None:
+                        server._slots.acquire()
+                    try:
+                        self._answer(backend, body)
+                    finally:
+                        if server._slots is not None:
+                            server._slots.release()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client stopped reading (a stop check)
+                finally:
+                    server._leave()
+
+            def _answer(self, backend, body):
+                if server._fails():
+                    return self._send(503, {"error": "injected failure"})
+                if backend == "ollama":
+                    prompt = body.get("prompt", "")
+                else:
+                    prompt = body["messages"][-1]["content"]
+                text = server.reply_for(prompt)
+                # Prompt evaluation is modelled as the latency
+                timings = (len(prompt) // 4, server.latency)
+                events = _EVENTS[backend]
+                if not body.get("stream", backend == "ollama"):
+                    text = "".join(server._tokens(text))
+                    return self._send(200, events.whole(body, text, timings))
+
+                self.send_response(200)
+                self.send_header("Content-Type", events.content_type)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for token in server._tokens(text):
+                    self._chunk(events.chunk(body, token))
+                for line in events.end(body, timings):
+                    self._chunk(line)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _chunk(self, data):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    # ---------- LIFECYCLE ----------
+    def start(self):
+        # A short poll interval keeps stop() quick
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _OllamaEvents:
+    content_type = "application/x-ndjson"
+
+    @staticmethod
+    def _done(body, timings):
+        return {
+            "model": body.get("model"),
+            "done": True,
+            "prompt_eval_count": timings[0],
+            "prompt_eval_duration": int(timings[1] * 1e9),
+        }
+
+    def whole(self, body, text, timings):
+        return {**self._done(body, timings), "response": text}
+
+    def chunk(self, body, token):
+        line = {"model": body.get("model"), "response": token, "done": False}
+        return json.dumps(line).encode() + b"\n"
+
+    def end(self, body, timings):
+        line = {**self._done(body, timings), "response": ""}
+        return [json.dumps(line).encode() + b"\n"]
+
+
+class _OpenAIEvents:
+    content_type = "text/event-stream"
+
+    @staticmethod
+    def _timings(timings):
+        return {"prompt_n": timings[0], "prompt_ms": timings[1] * 1e3}
+
+    def whole(self, body, text, timings):
+        message = {"role": "assistant", "content": text}
+        return {
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "timings": self._timings(timings),
+        }
+
+    def chunk(self, body, token):
+        choice = {"index": 0, "delta": {"content": token}, "finish_reason": None}
+        return b"data: " + json.dumps({"choices": [choice]}).encode() + b"\n\n"
+
+    def end(self, body, timings):
+        last = {
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "timings": self._timings(timings),
+        }
+        return [
+            b"data: " + json.dumps(last).encode() + b"\n\n",
+            b"data: [DONE]\n\n",
+        ]
+
+
+_EVENTS = {"ollama": _OllamaEvents(), "openai": _OpenAIEvents()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="autodocstring mock-llm",
+        description="Serve canned LLM answers for tests and load tests",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--tokens-per-s", type=float, help="(default: no limit)")
+    parser.add_argument("--error-rate", type=float, default=0.0, metavar="RATIO")
+    parser.add_argument("--slots", type=int, help="requests answered at once")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--answer", default=DEFAULT_ANSWER)
+    parser.add_argument("--responses", help="JSONL recording of prompt/response")
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        tokens_per_s=args.tokens_per_s,
+        error_rate=args.error_rate,
+        slots=args.slots,
+        answer=args.answer,
+        responses=load_responses(args.responses) if args.responses else None,
+        seed=args.seed,
+    )
+    print(f"Ollama endpoint: {server.url('ollama')}")
+    print(f"OpenAI endpoint: {server.url('openai')}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(dict(server.stats), file=sys.stderr)
+    return 0
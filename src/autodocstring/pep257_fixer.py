@@ -1,5 +1,4 @@
-import subprocess
-import re
+from autodocstring.pep257_rules import check_file
 
 CATEGORY_MAP = {
     "D10": "Missing Docstrings",
@@ -16,28 +15,33 @@ def categorize(code):
     return "Other"
 
 
-def run_full_pep257(file_path):
-    result = subprocess.run(["pydocstyle", file_path], capture_output=True, text=True)
+def run_full_pep257(file_path, cache=None):
+    if cache is not None:
+        issues, token = cache.lookup(file_path, "pep257")
+        if issues is not None:
+            # Entries are shared by files with identical content
+            for issue in issues:
+                issue["File"] = str(file_path)
+            return issues
 
     issues = []
 
-    for line in result.stdout.splitlines():
+    for violation in check_file(file_path):
+        code = violation["Code"]
 
-        match = re.match(r"(.*?):(\d+)\s+(D\d+)\s+(.*)", line)
+        issues.append(
+            {
+                "File": violation["File"],
+                "Line": violation["Line"],
+                "Code": code,
+                "Category": categorize(code),
+                "Message": violation["Message"].split(": ", 1)[1],
+                "Fix": suggest_fix(code),
+            }
+        )
 
-        if match:
-            code = match.group(3)
-
-            issues.append(
-                {
-                    "File": match.group(1),
-                    "Line": int(match.group(2)),
-                    "Code": code,
-                    "Category": categorize(code),
-                    "Message": match.group(4),
-                    "Fix": suggest_fix(code),
-                }
-            )
+    if cache is not None:
+        cache.store(token, "pep257", issues)
 
     return issues
 
@@ -0,0 +1,802 @@
+import ast
+import io
+import re
+import string
+import sys
+import tokenize
+from pathlib import Path
+
+from autodocstring import profiling
+
+try:
+    from snowballstemmer import stemmer  # installed along with pydocstyle
+except ImportError:
+    stemmer = None
+
+# pydocstyle's default ("pep257") convention. D302 only applies to Python 2.
+PEP257_CODES = frozenset(
+    {
+        *(f"D10{i}" for i in range(8)),
+        "D200",
+        "D201",
+        "D202",
+        *(f"D20{i}" for i in range(4, 10)),
+        "D210",
+        "D211",
+        "D300",
+        "D301",
+        "D400",
+        "D401",
+        "D402",
+        "D403",
+        "D412",
+        "D414",
+        "D419",
+    }
+)
+
+# code -> (short description, optional context template), as pydocstyle words them
+MESSAGES = {
+    "D100": ("Missing docstring in public module", None),
+    "D101": ("Missing docstring in public class", None),
+    "D102": ("Missing docstring in public method", None),
+    "D103": ("Missing docstring in public function", None),
+    "D104": ("Missing docstring in public package", None),
+    "D105": ("Missing docstring in magic method", None),
+    "D106": ("Missing docstring in public nested class", None),
+    "D107": ("Missing docstring in __init__", None),
+    "D200": ("One-line docstring should fit on one line with quotes", "found {0}"),
+    "D201": ("No blank lines allowed before function docstring", "found {0}"),
+    "D202": ("No blank lines allowed after function docstring", "found {0}"),
+    "D204": ("1 blank line required after class docstring", "found {0}"),
+    "D205": (
+        "1 blank line required between summary line and description",
+        "found {0}",
+    ),
+    "D206": ("Docstring should be indented with spaces, not tabs", None),
+    "D207": ("Docstring is under-indented", None),
+    "D208": ("Docstring is over-indented", None),
+    "D209": ("Multi-line docstring closing quotes should be on a separate line", None),
+    "D210": ("No whitespaces allowed surrounding docstring text", None),
+    "D211": ("No blank lines allowed before class docstring", "found {0}"),
+    "D300": ('Use """triple double quotes"""', "found {0}-quotes"),
+    "D301": ('Use r""" if any backslashes in a docstring', None),
+    "D400": ("First line should end with a period", "not {0!r}"),
+    "D401": ("First line should be in imperative mood", "perhaps '{0}', not '{1}'"),
+    "D401b": ("First line should be in imperative mood; try rephrasing", "found '{0}'"),
+    "D402": ('First line should not be the function\'s "signature"', None),
+    "D403": (
+        "First word of the first line should be properly capitalized",
+        "{0!r}, not {1!r}",
+    ),
+    "D412": (
+        "No blank lines allowed between a section header and its content",
+        "{0!r}",
+    ),
+    "D414": ("Section has no content", "{0!r}"),
+    "D419": ("Docstring is empty", None),
+}
+
+# Verbs accepted at the start of a function docstring (D401)
+IMPERATIVE_VERBS = frozenset(
+    """
+    accept access add adjust aggregate allow append apply archive assert assign
+    attempt authenticate authorize break build cache calculate call cancel
+    capture change check clean clear close collect combine commit compare
+    compute configure confirm connect construct control convert copy count
+    create customize declare decode decorate define delegate delete deprecate
+    derive describe detect determine display download drop dump emit empty
+    enable encapsulate encode end ensure enumerate establish evaluate examine
+    execute exit expand expect export extend extract feed fetch fill filter
+    finalize find fire fix flag force format forward generate get give go group
+    handle help hold identify implement import indicate init initialise
+    initialize initiate input insert instantiate intercept invoke iterate join
+    keep launch list listen load log look make manage manipulate map mark match
+    merge mock modify monitor move normalize note obtain open output override
+    overwrite package pad parse partial pass perform persist pick plot poll
+    populate post prepare print process produce provide publish pull put query
+    raise read record refer refresh register reload remove rename render
+    replace reply report represent request require reset resolve retrieve
+    return roll rollback round run sample save scan search select send
+    serialise serialize serve set show simulate source specify split start step
+    stop store strip submit subscribe sum swap sync synchronise synchronize
+    take tear test time transform translate transmit truncate try turn tweak
+    update upload use validate verify view wait walk wrap write yield
+    """.split()
+)
+# First words that are never imperative (D401, "try rephrasing")
+IMPERATIVE_BLACKLIST = frozenset(
+    """
+    a an the action always api base basic business calculation callback
+    collection common constructor convenience convenient current currently
+    custom data default deprecated description dict dictionary does dummy
+    example factory false final formula function generic handler helper here
+    hook implementation importantly internal it main method module new number
+    optional placeholder reference result same schema setup should simple some
+    special sql standard static string subclasses that these this true unique
+    unit utility what wrapper
+    """.split()
+)
+# Without a stemmer, (suffix, replacement) pairs that turn "Returns",
+# "Created" or "Making" back into a verb from IMPERATIVE_VERBS
+_VERB_SUFFIXES = [
+    ("ies", "y"),
+    ("es", ""),
+    ("s", ""),
+    ("ed", ""),
+    ("ed", "e"),
+    ("ing", ""),
+    ("ing", "e"),
+]
+
+NUMPY_SECTION_NAMES = (
+    "Short Summary",
+    "Extended Summary",
+    "Parameters",
+    "Returns",
+    "Yields",
+    "Other Parameters",
+    "Raises",
+    "See Also",
+    "Notes",
+    "References",
+    "Examples",
+    "Attributes",
+    "Methods",
+)
+GOOGLE_SECTION_NAMES = (
+    "Args",
+    "Arguments",
+    "Attention",
+    "Attributes",
+    "Caution",
+    "Danger",
+    "Error",
+    "Example",
+    "Examples",
+    "Hint",
+    "Important",
+    "Keyword Args",
+    "Keyword Arguments",
+    "Methods",
+    "Note",
+    "Notes",
+    "Return",
+    "Returns",
+    "Raises",
+    "References",
+    "See Also",
+    "Tip",
+    "Todo",
+    "Warning",
+    "Warnings",
+    "Warns",
+    "Yield",
+    "Yields",
+)
+
+PROPERTY_DECORATORS = {"property", "cached_property", "functools.cached_property"}
+VARIADIC_MAGIC_METHODS = ("__init__", "__call__", "__new__")
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_FUNCTION_KINDS = ("function", "nested function", "method")
+# Statements whose blocks pydocstyle looks into for nested definitions
+_BLOCK_FIELDS = ("body", "orelse", "handlers", "finalbody", "cases")
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+_LEADING_SPACE = re.compile(r"\s*")
+_LEADING_WORDS = re.compile(r"[\w ]+")
+_BACKSLASH = re.compile(r"\\[^\nuN]")
+_NESTED_DEF_AFTER = re.compile(r"\s+(?:(?:class|def|async def)\s|@)")
+_SECTION_PUNCTUATION = (",", ";", ".", "-", "\\", "/", "]", "}", ")")
+
+
+def _is_blank(text):
+    return not text.strip()
+
+
+def _leading_blanks(lines):
+    count = 0
+    for line in lines:
+        if not _is_blank(line):
+            break
+        count += 1
+    return count
+
+
+# ---------- DEFINITIONS ----------
+
+
+def _is_public_module_name(name):
+    return not name.startswith("_") or (name.startswith("__") and name.endswith("__"))
+
+
+def _module_is_public(filename):
+    path = Path(filename)
+    if not _is_public_module_name(path.stem):
+        return False
+    # Modules inside a private package are private too
+    syspath = [Path(p) for p in sys.path]
+    parent = path.parent
+    while parent != parent.parent and parent not in syspath:
+        if not _is_public_module_name(parent.name):
+            return False
+        parent = parent.parent
+    return True
+
+
+def _dunder_all(tree):
+    """Names in a module-level `__all__ = [...]`, None if absent or dynamic."""
+    found = None
+    for stmt in tree.body:
+        if hasattr(stmt, "body"):
+            continue  # only module-level simple statements count
+        if not any(
+            isinstance(n, ast.Name) and n.id == "__all__" for n in ast.walk(stmt)
+        ):
+            continue
+        if found is not None:
+            return None  # assigned twice, or extended later
+        value = stmt.value if isinstance(stmt, ast.Assign) else None
+        if (
+            len(getattr(stmt, "targets", ())) != 1
+            or not isinstance(stmt.targets[0], ast.Name)
+            or not isinstance(value, (ast.List, ast.Tuple))
+            or not all(
+                isinstance(e, ast.Constant) and isinstance(e.value, str)
+                for e in value.elts
+            )
+        ):
+            return None
+        found = tuple(e.value for e in value.elts)
+    return found
+
+
+def _decorator_name(node):
+    if isinstance(node, ast.Call):
+        node = node.func
+    return ast.unparse(node)
+
+
+def _kind(node, parent_kind):
+    if isinstance(node, ast.ClassDef):
+        return "class" if parent_kind in ("module", "package") else "nested class"
+    if parent_kind in ("module", "package"):
+        return "function"
+    if parent_kind in ("class", "nested class"):
+        return "method"
+    return "nested function"
+
+
+def _is_public(kind, name, decorators, parent, dunder_all):
+    if kind in ("function", "class"):
+        if dunder_all is not None:
+            return name in dunder_all
+        return not name.startswith("_")
+    if kind == "nested function":
+        return False
+    if kind == "nested class":
+        return (
+            not name.startswith("_")
+            and parent["kind"] in ("class", "nested class")
+            and parent["public"]
+        )
+    # Methods: property setters/deleters are private
+    if any(d.startswith(f"{name}.") for d in decorators):
+        return False
+    magic = name.startswith("__") and name.endswith("__")
+    return parent["public"] and (not name.startswith("_") or magic)
+
+
+def _segment(lines, node):
+    """Exact source text of `node` (ast column offsets are UTF-8 byte offsets)."""
+    first = lines[node.lineno - 1].encode("utf-8")
+    if node.lineno == node.end_lineno:
+        return first[node.col_offset : node.end_col_offset].decode("utf-8")
+    last = lines[node.end_lineno - 1].encode("utf-8")
+    return "".join(
+        [
+            first[node.col_offset :].decode("utf-8"),
+            *lines[node.lineno : node.end_lineno - 1],
+            last[: node.end_col_offset].decode("utf-8"),
+        ]
+    )
+
+
+def _docstring(node, lines):
+    """
+    (raw literal, value, line) of the docstring pydocstyle would see: the
+    first string token of the body. Parenthesized strings do not count and
+    only the first part of an implicit concatenation does.
+    """
+    body = node.body
+    if not (
+        body
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+        and body[0].col_offset == body[0].value.col_offset
+    ):
+        return None, None, None
+    value = body[0].value
+    raw = _segment(lines, value)
+    token = next(tokenize.generate_tokens(io.StringIO(raw).readline)).string
+    if token != raw:
+        return token, ast.literal_eval(token), value.lineno
+    return raw, value.value, value.lineno
+
+
+def _noqa(comment_lines):
+    """pydocstyle's inline skips: "# noqa" skips everything, "noqa: D102" one code."""
+    for line in comment_lines:
+        _, hash_, comment = line.partition("#")
+        if not hash_:
+            continue
+        comment = "#" + comment.rstrip("\n")
+        if "noqa: " in comment:
+            return "".join(comment.split("noqa: ")[1:])
+        if comment.startswith("# noqa"):
+            return "all"
+    return ""
+
+
+def _source(lines, start, end):
+    """Definition source with trailing blank and comment lines dropped."""
+    chunk = lines[start - 1 : end]
+    while chunk and (_is_blank(chunk[-1]) or chunk[-1].strip().startswith("#")):
+        chunk.pop()
+    return "".join(chunk)
+
+
+def _header_tail(lines, node):
+    """Lines between a def/class header's colon and its first statement."""
+    first = node.body[0].lineno - 1
+    start = first - 1
+    while start > node.lineno - 1 and (
+        _is_blank(lines[start]) or lines[start].lstrip().startswith("#")
+    ):
+        start -= 1
+    # The header's own last line may carry a trailing comment
+    return lines[start:first]
+
+
+def iter_definitions(tree, lines, filename):
+    """
+    Yield the module and every def/class in it, outermost first, as dicts
+    classified the way pydocstyle does (kind, public, noqa skips, source,
+    raw docstring literal and the line violations are reported at).
+    """
+    dunder_all = _dunder_all(tree)
+    kind = "package" if filename.endswith("__init__.py") else "module"
+    doc, text, doc_line = _docstring(tree, lines)
+    first_stmt = len(lines) + 1
+    if tree.body:
+        first = tree.body[0]
+        first_stmt = min(
+            [first.lineno] + [d.lineno for d in getattr(first, "decorator_list", ())]
+        )
+    module = {
+        "kind": kind,
+        "name": filename,
+        "public": _module_is_public(filename),
+        "decorators": [],
+        "skip": _noqa(lines[: first_stmt - 1]),
+        "source": "".join(lines),
+        "docstring": doc,
+        "text": text,
+        "line": doc_line or 1,
+    }
+    yield module
+
+    # (node, parent definition); explicit stack keeps pre-order without recursion
+    stack = [(child, module) for child in reversed(tree.body)]
+    while stack:
+        node, parent = stack.pop()
+        if not isinstance(node, (ast.ClassDef, *_FUNCTION_NODES)):
+            for field in reversed(_BLOCK_FIELDS):
+                for child in reversed(getattr(node, field, None) or ()):
+                    stack.append((child, parent))
+            continue
+
+        kind = _kind(node, parent["kind"])
+        decorators = [_decorator_name(d) for d in node.decorator_list]
+        doc, text, doc_line = _docstring(node, lines)
+        first = node.body[0]
+        # `def f(): ...` - the body starts on the header's line
+        one_liner = bool(
+            lines[first.lineno - 1].encode("utf-8")[: first.col_offset].strip()
+        )
+        definition = {
+            "kind": kind,
+            "name": node.name,
+            "public": _is_public(kind, node.name, decorators, parent, dunder_all),
+            "decorators": decorators,
+            "skip": "" if one_liner else _noqa(_header_tail(lines, node)),
+            "source": _source(lines, node.lineno, node.end_lineno),
+            "docstring": doc,
+            "text": text,
+            "line": doc_line or node.lineno,
+        }
+        yield definition
+
+        for child in reversed(node.body):
+            stack.append((child, definition))
+
+
+def describe(definition):
+    """Same wording as pydocstyle: "at module level", "in public method `m`"."""
+    if definition["kind"] in ("module", "package"):
+        return "at module level"
+    publicity = "public" if definition["public"] else "private"
+    out = f"in {publicity} {definition['kind']} `{definition['name']}`"
+    if definition["skip"]:
+        out += f" (skipping {definition['skip']})"
+    return out
+
+
+# ---------- CHECKS ----------
+
+
+def _check_missing(d, doc, text):
+    if doc or not d["public"]:
+        return
+    kind, name = d["kind"], d["name"]
+    overload = "overload" in d["decorators"]
+    if kind == "method":
+        if name.startswith("__") and name.endswith("__"):
+            if name not in VARIADIC_MAGIC_METHODS:
+                yield ("D105",)
+                return
+        if name == "__init__":
+            yield ("D107",)
+        elif not overload:
+            yield ("D102",)
+        return
+    if kind == "function" and overload:
+        return
+    codes = {
+        "module": "D100",
+        "package": "D104",
+        "class": "D101",
+        "nested class": "D106",
+        "function": "D103",
+    }
+    yield (codes[kind],)
+
+
+def _check_empty(d, doc, text):
+    if doc and _is_blank(text):
+        yield ("D419",)
+
+
+def _check_one_liner(d, doc, text):
+    lines = text.split("\n")
+    if len(lines) > 1 and sum(1 for line in lines if not _is_blank(line)) == 1:
+        yield ("D200", len(lines))
+
+
+def _blanks_around(d, doc):
+    """Blank lines right before the docstring, and the lines after it."""
+    before, _, after = d["source"].partition(doc)
+    count_before = _leading_blanks(reversed(before.split("\n")[:-1]))
+    return count_before, after.split("\n")[1:], after
+
+
+def _check_function_blanks(d, doc, text):
+    if d["kind"] not in _FUNCTION_KINDS:
+        return
+    count_before, lines_after, after = _blanks_around(d, doc)
+    count_after = _leading_blanks(lines_after)
+    if count_before:
+        yield ("D201", count_before)
+    if count_after and not all(map(_is_blank, lines_after)):
+        # A single blank line before an inner function or class is fine
+        if not (count_after == 1 and _NESTED_DEF_AFTER.match(after)):
+            yield ("D202", count_after)
+
+
+def _check_class_blanks(d, doc, text):
+    if d["kind"] not in ("class", "nested class"):
+        return
+    count_before, lines_after, _ = _blanks_around(d, doc)
+    count_after = _leading_blanks(lines_after)
+    if count_before:
+        yield ("D211", count_before)
+    if count_after != 1 and not all(map(_is_blank, lines_after)):
+        yield ("D204", count_after)
+
+
+def _check_blank_after_summary(d, doc, text):
+    lines = text.strip().split("\n")
+    if len(lines) > 1:
+        count = _leading_blanks(lines[1:])
+        if count != 1:
+            yield ("D205", count)
+
+
+def _docstring_indent(d, doc):
+    before, _, _ = d["source"].partition(doc)
+    return before.rpartition("\n")[2]
+
+
+def _check_indent(d, doc, text):
+    lines = doc.split("\n")
+    if len(lines) < 2:
+        return
+    indent = _docstring_indent(d, doc)
+    # First line and line continuations need no indent
+    lines = [
+        line for i, line in enumerate(lines) if i and not lines[i - 1].endswith("\\")
+    ]
+    indents = [_LEADING_SPACE.match(line).group() for line in lines if line.strip()]
+    if set(" \t") == set("".join(indents) + indent):
+        yield ("D206",)
+    if (len(indents) > 1 and min(indents[:-1]) > indent) or (
+        indents and indents[-1] > indent
+    ):
+        yield ("D208",)
+    if indents and min(indents) < indent:
+        yield ("D207",)
+
+
+def _check_closing_quotes(d, doc, text):
+    lines = [line for line in text.split("\n") if not _is_blank(line)]
+    if len(lines) > 1 and doc.split("\n")[-1].strip() not in ('"""', "'''"):
+        yield ("D209",)
+
+
+def _check_surrounding_whitespace(d, doc, text):
+    lines = text.split("\n")
+    if lines[0].startswith(" ") or (len(lines) == 1 and lines[0].endswith(" ")):
+        yield ("D210",)
+
+
+def _check_quotes(d, doc, text):
+    # ''' is fine when the docstring itself contains """
+    quotes = "'''" if '"""' in text else '"""'
+    if not re.match(rf"[uU]?[rR]?{quotes}[^{quotes[0]}]", doc):
+        yield ("D300", re.match(r"[uU]?[rR]?(\"+|'+)", doc).group(1))
+
+
+def _check_backslashes(d, doc, text):
+    if _BACKSLASH.search(doc) and not doc.startswith(("r", "ur")):
+        yield ("D301",)
+
+
+def _check_period(d, doc, text):
+    summary = text.strip().split("\n")[0]
+    if not summary.endswith("."):
+        yield ("D400", summary[-1])
+
+
+def _verbs_by_stem():
+    if stemmer is None:
+        return None, None
+    stem = stemmer("english").stemWord
+    verbs = {}
+    for verb in IMPERATIVE_VERBS:
+        verbs.setdefault(stem(verb), set()).add(verb)
+    return stem, verbs
+
+
+_STEM, _VERBS_BY_STEM = _verbs_by_stem()
+
+
+def _common_prefix(a, b):
+    n = 0
+    while n < min(len(a), len(b)) and a[n] == b[n]:
+        n += 1
+    return n
+
+
+def _imperative_form(word):
+    """The verb `word` should have been, or None if it is fine as it is."""
+    if word in IMPERATIVE_VERBS:
+        return None
+    if _STEM is not None:
+        forms = _VERBS_BY_STEM.get(_STEM(word))
+        return max(forms, key=lambda f: _common_prefix(word, f)) if forms else None
+    for suffix, replacement in _VERB_SUFFIXES:
+        if word.endswith(suffix) and len(word) > len(suffix) + 1:
+            base = word[: -len(suffix)] + replacement
+            if base in IMPERATIVE_VERBS:
+                return base
+    return None
+
+
+def _check_imperative(d, doc, text):
+    if d["kind"] not in _FUNCTION_KINDS:
+        return
+    name = d["name"]
+    if name.startswith("test") or name == "runTest":
+        return
+    if PROPERTY_DECORATORS.intersection(d["decorators"]):
+        return
+    stripped = text.strip()
+    if not stripped:
+        return
+    first_word = _NON_ALPHANUMERIC.sub("", stripped.split()[0])
+    check_word = first_word.lower()
+    if check_word in IMPERATIVE_BLACKLIST:
+        yield ("D401b", first_word)
+        return
+    best = _imperative_form(check_word)
+    if best:
+        yield ("D401", best.capitalize(), first_word)
+
+
+def _check_signature(d, doc, text):
+    if d["kind"] not in _FUNCTION_KINDS:
+        return
+    first_line = text.strip().split("\n")[0]
+    if d["name"] + "(" in first_line.replace(" ", ""):
+        yield ("D402",)
+
+
+def _check_capitalized(d, doc, text):
+    if d["kind"] not in _FUNCTION_KINDS:
+        return
+    first_word = text.split()[0]
+    if first_word == first_word.upper():
+        return
+    if any(c not in string.ascii_letters and c != "'" for c in first_word):
+        return
+    if first_word != first_word.capitalize():
+        yield ("D403", first_word.capitalize(), first_word)
+
+
+def _leading_words(line):
+    match = _LEADING_WORDS.match(line.strip())
+    return match.group() if match else None
+
+
+def _section_contexts(lines, names):
+    """(name, following lines) for every real section header in `lines`."""
+    lower = [name.lower() for name in names]
+    found = []
+    for i, line in enumerate(lines):
+        if _leading_words(line.lower()) not in lower:
+            continue
+        name = _leading_words(line.strip())
+        suffix = line.strip().lstrip(name.strip()).strip()
+        previous = lines[i - 1]
+        if (_is_blank(suffix) or suffix == ":") and (
+            _is_blank(previous) or previous.strip().endswith(_SECTION_PUNCTUATION)
+        ):
+            found.append((i, name))
+    for n, (i, name) in enumerate(found):
+        end = found[n + 1][0] if n + 1 < len(found) else -1
+        yield name, lines[i + 1 : end]
+
+
+def _check_section_body(name, following):
+    blanks = _leading_blanks(following)
+    if blanks == len(following):
+        yield ("D414", name)
+        return
+    first = following[blanks]
+    if "".join(set(first.strip())) != "-":
+        if blanks:
+            yield ("D412", name)
+        return
+    after_dashes = blanks + 1
+    if after_dashes < len(following):
+        if _is_blank(following[after_dashes]):
+            if not _is_blank("".join(following[after_dashes:])):
+                yield ("D412", name)
+            else:
+                yield ("D414", name)
+    else:
+        yield ("D414", name)
+
+
+def _check_sections(d, doc, text):
+    lines = doc.split("\n")
+    if len(lines) < 2:
+        return
+    # NumPy sections win; Google sections are only looked at without them
+    contexts = list(_section_contexts(lines, NUMPY_SECTION_NAMES))
+    if not contexts:
+        contexts = _section_contexts(lines, GOOGLE_SECTION_NAMES)
+    for name, following in contexts:
+        yield from _check_section_body(name.title(), following)
+
+
+# Checks that end the search for a definition once they report something
+_TERMINAL_CHECKS = [_check_missing, _check_empty]
+# Everything else, in pydocstyle's reporting order
+_CHECKS = [
+    _check_one_liner,
+    _check_function_blanks,
+    _check_class_blanks,
+    _check_blank_after_summary,
+    _check_indent,
+    _check_closing_quotes,
+    _check_surrounding_whitespace,
+    _check_quotes,
+    _check_backslashes,
+    _check_period,
+    _check_imperative,
+    _check_signature,
+    _check_capitalized,
+    _check_sections,
+]
+
+
+def _message(key, params):
+    desc, context = MESSAGES[key]
+    code = key[:4]
+    text = f"{code}: {desc}"
+    if context is not None:
+        text += f" ({context.format(*params)})"
+    return code, text
+
+
+def check_definition(definition, select=PEP257_CODES):
+    """Violations for one definition as (code, "Dxxx: message") pairs."""
+    doc, text = definition["docstring"], definition["text"]
+    skip = definition["skip"]
+    if skip == "all":
+        return []
+
+    found = []
+    for check in _TERMINAL_CHECKS:
+        hits = [_message(key, params) for key, *params in check(definition, doc, text)]
+        hits = [hit for hit in hits if hit[0] not in skip]
+        found.extend(hits)
+        if hits:
+            return [hit for hit in found if hit[0] in select]
+
+    if doc:
+        for check in _CHECKS:
+            for key, *params in check(definition, doc, text):
+                code, message = _message(key, params)
+                if code not in skip:
+                    found.append((code, message))
+    return [hit for hit in found if hit[0] in select]
+
+
+def check_source(source, filename="<unknown>", select=PEP257_CODES):
+    """
+    Check source text against the PEP 257 rules, in process.
+
+    Returns dicts with File, Line, Code, Definition ("in public function `f`")
+    and Message ("D103: Missing docstring in public function"), in the order
+    pydocstyle reports them. Raises SyntaxError for unparsable source.
+    """
+    tree = ast.parse(source, filename)
+    return check_tree(tree, source, filename, select)
+
+
+def check_tree(tree, source, filename="<unknown>", select=PEP257_CODES):
+    """Same as check_source() for a module that was already parsed."""
+    lines = io.StringIO(source).readlines()  # str.splitlines also splits on \x85 etc.
+    violations = []
+    for definition in iter_definitions(tree, lines, filename):
+        for code, message in check_definition(definition, select):
+            violations.append(
+                {
+                    "File": filename,
+                    "Line": definition["line"],
+                    "Code": code,
+                    "Definition": describe(definition),
+                    "Message": message,
+                }
+            )
+    return violations
+
+
+def check_file(file_path, select=PEP257_CODES):
+    """check_source() for a file, decoded like the interpreter would."""
+    with profiling.stage("read"):
+        with tokenize.open(file_path) as f:
+            source = f.read()
+    with profiling.stage("pep257"):
+        return check_source(source, str(file_path), select)
+
+
+def format_violation(violation):
+    """pydocstyle's two-line text for one violation."""
+    return (
+        f"{violation['File']}:{violation['Line']} {violation['Definition']}:\n"
+        f"        {violation['Message']}"
+    )
@@ -0,0 +1,166 @@
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+# The Profile being recorded in this process, or None. Hooks check this
+# one global, so with profiling off a hook is a lookup and a shared no-op.
+_active = None
+_NULL = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profile.add_time(self.name, time.perf_counter() - self.start)
+
+
+class Profile:
+    """
+    Time spent per stage, event counters and per-file times for one run.
+
+    Stage times from worker processes are merged in with merge(), so with
+    --jobs they add up CPU-side work across workers and can exceed the
+    wall time.
+    """
+
+    def __init__(self):
+        self.stages = {}  # name -> [seconds, calls]
+        self.counters = Counter()
+        self.files = []  # (path, seconds) for every analyzed file
+        self.started = time.perf_counter()
+        self.wall = None
+
+    def add_time(self, name, seconds):
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def snapshot(self):
+        """Picklable copy of what was recorded, for sending to the parent."""
+        return {
+            "stages": {k: list(v) for k, v in self.stages.items()},
+            "counters": dict(self.counters),
+            "files": list(self.files),
+        }
+
+    def merge(self, snapshot):
+        for name, (seconds, calls) in snapshot["stages"].items():
+            entry = self.stages.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+        self.counters.update(snapshot["counters"])
+        self.files.extend(snapshot["files"])
+
+    def stop(self):
+        self.wall = time.perf_counter() - self.started
+
+    def slowest(self, n):
+        return sorted(self.files, key=lambda f: f[1], reverse=True)[:n]
+
+    def to_dict(self, top=10):
+        return {
+            "wall_seconds": self.wall,
+            "stages": {
+                name: {"seconds": seconds, "calls": calls}
+                for name, (seconds, calls) in sorted(
+                    self.stages.items(), key=lambda s: s[1][0], reverse=True
+                )
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "slowest_files": [
+                {"path": str(path), "seconds": seconds}
+                for path, seconds in self.slowest(top)
+            ],
+        }
+
+    def format_table(self, top=10):
+        """Human-readable report for --profile."""
+        wall = self.wall or 0.0
+        lines = [f"Profile (wall time {wall:.3f}s)", ""]
+        lines.append(
+            f"{'Stage':<16} {'Calls':>8} {'Total s':>9} {'Mean ms':>9} {'Wall':>6}"
+        )
+        for name, (seconds, calls) in sorted(
+            self.stages.items(), key=lambda s: s[1][0], reverse=True
+        ):
+            share = f"{seconds / wall * 100:.0f}%" if wall else "-"
+            lines.append(
+                f"{name:<16} {calls:>8} {seconds:>9.3f} "
+                f"{seconds / calls * 1e3:>9.3f} {share:>6}"
+            )
+        if self.counters:
+            lines.append("")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<16} {value:>8}")
+        if self.files:
+            lines.append("")
+            lines.append(f"Slowest {min(top, len(self.files))} file(s):")
+            for path, seconds in self.slowest(top):
+                lines.append(f"  {seconds * 1e3:>9.2f} ms  {path}")
+        return "\n".join(lines)
+
+
+# ---------- HOOKS ----------
+def stage(name):
+    """Context manager timing one stage; a shared no-op when disabled."""
+    if _active is None:
+        return _NULL
+    return _Timer(_active, name)
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.counters[name] += n
+
+
+def file_done(path, seconds):
+    if _active is not None:
+        _active.files.append((path, seconds))
+
+
+def enabled():
+    return _active is not None
+
+
+# ---------- CONTROL ----------
+def enable():
+    """Start recording in this process and return the new Profile."""
+    global _active
+    _active = Profile()
+    return _active
+
+
+def disable():
+    """Stop recording and return the Profile that was active (or None)."""
+    global _active
+    profile, _active = _active, None
+    if profile is not None:
+        profile.stop()
+    return profile
+
+
+def collect():
+    """
+    Snapshot and reset the active profile (None when disabled). Workers
+    call this after each chunk so nothing is sent twice.
+    """
+    global _active
+    if _active is None:
+        return None
+    snapshot = _active.snapshot()
+    _active = Profile()
+    return snapshot
+
+
+def merge(snapshot):
+    """Merge a worker's collect() snapshot into the active profile."""
+    if _active is not None and snapshot is not None:
+        _active.merge(snapshot)
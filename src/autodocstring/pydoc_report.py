@@ -1,31 +1,17 @@
-import subprocess
+from autodocstring.pep257_rules import check_file
 
 
 def run_pydocstyle(file_path):
     """
-    Runs pydocstyle and returns RAW violations.
+    Runs the PEP 257 checks and returns RAW violations, one per row.
     This version is FAIL-SAFE.
     """
 
     try:
-        result = subprocess.run(
-            ["pydocstyle", file_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-
-        output = result.stdout + result.stderr
-
-        if not output.strip():
-            return []
-
-        issues = []
-
-        for line in output.splitlines():
-            issues.append({"Violation": line})
-
-        return issues
+        return [
+            {"Violation": f"{v['File']}:{v['Line']} {v['Definition']}: {v['Message']}"}
+            for v in check_file(file_path)
+        ]
 
     except Exception as e:
         return [{"Violation": str(e)}]
@@ -1,23 +1,22 @@
-import subprocess
 import tempfile
 import os
 
+from autodocstring.pep257_rules import check_file
+
 
 def pep257_report(file_path):
     """
-    Runs pydocstyle on a Python file and returns:
+    Runs the PEP 257 checks on a Python file and returns:
     - Total errors
     - Error messages
     - Compliance %
     """
 
     try:
-        result = subprocess.run(
-            ["pydocstyle", file_path], capture_output=True, text=True
-        )
-
-        errors = result.stdout.strip().split("\n") if result.stdout else []
-        errors = [e for e in errors if e.strip()]
+        errors = [
+            f"{v['File']}:{v['Line']} {v['Definition']}: {v['Message']}"
+            for v in check_file(file_path)
+        ]
 
         return {
             "total_errors": len(errors),
@@ -0,0 +1,211 @@
+import sys
+import hashlib
+
+
+def docstring_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _intern(value):
+    return sys.intern(value) if value is not None else None
+
+
+class _Record:
+    """
+    Slotted record that also behaves like a read/write dict.
+
+    Parser output used to be plain dicts, so records keep supporting
+    record["name"], record.get(...), dict(record) and {**record}. Dict
+    keys map to attributes through _KEYS; "class" is stored as class_name.
+    """
+
+    __slots__ = ()
+    _KEYS = {}
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._KEYS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, self._KEYS[key], value)
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self._KEYS
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def get(self, key, default=None):
+        attr = self._KEYS.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def keys(self):
+        return self._KEYS.keys()
+
+    def items(self):
+        return [(k, self[k]) for k in self._KEYS]
+
+    def replace(self, **changes):
+        new = object.__new__(type(self))
+        for attr in self.__slots__:
+            object.__setattr__(new, attr, changes.get(attr, getattr(self, attr)))
+        return new
+
+    def to_dict(self):
+        return {k: _plain(v) for k, v in self.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, (_Record, dict)):
+            return self.to_dict() == _plain(other)
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={self[k]!r}" for k in self._KEYS)
+        return f"{type(self).__name__}({fields})"
+
+
+def _plain(value):
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+class ParamRecord(_Record):
+    __slots__ = ("name", "type")
+    _KEYS = {"name": "name", "type": "type"}
+
+    def __init__(self, name, type=None):
+        self.name = _intern(name)
+        self.type = _intern(type)
+
+
+class FunctionRecord(_Record):
+    __slots__ = (
+        "name",
+        "class_name",
+        "signature",
+        "params",
+        "returns",
+        "has_docstring",
+        "lineno",
+        "end_lineno",
+        "docstring",
+        "docstring_hash",
+        "raises",
+        "is_generator",
+    )
+    _KEYS = {
+        "name": "name",
+        "class": "class_name",
+        "signature": "signature",
+        "params": "params",
+        "returns": "returns",
+        "has_docstring": "has_docstring",
+        "lineno": "lineno",
+        "end_lineno": "end_lineno",
+        "docstring": "docstring",
+        "docstring_hash": "docstring_hash",
+        "raises": "raises",
+        "is_generator": "is_generator",
+    }
+
+    def __init__(
+        self,
+        name,
+        class_name=None,
+        signature="",
+        params=(),
+        returns=None,
+        has_docstring=False,
+        lineno=0,
+        end_lineno=None,
+        docstring=None,
+        docstring_hash=None,
+        raises=(),
+        is_generator=False,
+    ):
+        self.name = _intern(name)
+        self.class_name = _intern(class_name)
+        self.signature = signature
+        self.params = list(params)
+        self.returns = _intern(returns)
+        self.has_docstring = has_docstring
+        self.lineno = lineno
+        self.end_lineno = end_lineno
+        self.docstring = docstring
+        self.docstring_hash = docstring_hash
+        self.raises = list(raises)
+        self.is_generator = is_generator
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["class_name"] = data.pop("class", None)
+        data["params"] = [ParamRecord(**p) for p in data.get("params", ())]
+        return cls(**data)
+
+
+class ClassRecord(_Record):
+    __slots__ = (
+        "class_name",
+        "has_docstring",
+        "docstring",
+        "docstring_hash",
+        "lineno",
+        "end_lineno",
+        "attributes",
+        "methods",
+    )
+    _KEYS = {name: name for name in __slots__}
+
+    def __init__(
+        self,
+        class_name,
+        has_docstring=False,
+        docstring=None,
+        docstring_hash=None,
+        lineno=0,
+        end_lineno=None,
+        attributes=(),
+        methods=(),
+    ):
+        self.class_name = _intern(class_name)
+        self.has_docstring = has_docstring
+        self.docstring = docstring
+        self.docstring_hash = docstring_hash
+        self.lineno = lineno
+        self.end_lineno = end_lineno
+        self.attributes = list(attributes)
+        self.methods = list(methods)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["methods"] = [FunctionRecord.from_dict(m) for m in data.get("methods", ())]
+        return cls(**data)
+
+
+def to_plain(parsed_data):
+    """parse_file() output -> JSON-serializable dicts (for caches and --format)."""
+    return {k: _plain(v) for k, v in parsed_data.items()}
+
+
+def from_plain(data):
+    """Inverse of to_plain()."""
+    return {
+        **data,
+        "functions": [FunctionRecord.from_dict(f) for f in data["functions"]],
+        "classes": [ClassRecord.from_dict(c) for c in data["classes"]],
+    }
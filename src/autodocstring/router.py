@@ -0,0 +1,208 @@
+"""
+Route each function to the smallest local model that can document it.
+
+Routes are tried in the configured order, smallest model first:
+
+    [tool.autodocstring]
+    llm-routes = [
+        { model = "qwen2.5-coder:1.5b", max-lines = 12, max-complexity = 2 },
+        { model = "qwen2.5-coder:3b", max-lines = 80, max-complexity = 8 },
+        { model = "qwen2.5-coder:7b" },
+    ]
+
+A function takes the first route whose limits it stays within (the
+last route takes everything else). Its size and shape come from the
+parser's FunctionRecord (signature, raises, is_generator) and
+tiers.complexity(). When the answer fails analyze_docstring, the next
+route's model is asked again. Per-route latency and acceptance rates
+are recorded, so the limits can be tuned.
+"""
+
+import ast
+import time
+import threading
+from collections import Counter
+
+from autodocstring.compliance import analyze_docstring
+from autodocstring.llm_generator import generate_docstring_llm, get_client
+from autodocstring.tiers import complexity
+
+# Limits a route can set, and the feature each one applies to
+LIMITS = {
+    "max_signature": "signature",
+    "max_lines": "lines",
+    "max_complexity": "complexity",
+    "max_raises": "raises",
+    "max_yields": "yields",  # 0 keeps generators off a route
+}
+
+
+def features(record, node):
+    """The size and shape of a def that routes are chosen by."""
+    return {
+        "signature": len(record.signature),
+        "lines": (node.end_lineno or node.lineno) - node.lineno + 1,
+        "complexity": complexity(node),
+        "raises": len(record.raises),
+        "yields": int(record.is_generator),
+    }
+
+
+def accepts(docstring, record, style):
+    """Whether a generated docstring (with quotes) passes analyze_docstring."""
+    text = docstring.strip()
+    for q in ['"""', "'''"]:
+        if text.startswith(q) and text.endswith(q):
+            text = text[len(q) : -len(q)]
+    # Parse the text as the docstring it will become
+    text = ast.get_docstring(ast.parse(f"def f():\n    {text!r}\n").body[0])
+    return analyze_docstring(record.replace(docstring=text), style)["pep257_compliant"]
+
+
+class Route:
+    def __init__(self, model, **limits):
+        unknown = set(limits) - set(LIMITS)
+        if unknown:
+            raise ValueError(
+                f"Unknown route limit(s) {', '.join(sorted(unknown))}; "
+                f"use {', '.join(LIMITS)}"
+            )
+        self.model = model
+        self.limits = limits
+
+    def takes(self, features):
+        return all(
+            limit is None or features[LIMITS[name]] <= limit
+            for name, limit in self.limits.items()
+        )
+
+    def __repr__(self):
+        return f"Route({self.model!r}, {self.limits})"
+
+
+class _Tracked:
+    """An LLMCache that notes in `missed` whether the model had to be asked."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.missed = False
+
+    def get(self, key, generate):
+        def ask():
+            self.missed = True
+            return generate()
+
+        return self.cache.get(key, ask)
+
+
+class ModelRouter:
+    """
+    Sends each function to the first route that takes it and, with
+    `escalate`, to the following routes while the answer fails
+    validation (the last answer is kept either way). `stats` holds a
+    Counter per model: calls, accepted, rejected, errors and seconds of
+    the requests made, and the cache hits that needed none.
+    """
+
+    def __init__(self, routes, escalate=True, client=None):
+        if not routes:
+            raise ValueError("ModelRouter needs at least one route")
+        self.routes = list(routes)
+        self.escalate = escalate
+        self._client = client
+        self._clients = {}
+        self.stats = {route.model: Counter() for route in self.routes}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, client=None):
+        """Router for a load_config() result, or None without llm-routes."""
+        routes = config.get("llm_routes")
+        if not routes:
+            return None
+        return cls(
+            [
+                Route(**{key.replace("-", "_"): value for key, value in r.items()})
+                for r in routes
+            ],
+            escalate=config.get("llm_escalate", True),
+            client=client,
+        )
+
+    def client_for(self, model):
+        """A client for `model`, sharing the base client's connections."""
+        with self._lock:
+            if model not in self._clients:
+                base = self._client or get_client()
+                self._clients[model] = (
+                    base if base.model == model else base.with_model(model)
+                )
+            return self._clients[model]
+
+    def route(self, features):
+        """Index of the first route that takes a function with `features`."""
+        for i, route in enumerate(self.routes[:-1]):
+            if route.takes(features):
+                return i
+        return len(self.routes) - 1
+
+    def _count(self, model, **counts):
+        with self._lock:
+            self.stats[model].update(counts)
+
+    def generate(self, code, style="Google", record=None, node=None, **options):
+        """
+        A docstring for `code` (as generate_docstring_llm), from the model
+        of the route its FunctionRecord and def node call for. Other
+        options go to generate_docstring_llm.
+        """
+        first = self.route(features(record, node))
+        last = len(self.routes) - 1 if self.escalate else first
+        cache = options.pop("cache", None)
+        for i in range(first, last + 1):
+            model = self.routes[i].model
+            tracked = None if cache is None else _Tracked(cache)
+            started = time.perf_counter()
+            try:
+                docstring = generate_docstring_llm(
+                    code, style, self.client_for(model), cache=tracked, **options
+                )
+            except Exception:
+                self._count(model, calls=1, errors=1)
+                raise
+            elapsed = time.perf_counter() - started
+            ok = accepts(docstring, record, style)
+            if tracked is not None and not tracked.missed:
+                # No request was made: kept out of latency and acceptance
+                self._count(model, **{"cache hits": 1})
+            else:
+                self._count(
+                    model,
+                    calls=1,
+                    seconds=elapsed,
+                    accepted=int(ok),
+                    rejected=int(not ok),
+                )
+            if ok:
+                break
+        return docstring
+
+    def summary(self):
+        """Per model: calls, acceptance rate, mean latency (ms) and cache hits."""
+        with self._lock:
+            return {
+                model: {
+                    "calls": stats["calls"],
+                    "acceptance": (
+                        stats["accepted"] / stats["calls"] if stats["calls"] else None
+                    ),
+                    "mean ms": (
+                        stats["seconds"] / stats["calls"] * 1e3
+                        if stats["calls"]
+                        else None
+                    ),
+                    "errors": stats["errors"],
+                    "cache hits": stats["cache hits"],
+                }
+                for model, stats in self.stats.items()
+            }
@@ -0,0 +1,400 @@
+import os
+import time
+import signal
+import multiprocessing
+from collections import deque
+from itertools import islice
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from autodocstring import profiling
+from autodocstring.parser import parse_file
+from autodocstring.coverage import coverage_report
+from autodocstring.fastscan import fast_coverage_report
+from autodocstring.records import from_plain, to_plain
+from autodocstring.walker import iter_files
+
+# Per-file limit used with --jobs when no --timeout is given
+DEFAULT_TIMEOUT = 60.0
+# Workers are replaced after this many chunks so leaked memory is returned
+MAX_CHUNKS_PER_WORKER = 50
+# Extra seconds the parent waits for a chunk before declaring the worker hung
+HARD_TIMEOUT_GRACE = 5.0
+# Cache lookups made ahead of the oldest pending miss (at least)
+CACHE_LOOKAHEAD = 256
+
+
+@contextmanager
+def _deadline(seconds):
+    """
+    Raise TimeoutError in the current process after `seconds`.
+    Only active on platforms with SIGALRM and in the main thread.
+    """
+    if not seconds or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def _expired(signum, frame):
+        raise TimeoutError(f"exceeded {seconds:g}s")
+
+    try:
+        previous = signal.signal(signal.SIGALRM, _expired)
+    except ValueError:  # not the main thread
+        yield
+        return
+
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def check_file(file_path, timeout=None, fast=False):
+    """
+    Parse one file and build its coverage report.
+
+    With fast=True only coverage is computed, from tokens (see fastscan),
+    and "parsed" is None. Never raises: failures are returned in the
+    "error" field as "ExceptionName: message", matching what the CLI prints.
+    """
+    start = time.perf_counter() if profiling.enabled() else None
+    try:
+        with _deadline(timeout):
+            if fast:
+                parsed = None
+                report = fast_coverage_report(str(file_path))
+            else:
+                parsed = parse_file(str(file_path))
+                with profiling.stage("coverage_report"):
+                    report = coverage_report(parsed)
+        if start is not None:
+            profiling.file_done(file_path, time.perf_counter() - start)
+            profiling.count("files analyzed")
+            profiling.count("items", report["Total"] + report["Classes"])
+        return {"path": file_path, "parsed": parsed, "report": report, "error": None}
+    except Exception as e:
+        return {
+            "path": file_path,
+            "parsed": None,
+            "report": None,
+            "error": f"{type(e).__name__}: {str(e)}",
+        }
+
+
+# ---------- WORKER SIDE ----------
+def _init_worker(max_memory_mb, profile=False):
+    # Let the parent handle Ctrl+C once, instead of every worker printing a traceback
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if profile:
+        profiling.enable()
+
+    if max_memory_mb and resource is not None:
+        limit = int(max_memory_mb * 1024 * 1024)
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _check_chunk(chunk, timeout, fast):
+    # The worker's profile (None when disabled) travels back with the results
+    return [check_file(p, timeout, fast) for p in chunk], profiling.collect()
+
+
+# ---------- PARENT SIDE ----------
+def resolve_jobs(value):
+    """Turn a --jobs value ("auto" or a number) into a worker count."""
+    if str(value).lower() == "auto":
+        return os.cpu_count() or 1
+    jobs = int(value)
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1 or 'auto'")
+    return jobs
+
+
+def _chunk_size(total, jobs):
+    # Roughly 4 chunks per worker keeps the pool busy without tiny tasks
+    return max(1, min(32, -(-total // (jobs * 4))))
+
+
+def _new_pool(jobs, max_memory_mb):
+    return multiprocessing.Pool(
+        jobs,
+        initializer=_init_worker,
+        initargs=(max_memory_mb, profiling.enabled()),
+        maxtasksperchild=MAX_CHUNKS_PER_WORKER,
+    )
+
+
+def _iter_parallel(files, jobs, timeout, max_memory_mb, chunk_size, fast):
+    # Chunks are taken with islice, so a source that runs dry for now
+    # (see _Feed) can be pulled from again later
+    files = iter(files)
+    retry = deque()  # chunks to resubmit after a pool restart, in order
+    inflight = deque()
+    pool = None
+
+    try:
+        while True:
+            if pool is None:
+                pool = _new_pool(jobs, max_memory_mb)
+
+            # Keep a bounded number of chunks queued so memory stays flat
+            while len(inflight) < jobs * 2:
+                chunk = retry.popleft() if retry else list(islice(files, chunk_size))
+                if not chunk:
+                    break
+                pending = pool.apply_async(_check_chunk, (chunk, timeout, fast))
+                inflight.append((chunk, pending))
+
+            if not inflight:
+                break
+
+            chunk, pending = inflight.popleft()
+            try:
+                results, snapshot = pending.get(
+                    len(chunk) * timeout + HARD_TIMEOUT_GRACE
+                )
+            except multiprocessing.TimeoutError:
+                # The worker is stuck outside the interpreter (or died): restart
+                # the pool, isolate the slow chunk file by file and requeue the rest.
+                pool.terminate()
+                pool.join()
+                pool = None
+
+                requeue = []
+                if len(chunk) == 1:
+                    yield {
+                        "path": chunk[0],
+                        "parsed": None,
+                        "report": None,
+                        "error": f"TimeoutError: exceeded {timeout:g}s",
+                    }
+                else:
+                    requeue.extend([p] for p in chunk)
+                requeue.extend(c for c, _ in inflight)
+                requeue.extend(retry)
+                retry = deque(requeue)
+                inflight.clear()
+                continue
+
+            profiling.merge(snapshot)
+            yield from results
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def _iter_uncached(files, jobs, timeout, max_memory_mb, chunk_size, fast):
+    if jobs <= 1:
+        for f in files:
+            yield check_file(f, timeout, fast)
+        return
+
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    if chunk_size is None:
+        chunk_size = _chunk_size(len(files), jobs) if hasattr(files, "__len__") else 16
+
+    yield from _iter_parallel(files, jobs, timeout, max_memory_mb, chunk_size, fast)
+
+
+class _Feed:
+    """
+    Iterator over the files `pull()` returns, until it returns None.
+    Unlike a generator it can be pulled from again after that.
+    """
+
+    def __init__(self, pull):
+        self.pull = pull
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self.pull()
+        if item is None:
+            raise StopIteration
+        return item
+
+
+class _Miss:
+    """A cache miss in `order`, with the token to store its result under."""
+
+    __slots__ = ("token",)
+
+    def __init__(self, token):
+        self.token = token
+
+
+def _iter_cached(files, jobs, timeout, max_memory_mb, chunk_size, fast, cache):
+    # Lookups happen in this process; only misses are checked. A hit is
+    # yielded straight away unless a miss before it is still pending: then
+    # `order` holds it, with the miss tokens, until results can be merged
+    # back in input order. With jobs > 1 the workers are kept busy by
+    # looking ahead for more misses, but never past `window` entries.
+    kind = "fast" if fast else "coverage"
+    source = iter(files)
+    order = deque()  # hit results and _Miss entries, in input order
+    handoff = deque()  # misses found by the lookup loop, for the workers
+
+    def lookup(f):
+        try:
+            with profiling.stage("cache lookup"):
+                payload, token = cache.lookup(f, kind)
+        except OSError:
+            payload, token = None, None
+        profiling.count("cache hits" if payload is not None else "cache misses")
+        if payload is None:
+            return _Miss(token)
+        parsed = payload["parsed"] and from_plain(payload["parsed"])
+        return {"path": f, "parsed": parsed, "report": payload["report"], "error": None}
+
+    def store(miss, result):
+        if miss.token is not None and result["error"] is None:
+            parsed = result["parsed"] and to_plain(result["parsed"])
+            with profiling.stage("cache store"):
+                cache.store(
+                    miss.token, kind, {"parsed": parsed, "report": result["report"]}
+                )
+
+    if jobs <= 1:
+        for f in source:
+            entry = lookup(f)
+            if isinstance(entry, _Miss):
+                result = check_file(f, timeout, fast)
+                store(entry, result)
+                entry = result
+            yield entry
+        return
+
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    if chunk_size is None:
+        chunk_size = _chunk_size(len(files), jobs) if hasattr(files, "__len__") else 16
+    window = max(CACHE_LOOKAHEAD, 4 * jobs * chunk_size)
+
+    def pull():
+        """The next miss for the workers, or None for now."""
+        if handoff:
+            return handoff.popleft()
+        # Only look ahead behind a pending miss, and not too far
+        while order and len(order) < window:
+            f = next(source, None)
+            if f is None:
+                return None
+            entry = lookup(f)
+            order.append(entry)
+            if isinstance(entry, _Miss):
+                return f
+        return None
+
+    results = _iter_parallel(
+        _Feed(pull), jobs, timeout, max_memory_mb, chunk_size, fast
+    )
+    try:
+        while True:
+            while order and not isinstance(order[0], _Miss):
+                yield order.popleft()
+            if not order:
+                # Nothing pending: hits go straight out until the next miss
+                f = next(source, None)
+                if f is None:
+                    break
+                entry = lookup(f)
+                if not isinstance(entry, _Miss):
+                    yield entry
+                    continue
+                order.append(entry)
+                handoff.append(f)
+
+            result = next(results)
+            miss = order.popleft()
+            store(miss, result)
+            yield result
+    finally:
+        results.close()
+
+
+def iter_checks(
+    files,
+    jobs=1,
+    timeout=None,
+    max_memory_mb=None,
+    chunk_size=None,
+    cache=None,
+    fast=False,
+):
+    """
+    Check files and yield one result dict per file, in input order.
+
+    With jobs > 1 the files are split into chunks and checked in a process
+    pool. Each file gets `timeout` seconds (DEFAULT_TIMEOUT if not given);
+    workers that hang are killed and replaced, and `max_memory_mb` caps the
+    address space of every worker. Files found in `cache` (a ResultCache)
+    are not re-analyzed. fast=True computes coverage only, from tokens.
+    """
+    args = (files, jobs, timeout, max_memory_mb, chunk_size, fast)
+    if cache is None:
+        yield from _iter_uncached(*args)
+    else:
+        yield from _iter_cached(*args, cache)
+
+
+def run_checks(files, jobs=1, timeout=None, max_memory_mb=None, cache=None, fast=False):
+    """Same as iter_checks, but returns a list."""
+    return list(
+        iter_checks(files, jobs, timeout, max_memory_mb, cache=cache, fast=fast)
+    )
+
+
+def iter_python_files(paths, skipped=None, matcher=None, walk_jobs=None):
+    """
+    Yield the .py files under `paths` (folders or files) lazily, skipping
+    what `matcher` (a walker.Matcher; default: built-in ignore-dirs and
+    .gitignore) rules out. Paths that are neither are appended to
+    `skipped` if given.
+    """
+    return iter_files(paths, matcher, skipped, walk_jobs)
+
+
+def iter_scan(
+    paths,
+    jobs=1,
+    timeout=None,
+    max_memory_mb=None,
+    cache=None,
+    fast=False,
+    matcher=None,
+):
+    """
+    Scan folders/files and yield one result per file as soon as it is ready.
+
+    Each result is a dict with "path", "parsed" (parse_file output),
+    "report" (coverage_report output) and "error" (None or
+    "ExceptionName: message"). With fast=True only coverage is computed
+    and "parsed" is None. Files are discovered lazily and only a
+    bounded number are in flight at once, so memory does not grow with
+    the size of the repository. `matcher` (a walker.Matcher) decides
+    which folders and files are skipped.
+
+        for result in iter_scan(["src/"], jobs=4):
+            print(result["path"], result["report"]["Coverage (%)"])
+    """
+    files = iter_python_files(paths, matcher=matcher)
+    yield from iter_checks(
+        files,
+        jobs=jobs,
+        timeout=timeout,
+        max_memory_mb=max_memory_mb,
+        cache=cache,
+        fast=fast,
+    )
@@ -0,0 +1,136 @@
+"""
+Decide which functions really need the LLM.
+
+The injector can sort every function into a tier before asking the
+model for anything:
+
+    kept       its docstring already passes analyze_docstring
+    templated  undocumented and simple enough (see complexity()) for
+               generator's instant templates
+    skipped    a nested helper, when the policy leaves those alone
+    llm        everything else
+
+Only the last tier costs a request. A template never replaces an
+existing docstring: a failing one goes to the LLM, which sees it.
+"""
+
+import ast
+
+from autodocstring.compliance import analyze_docstring
+from autodocstring.generator import generate_docstring
+from autodocstring.parser import CodeParser
+
+TIERS = ("kept", "templated", "skipped", "llm")
+# Functions scoring below this get a template (straight-line code)
+DEFAULT_TEMPLATE_BELOW = 2
+NESTED_CHOICES = ("llm", "template", "skip")
+
+_NESTED_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+_BRANCHES = (
+    ast.If,
+    ast.IfExp,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.ExceptHandler,
+    ast.With,
+    ast.AsyncWith,
+    ast.Assert,
+    ast.comprehension,
+    ast.match_case,
+    ast.Raise,
+    ast.Yield,
+    ast.YieldFrom,
+)
+
+
+def complexity(node):
+    """
+    McCabe-style score of a def: 1, plus one per branch, loop, handler,
+    raise and yield, plus one per extra operand of and/or. Nested defs,
+    classes and lambdas are not counted.
+    """
+    score = 1
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, _NESTED_SCOPES):
+            continue
+        if isinstance(child, _BRANCHES):
+            score += 1
+        elif isinstance(child, ast.BoolOp):
+            score += len(child.values) - 1
+        stack.extend(ast.iter_child_nodes(child))
+    return score
+
+
+def function_record(node, class_name=None):
+    """The parser's FunctionRecord for one def node."""
+    parser = CodeParser()
+    parser.visit(node)
+    record = parser.functions[0]
+    record.class_name = class_name
+    return record
+
+
+def template_docstring(record, style):
+    """The generator's template for a FunctionRecord, without self/cls."""
+    params = record.params
+    if record.class_name and params and params[0].name in ("self", "cls"):
+        record = record.replace(params=params[1:])
+    return generate_docstring(record, record.class_name, style)
+
+
+class TierPolicy:
+    """
+    Which tier each function goes to.
+
+    `keep_compliant` keeps docstrings that analyze_docstring accepts,
+    undocumented functions scoring below `template_below` are templated
+    (0 turns templates off), and `nested` says what happens to defs
+    inside other defs: "llm" (like any function), "template" (documented
+    ones are skipped) or "skip".
+    """
+
+    def __init__(
+        self,
+        keep_compliant=True,
+        template_below=DEFAULT_TEMPLATE_BELOW,
+        nested="template",
+    ):
+        if nested not in NESTED_CHOICES:
+            raise ValueError(
+                f"nested must be one of {', '.join(NESTED_CHOICES)}, not {nested!r}"
+            )
+        self.keep_compliant = keep_compliant
+        self.template_below = template_below
+        self.nested = nested
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Policy for a load_config() result, or None when tiers = false
+        (every function goes to the LLM).
+        """
+        if not config.get("tiers"):
+            return None
+        return cls(
+            keep_compliant=config.get("tier_keep_compliant", True),
+            template_below=config.get("tier_template_below", DEFAULT_TEMPLATE_BELOW),
+            nested=config.get("tier_nested", "template"),
+        )
+
+    def choose(self, record, node, style, nested=False):
+        """The tier (see TIERS) of a def and its FunctionRecord."""
+        if self.keep_compliant and record.docstring:
+            if analyze_docstring(record, style)["pep257_compliant"]:
+                return "kept"
+        documented = bool(record.docstring)
+        if nested and self.nested != "llm":
+            # A documented helper is left alone rather than templated
+            if self.nested == "template" and not documented:
+                return "templated"
+            return "skipped"
+        if not documented and complexity(node) < self.template_below:
+            return "templated"
+        return "llm"
@@ -0,0 +1,420 @@
+"""
+Source discovery: a pruning, ignore-aware directory walker.
+
+Directories are listed with os.scandir and every subdirectory is tested
+before it is entered, so an ignored .venv/ or node_modules/ costs one
+name lookup instead of a walk over thousands of files. Three kinds of
+rules decide what is skipped:
+
+- ignore-dirs: directory names (or name globs) skipped at any depth;
+- .gitignore files found in the walked folders, and those above them
+  up to the repository root;
+- exclude/include globs (gitignore syntax, relative to the current
+  directory) from [tool.autodocstring] and the command line.
+
+On network file systems (NFS, SMB, ...) each listing is a round trip,
+so directories are listed from a thread pool instead of one by one.
+"""
+
+import os
+import re
+import sys
+import fnmatch
+from pathlib import Path
+
+from autodocstring import profiling
+
+# Always skipped at any depth; [tool.autodocstring] ignore-dirs adds to these
+DEFAULT_IGNORE_DIRS = (
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    ".venv",
+    "venv",
+    "node_modules",
+    "build",
+    "dist",
+    ".tox",
+    ".nox",
+    ".eggs",
+    "*.egg-info",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".autodocstring_cache",
+)
+DEFAULT_INCLUDE = ("*.py",)
+# File system types (/proc/self/mounts) where listing a folder is a round trip
+NETWORK_FS = frozenset(
+    {
+        "nfs",
+        "nfs4",
+        "cifs",
+        "smb3",
+        "smbfs",
+        "9p",
+        "afs",
+        "ceph",
+        "glusterfs",
+        "lustre",
+        "gpfs",
+        "beegfs",
+        "fuse.sshfs",
+        "fuse.s3fs",
+        "davfs",
+    }
+)
+# Threads listing directories in parallel on a network file system
+NETWORK_WALK_JOBS = 16
+
+
+# ---------- PATTERNS ----------
+def _has_glob(name):
+    return any(c in name for c in "*?[")
+
+
+def translate(pattern, descendants=True):
+    """
+    Regex source for one gitignore-style glob, matched against a
+    '/'-separated path relative to where the pattern was written.
+
+    As in .gitignore and CODEOWNERS, a pattern with a slash (other than a
+    trailing one) is anchored there, and one without matches at any
+    depth. With `descendants` it also matches everything below a match.
+    """
+    anchored = pattern.startswith("/") or "/" in pattern.rstrip("/")
+    pattern = pattern.strip("/")
+    regex = ""
+    for part in re.split(r"(\*\*/?|\*|\?|\[[^\]/]*\])", pattern):
+        if part.startswith("**"):
+            regex += "(?:.*/)?" if part.endswith("/") else ".*"
+        elif part == "*":
+            regex += "[^/]*"
+        elif part == "?":
+            regex += "[^/]"
+        elif part.startswith("[") and part.endswith("]") and len(part) > 2:
+            body = part[1:-1]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            regex += f"[{body}]"
+        else:
+            regex += re.escape(part)
+    prefix = "" if anchored else "(?:.*/)?"
+    suffix = "(?:/.*)?" if descendants else ""
+    return f"{prefix}{regex}{suffix}$"
+
+
+def compile_pattern(pattern, descendants=True):
+    """translate() compiled."""
+    return re.compile(translate(pattern, descendants))
+
+
+class RuleSet:
+    """
+    Ordered gitignore-style patterns ("!" re-includes, a trailing "/"
+    matches directories only); the last pattern that matches wins.
+
+    Without "!" patterns the order does not matter, so all patterns are
+    joined into one regex and a path is tested with a single match().
+    """
+
+    def __init__(self, patterns):
+        self.rules = []
+        for line in patterns:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate or line.startswith(("\\!", "\\#")):
+                line = line[1:]
+            self.rules.append(
+                (compile_pattern(line, descendants=False), negate, line.endswith("/"))
+            )
+
+        self.ordered = any(negate for _, negate, _ in self.rules)
+        self._files = self._join(r for r, _, dir_only in self.rules if not dir_only)
+        self._dirs = self._join(r for r, _, _ in self.rules)
+
+    @staticmethod
+    def _join(regexes):
+        sources = [f"(?:{r.pattern})" for r in regexes]
+        return re.compile("|".join(sources)) if sources else None
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def match(self, path, is_dir):
+        """True if `path` is matched, False if re-included, None if no rule says."""
+        if not self.ordered:
+            regex = self._dirs if is_dir else self._files
+            return True if regex is not None and regex.match(path) else None
+        for regex, negate, dir_only in reversed(self.rules):
+            if (is_dir or not dir_only) and regex.match(path):
+                return not negate
+        return None
+
+
+def read_gitignore(path):
+    """RuleSet of a .gitignore file, or None if it is missing or empty."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            rules = RuleSet(f)
+    except OSError:
+        return None
+    return rules or None
+
+
+def _repository_root(directory):
+    for parent in (directory, *directory.parents):
+        if (parent / ".git").exists():
+            return parent
+    return None
+
+
+def _outer_gitignores(root):
+    """
+    Layers (rules, 0, prefix) for the .gitignore files above `root` up
+    to the repository root; `prefix` turns a path under `root` into one
+    relative to that .gitignore's folder. Layers found while walking are
+    (rules, strip, ""): the first `strip` characters are cut off instead.
+    """
+    root = Path(root).resolve()
+    top = _repository_root(root)
+    if top is None or top == root:
+        return ()
+    layers = []
+    for directory in reversed(root.parents):
+        if directory != top and top not in directory.parents:
+            continue
+        rules = read_gitignore(directory / ".gitignore")
+        if rules is not None:
+            prefix = root.relative_to(directory).as_posix() + "/"
+            layers.append((rules, 0, prefix))
+    return tuple(layers)
+
+
+def _relative_prefix(directory, base):
+    # Where `directory` is, as seen from `base`, ready to prepend to names
+    try:
+        rel = Path(os.path.abspath(directory)).relative_to(base).as_posix()
+    except ValueError:
+        rel = Path(os.path.abspath(directory)).as_posix()
+    return "" if rel == "." else rel + "/"
+
+
+# ---------- NETWORK FILE SYSTEMS ----------
+def _mounts():
+    mounts = []
+    try:
+        with open("/proc/self/mounts", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    # Spaces and the like are written as octal escapes (\040)
+                    point = re.sub(
+                        r"\\([0-7]{3})", lambda m: chr(int(m[1], 8)), fields[1]
+                    )
+                    mounts.append((point, fields[2]))
+    except OSError:
+        pass
+    return mounts
+
+
+def is_network_fs(path):
+    """True if `path` is on a network file system (Linux only; else False)."""
+    if not sys.platform.startswith("linux"):
+        return False
+    path = os.path.realpath(path)
+    best, fs_type = "", None
+    for point, kind in _mounts():
+        inside = path == point or path.startswith(point.rstrip("/") + "/")
+        if inside and len(point) > len(best):
+            best, fs_type = point, kind
+    return fs_type in NETWORK_FS
+
+
+def resolve_walk_jobs(root, jobs=None):
+    """Threads for walking `root`: `jobs`, or by default more on network mounts."""
+    if jobs is None:
+        return NETWORK_WALK_JOBS if is_network_fs(root) else 1
+    return max(1, int(jobs))
+
+
+# ---------- WALKING ----------
+class Matcher:
+    """
+    Compiled skip/keep rules for one run.
+
+    `ignore_dirs` entries without a slash are directory names (globs
+    allowed) skipped at any depth; entries with one are anchored paths.
+    `exclude` and `include` are gitignore-style globs relative to `base`
+    (default: the current directory); a file is kept if it matches an
+    include pattern and no exclude pattern. With `gitignore`, .gitignore
+    files are honoured too.
+    """
+
+    def __init__(
+        self,
+        ignore_dirs=DEFAULT_IGNORE_DIRS,
+        exclude=(),
+        include=DEFAULT_INCLUDE,
+        gitignore=True,
+        base=None,
+    ):
+        names = [d.strip("/") for d in ignore_dirs if "/" not in d.strip("/")]
+        self.dir_names = frozenset(n for n in names if not _has_glob(n))
+        globs = [fnmatch.translate(n) for n in names if _has_glob(n)]
+        self.dir_globs = re.compile("|".join(globs)) if globs else None
+        paths = [d.rstrip("/") + "/" for d in ignore_dirs if "/" in d.strip("/")]
+        self.exclude = RuleSet([*paths, *exclude])
+        self.include = RuleSet(include)
+        self.gitignore = gitignore
+        self.base = Path(os.path.abspath(base or os.getcwd()))
+
+    @classmethod
+    def from_config(cls, config, exclude=(), include=(), gitignore=True):
+        """
+        Matcher for a load_config() result. Configured ignore-dirs add to
+        DEFAULT_IGNORE_DIRS, `exclude` adds to the configured excludes and
+        `include`, if given, replaces the configured includes.
+        """
+        return cls(
+            ignore_dirs=[*DEFAULT_IGNORE_DIRS, *config.get("ignore_dirs", ())],
+            exclude=[*config.get("exclude", ()), *exclude],
+            include=include or config.get("include", DEFAULT_INCLUDE),
+            gitignore=gitignore and config.get("gitignore", True),
+        )
+
+    def _ignored(self, rel, is_dir, layers):
+        # Deeper .gitignore files take precedence over the ones above them
+        for rules, strip, prefix in reversed(layers):
+            matched = rules.match(prefix + rel[strip:], is_dir)
+            if matched is not None:
+                return matched
+        return False
+
+    def _ignored_name(self, name):
+        if name in self.dir_names:
+            return True
+        return self.dir_globs is not None and bool(self.dir_globs.match(name))
+
+    def _skip_dir(self, name, rel, prefix, layers):
+        if self._ignored_name(name):
+            return True
+        if self.exclude and self.exclude.match(prefix + rel, True):
+            return True
+        return self._ignored(rel, True, layers)
+
+    def _keep_file(self, rel, prefix, layers):
+        if not self.include.match(prefix + rel, False):
+            return False
+        if self.exclude and self.exclude.match(prefix + rel, False):
+            return False
+        return not self._ignored(rel, False, layers)
+
+    # Single paths, e.g. from git or file system events; .gitignore is not
+    # consulted (git already applied it, and it is per folder)
+    def _in_ignored_dir(self, rel):
+        return any(self._ignored_name(name) for name in rel.split("/")[:-1])
+
+    def wants(self, path):
+        """Whether the file `path` would be kept (ignoring .gitignore)."""
+        path = Path(path)
+        rel = _relative_prefix(path.parent, self.base) + path.name
+        return not self._in_ignored_dir(rel) and self._keep_file(rel, "", ())
+
+    def skips(self, directory):
+        """Whether the folder `directory` would be skipped (ignoring .gitignore)."""
+        directory = Path(directory)
+        rel = _relative_prefix(directory.parent, self.base) + directory.name
+        return self._in_ignored_dir(rel) or self._skip_dir(directory.name, rel, "", ())
+
+    def _scan(self, directory, rel, prefix, layers):
+        """List one directory: (directory, files, subdirectories, pruned)."""
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:  # removed or unreadable meanwhile
+            return directory, [], [], 0
+        if self.gitignore and any(e.name == ".gitignore" for e in entries):
+            rules = read_gitignore(os.path.join(directory, ".gitignore"))
+            if rules is not None:
+                layers = (*layers, (rules, len(rel), ""))
+
+        files, subdirs, pruned = [], [], 0
+        for entry in entries:
+            child = rel + entry.name
+            try:
+                # Symlinked folders are not followed (no cycles), files are
+                if entry.is_dir(follow_symlinks=False):
+                    if self._skip_dir(entry.name, child, prefix, layers):
+                        pruned += 1
+                    else:
+                        subdirs.append((entry.path, child + "/", prefix, layers))
+                elif entry.is_file() and self._keep_file(child, prefix, layers):
+                    files.append(Path(entry.path))
+            except OSError:
+                continue
+        return directory, files, subdirs, pruned
+
+    def walk(self, root, jobs=None):
+        """
+        Yield (directory, [kept files]) for `root` and every directory
+        below it that is not skipped; `root` itself is always walked.
+        The order is sorted and depth-first, also when several threads
+        (`jobs`, see resolve_walk_jobs) list the directories.
+        """
+        layers = _outer_gitignores(root) if self.gitignore else ()
+        start = (str(root), "", _relative_prefix(root, self.base), layers)
+        jobs = resolve_walk_jobs(root, jobs)
+        scans = self._walk_serial(start) if jobs == 1 else self._walk_pool(start, jobs)
+        for directory, files, pruned in scans:
+            profiling.count("dirs walked")
+            profiling.count("dirs pruned", pruned)
+            yield Path(directory), files
+
+    def _walk_serial(self, start):
+        stack = [start]
+        while stack:
+            directory, files, subdirs, pruned = self._scan(*stack.pop())
+            stack.extend(reversed(subdirs))
+            yield directory, files, pruned
+
+    def _walk_pool(self, start, jobs):
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(jobs, thread_name_prefix="autodocstring-walk")
+        try:
+            # As _walk_serial, but with a stack of futures: subdirectories
+            # are listed in the background while their results come out in
+            # the same depth-first order
+            stack = [pool.submit(self._scan, *start)]
+            while stack:
+                directory, files, subdirs, pruned = stack.pop().result()
+                futures = [pool.submit(self._scan, *s) for s in subdirs]
+                stack.extend(reversed(futures))
+                yield directory, files, pruned
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_files(paths, matcher=None, skipped=None, jobs=None):
+    """
+    Yield the files under `paths` (folders or files) that `matcher`
+    keeps (default: Matcher()), lazily. Files named directly are taken
+    if they end in .py or match an include pattern. Paths that are
+    neither are appended to `skipped` if given.
+    """
+    matcher = matcher or Matcher()
+    for p in paths:
+        path = Path(p)
+        if path.is_dir():
+            for _, files in matcher.walk(path, jobs):
+                yield from files
+        elif path.is_file() and (
+            path.suffix.lower() == ".py" or matcher.include.match(path.name, False)
+        ):
+            yield path
+        elif skipped is not None:
+            skipped.append(path)
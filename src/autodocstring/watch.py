@@ -0,0 +1,420 @@
+import os
+import sys
+import time
+import select
+import struct
+from pathlib import Path
+
+from autodocstring.scanner import check_file
+from autodocstring.walker import Matcher
+
+# Seconds of quiet that end a burst of events (editors, git checkouts)
+DEBOUNCE = 0.2
+# Seconds between scans when inotify is not available
+POLL_INTERVAL = 1.0
+
+# inotify(7) event bits
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _is_source(path):
+    return path.suffix.lower() == ".py"
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def file_stamps(files):
+    """{path: (mtime_ns, size)} for `files`, the state watch() compares to."""
+    return {Path(f): _stamp(f) for f in files}
+
+
+class _Roots:
+    """
+    The folders (recursive) and single files a watch covers; `matcher`
+    (a walker.Matcher) decides which folders and files below them count.
+    """
+
+    def __init__(self, paths, matcher=None):
+        self.dirs = [Path(p) for p in paths if Path(p).is_dir()]
+        self.files = {Path(p) for p in paths if Path(p).is_file()}
+        self.matcher = matcher or Matcher()
+
+    def covers(self, path):
+        if path in self.files:
+            return True
+        return self.matcher.wants(path) and any(
+            d == path.parent or d in path.parents for d in self.dirs
+        )
+
+    def walk(self, directory):
+        """(folder, sources) for `directory` and the folders below it."""
+        if directory not in self.dirs and self.matcher.skips(directory):
+            return iter(())
+        return self.matcher.walk(directory)
+
+    def sources(self):
+        for d in self.dirs:
+            for _, files in self.walk(d):
+                yield from files
+        yield from (f for f in self.files if _is_source(f))
+
+
+# ---------- WATCHERS ----------
+class PollingWatcher:
+    """Finds changes by comparing (mtime, size) of every source each interval."""
+
+    name = "polling"
+
+    def __init__(self, roots, interval=POLL_INTERVAL):
+        self.roots = roots
+        self.interval = interval
+        self.stamps = self._scan()
+
+    def _scan(self):
+        return {path: _stamp(path) for path in self.roots.sources()}
+
+    def changes(self):
+        """Block until some sources changed and return their paths."""
+        while True:
+            time.sleep(self.interval)
+            stamps = self._scan()
+            changed = {
+                path
+                for path in stamps.keys() | self.stamps.keys()
+                if stamps.get(path) != self.stamps.get(path)
+            }
+            self.stamps = stamps
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify through ctypes, one watch per directory. Directories
+    that cannot be watched (watch limit reached, no permission) are polled
+    every `poll_interval` seconds instead.
+
+    Events are collected until DEBOUNCE seconds pass without any, so an
+    editor's write-temp-then-rename or a checkout touching hundreds of
+    files turns into one batch. Paths are reported as they were named;
+    the caller decides from the file system what happened to them.
+    """
+
+    name = "inotify"
+
+    def __init__(self, roots, debounce=DEBOUNCE, poll_interval=POLL_INTERVAL):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.roots = roots
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.dirs = {}  # watch descriptor -> directory
+        self.unwatched = {}  # directory -> {source: stamp}, polled instead
+        try:
+            for d in roots.dirs:
+                self._add_tree(d)
+            for f in roots.files:
+                self._add(f.parent)
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, directory):
+        import ctypes
+
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"cannot watch {directory}: {os.strerror(errno)}")
+        self.dirs[wd] = Path(directory)
+
+    def _add_tree(self, directory):
+        """Watch a (new) directory tree and return the sources already in it."""
+        found = set()
+        for current, files in self.roots.walk(directory):
+            try:
+                self._add(current)
+                self.unwatched.pop(Path(current), None)
+            except FileNotFoundError:
+                continue
+            except OSError:  # e.g. ENOSPC (watch limit) or EACCES
+                self.unwatched[Path(current)] = self._listing(current)
+            found.update(files)
+        return found
+
+    def _listing(self, directory):
+        """{source: stamp} of the sources directly in `directory`."""
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return {}
+        paths = [Path(e.path) for e in entries if e.is_file()]
+        return {p: _stamp(p) for p in paths if self.roots.covers(p)}
+
+    def _poll(self, changed):
+        """Add the sources that changed in unwatched directories."""
+        for directory, old in list(self.unwatched.items()):
+            new = self._listing(directory)
+            changed.update(
+                p for p in old.keys() | new.keys() if old.get(p) != new.get(p)
+            )
+            if directory.is_dir():
+                self.unwatched[directory] = new
+            else:
+                del self.unwatched[directory]
+
+    def _read(self, changed):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return True
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, pos)
+            raw = data[pos + _EVENT.size : pos + _EVENT.size + length]
+            pos += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                return False
+            directory = self.dirs.get(wd)
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            name = os.fsdecode(raw.rstrip(b"\0"))
+            path = directory / name if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                changed.update(self._add_tree(path))
+            elif mask & IN_ISDIR or not name or self.roots.covers(path):
+                changed.add(path)
+        return True
+
+    def _wait(self, timeout):
+        return bool(select.select([self.fd], [], [], timeout)[0])
+
+    def changes(self):
+        """
+        Block until something changed, then return the paths touched in
+        the burst. After a queue overflow every known source is returned.
+        """
+        changed = set()
+        overflow = False
+        while not changed and not overflow:
+            timeout = self.poll_interval if self.unwatched else None
+            if self._wait(timeout):  # the first event of a burst
+                overflow = not self._read(changed)
+                # ...and everything after it until DEBOUNCE seconds of quiet
+                while not overflow and self._wait(self.debounce):
+                    overflow = not self._read(changed)
+            self._poll(changed)
+
+        if overflow:
+            # Events were lost: drain the queue, re-watch every folder (new
+            # ones may have been missed) and let the caller compare stamps
+            time.sleep(self.debounce)
+            while self._wait(0):
+                self._read(set())
+            for d in self.roots.dirs:
+                changed.update(self._add_tree(d))
+            changed.update(f for f in self.roots.files if _is_source(f))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(roots, poll_interval=POLL_INTERVAL):
+    """inotify on Linux when it can be set up (watch limits), else polling."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, poll_interval)
+
+
+# ---------- INCREMENTAL TOTALS ----------
+class Totals:
+    """
+    Repository-wide counts kept up to date one file at a time: each file's
+    contribution is stored, so an update subtracts the old numbers and
+    adds the new ones instead of summing every report again.
+    """
+
+    def __init__(self):
+        self.files = {}  # path -> (total, documented, checked, compliant)
+        self.sums = [0, 0, 0, 0]
+
+    def update(self, path, report=None):
+        """Replace the contribution of `path`; report=None removes it."""
+        old = self.files.pop(path, None)
+        if old is not None:
+            self.sums = [s - o for s, o in zip(self.sums, old)]
+        if report is not None:
+            compliant = report.get("PEP-257 Compliant")
+            new = (
+                report["Total"],
+                report["Documented"],
+                0 if compliant is None else report["Total"],
+                compliant or 0,
+            )
+            self.files[path] = new
+            self.sums = [s + n for s, n in zip(self.sums, new)]
+
+    def state(self):
+        total, documented, checked, compliant = self.sums
+        return {
+            "Total": total,
+            "Documented": documented,
+            "Coverage (%)": documented / total * 100 if total else 0,
+            "PEP-257 Compliance (%)": compliant / checked * 100 if checked else None,
+        }
+
+
+def format_delta(before, after):
+    """One-line change summary, e.g. "+3 documented, coverage 81.2% → 81.9%"."""
+    parts = [f"{after['Documented'] - before['Documented']:+d} documented"]
+    if after["Total"] != before["Total"]:
+        parts.append(f"{after['Total'] - before['Total']:+d} items")
+    parts.append(
+        f"coverage {before['Coverage (%)']:.1f}% → {after['Coverage (%)']:.1f}%"
+    )
+    old, new = before["PEP-257 Compliance (%)"], after["PEP-257 Compliance (%)"]
+    if old is not None and new is not None and old != new:
+        parts.append(f"PEP-257 {old:.1f}% → {new:.1f}%")
+    return ", ".join(parts)
+
+
+def _expand(changed, roots, totals):
+    """Turn reported paths (files or whole folders) into source files."""
+    files = set()
+    for path in changed:
+        if path.is_dir():
+            for _, found in roots.walk(path):
+                files.update(found)
+        elif roots.covers(path):
+            files.add(path)
+        # Sources we know under a folder that was removed or moved away
+        files.update(f for f in totals.files if path in f.parents)
+    return files
+
+
+def watch(
+    paths,
+    totals,
+    stamps,
+    timeout=None,
+    fast=False,
+    min_coverage=0.0,
+    verbose=False,
+    log=sys.stdout,
+    watcher=None,
+    matcher=None,
+):
+    """
+    Re-check sources under `paths` whenever they change, until Ctrl+C.
+
+    `totals` holds the initial run's per-file numbers and `stamps` the
+    (mtime, size) they were computed from; only files whose stamp differs
+    are re-analyzed. Prints one delta line per batch. `matcher` (a
+    walker.Matcher) decides which files count, as in the first run.
+    Returns 0.
+    """
+    roots = _Roots(paths, matcher)
+    watcher = watcher or open_watcher(roots)
+    print(
+        f"\nWatching {len(totals.files)} file(s) ({watcher.name}); "
+        "press Ctrl+C to stop.",
+        file=log,
+        flush=True,
+    )
+    try:
+        while True:
+            changed = _expand(watcher.changes(), roots, totals)
+            before = totals.state()
+            touched = []
+            for path in sorted(changed):
+                stamp = _stamp(path)
+                if stamp == stamps.get(path):
+                    continue
+                touched.append(path)
+                if stamp is None:
+                    stamps.pop(path, None)
+                    totals.update(path)
+                    if verbose:
+                        print(f"  {path}: removed", file=log)
+                    continue
+
+                stamps[path] = stamp
+                result = check_file(path, timeout, fast)
+                if result["error"]:
+                    print(f"Error processing {path}: {result['error']}", file=log)
+                    totals.update(path)
+                    continue
+                report = result["report"]
+                totals.update(path, report)
+                coverage_pct = report["Coverage (%)"]
+                if coverage_pct < min_coverage:
+                    print(
+                        f"  {path}: {coverage_pct:.2f}% - missing "
+                        f"{report['Missing']} items",
+                        file=log,
+                    )
+                elif verbose:
+                    print(f"  {path}: {coverage_pct:.2f}%  OK", file=log)
+
+            if touched:
+                label = touched[0] if len(touched) == 1 else f"{len(touched)} files"
+                now = time.strftime("%H:%M:%S")
+                print(
+                    f"[{now}] {label}: {format_delta(before, totals.state())}",
+                    file=log,
+                    flush=True,
+                )
+    except KeyboardInterrupt:
+        state = totals.state()
+        print(
+            f"\nStopped. {state['Documented']}/{state['Total']} documented "
+            f"({state['Coverage (%)']:.1f}%)",
+            file=log,
+        )
+    finally:
+        watcher.close()
+    return 0
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from autodocstring import aggregate
+from autodocstring.aggregate import CoverageTable
+from autodocstring.coverage import coverage_report
+from autodocstring.parser import parse_file
+from autodocstring.scanner import iter_scan
+
+SAMPLES = Path(__file__).resolve().parent.parent / "samples"
+SUMMED = ["Functions", "Methods", "Classes", "Total", "Documented", "Missing"]
+SUMMED += ["PEP-257 Compliant", "Missing Parameters", "Missing Returns"]
+
+
+def _table(fast=False, root="."):
+    table = CoverageTable(root)
+    for result in iter_scan([str(SAMPLES)], fast=fast):
+        table.add_result(result)
+    return table
+
+
+def test_totals_match_per_file_reports():
+    reports = [coverage_report(parse_file(str(f))) for f in SAMPLES.glob("*.py")]
+    totals = _table().totals()
+
+    for key in SUMMED:
+        assert totals[key] == sum(r[key] for r in reports), key
+
+    by_kind = {row["Kind"]: row for row in _table().group_by("kind")}
+    assert by_kind["method"]["Total"] == totals["Methods"]
+    assert by_kind["class"]["Classes"] == totals["Classes"]
+
+
+def test_fast_results_have_unknown_compliance():
+    full, fast = _table().totals(), _table(fast=True).totals()
+    assert {k: fast[k] for k in SUMMED[:6]} == {k: full[k] for k in SUMMED[:6]}
+    assert fast["PEP-257 Compliant"] is None
+
+
+def test_group_by_owner_and_package(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "a.py").write_text('def f():\n    """Do it."""\n')
+    (tmp_path / "b.py").write_text("def g():\n    pass\n")
+    (tmp_path / "CODEOWNERS").write_text("* @all\n/pkg/ @core  # core team\n")
+
+    table = CoverageTable(tmp_path)
+    for result in iter_scan([str(tmp_path)]):
+        table.add_result(result)
+
+    owners = {row["Owner"]: row["Coverage (%)"] for row in table.group_by("owner")}
+    assert owners == {"@all": 0, "@core": 100}
+    packages = [row["Package"] for row in table.group_by("package")]
+    assert packages == ["(no package)", "pkg"]
+    with pytest.raises(ValueError):
+        table.group_by("team")
+
+
+def test_numpy_and_fallback_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    table = _table()
+    vectorized = [table.totals(), table.group_by("file")]
+    monkeypatch.setattr(aggregate, "np", None)
+    assert [table.totals(), table.group_by("file")] == vectorized
@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _bench(*args):
+    return subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--files", "3", "--repeat", "1"]
+        + ["--stages", "parse", "coverage", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_baseline_round_trip(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    output = tmp_path / "results.json"
+
+    result = _bench("--baseline", str(baseline), "--update-baseline")
+    assert result.returncode == 0, result.stderr
+    stored = json.loads(baseline.read_text())
+    assert set(stored["stages"]) == {"parse", "coverage"}
+    assert stored["files"] == 3 and stored["functions"] == 60
+
+    # Pretend the baseline was much faster: every stage regresses
+    for stage in stored["stages"].values():
+        stage["seconds"] /= 100
+    baseline.write_text(json.dumps(stored))
+    result = _bench("--baseline", str(baseline), "--output", str(output))
+    assert result.returncode == 1
+    assert "REGRESSION parse: seconds" in result.stdout
+
+    result = _bench(
+        "--baseline", str(baseline), "--output", str(output), "--threshold", "1000"
+    )
+    assert result.returncode == 0, result.stdout
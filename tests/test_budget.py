@@ -0,0 +1,74 @@
+import ast
+
+import pytest
+
+pytest.importorskip("requests")  # llm_generator's HTTP client
+
+from autodocstring import injector  # noqa: E402
+from autodocstring.budget import TokenBudget, outline  # noqa: E402
+from autodocstring.llm_generator import estimate_tokens  # noqa: E402
+from autodocstring.tiers import function_record  # noqa: E402
+
+STEPS = "\n".join(f"    total += helper_{i % 3}(item, {i})" for i in range(120))
+LONG = f"""
+@cached
+def load(path: str, strict=False) -> dict:
+    total = 0
+    if not path:
+        raise ValueError("no path")
+{STEPS}
+    def inner():
+        raise KeyError("not counted")
+    return {{"total": total}}
+"""
+
+
+def _def(source):
+    return ast.parse(source).body[0]
+
+
+def test_outline_keeps_what_a_docstring_needs():
+    text = outline(_def(LONG))
+    assert text.startswith("@cached\ndef load(path: str, strict=False) -> dict:")
+    assert "raise ValueError('no path')" in text
+    assert "return {'total': total}" in text
+    assert "# calls: helper_0, helper_1, helper_2" in text
+    assert "KeyError" not in text
+    ast.parse(text)  # still valid Python
+
+
+def test_fit_outlines_only_long_functions():
+    budget = TokenBudget(prompt_tokens=200)
+    node = _def(LONG)
+    short = budget.fit(node)
+    assert estimate_tokens(short) <= 200 < estimate_tokens(ast.unparse(node))
+    small = _def("def f(x):\n    return x\n")
+    assert budget.fit(small) == ast.unparse(small)
+    assert budget.summary()["outlined"] == 1
+    assert budget.summary()["prompt tokens saved"] > 1000
+
+
+def test_predict_sizes_the_reply_by_sections():
+    budget = TokenBudget()
+    getter = _def("def size(self):\n    return self._size\n")
+    assert budget.predict(function_record(getter, "Box"), getter) == 72
+    node = _def(LONG)
+    # summary + 2 params, 1 exception, a return value
+    assert budget.predict(function_record(node), node) == 48 + 24 * 4
+    assert budget.summary()["reply tokens saved"] == (512 - 72) + (512 - 144)
+
+
+def test_injector_sends_outlines_and_reply_limits(monkeypatch):
+    sent = []
+
+    def fake_llm(source, style, num_predict=None, **options):
+        sent.append((source, num_predict))
+        return "Load the file."
+
+    monkeypatch.setattr(injector, "generate_docstring_llm", fake_llm)
+    injector.inject_docstrings(
+        LONG, cache=None, concurrency=1, budget=TokenBudget(prompt_tokens=200)
+    )
+    (inner, inner_predict), (load, load_predict) = sent
+    assert "# body outlined" in load and load_predict == 144
+    assert "body outlined" not in inner and inner_predict == 72
@@ -0,0 +1,111 @@
+from autodocstring import cache as cache_module
+from autodocstring.cache import MemoryCache, ResultCache
+from autodocstring.scanner import iter_checks, run_checks
+
+
+def test_unchanged_files_are_not_reanalyzed(tmp_path, monkeypatch):
+    src = tmp_path / "mod.py"
+    src.write_text('def f():\n    """Doc."""\n')
+
+    with ResultCache(tmp_path / "cache") as cache:
+        first = run_checks([src], cache=cache)
+        assert cache.stats["misses"] == 1
+
+    # parse_file must not be called on a hit
+    monkeypatch.setattr("autodocstring.scanner.parse_file", lambda path: 1 / 0)
+    with ResultCache(tmp_path / "cache") as cache:
+        second = run_checks([src], cache=cache)
+        assert cache.stats["fast_hits"] == 1
+
+    assert second[0]["report"] == first[0]["report"]
+    assert second[0]["path"] == src
+
+
+def test_content_hash_survives_touch(tmp_path):
+    src = tmp_path / "mod.py"
+    src.write_text("def f(): pass\n")
+
+    with ResultCache(tmp_path / "cache") as cache:
+        payload, token = cache.lookup(src, "coverage")
+        assert payload is None
+        cache.store(token, "coverage", {"report": 1})
+
+        src.write_text("def f(): pass\n")  # new mtime, same bytes
+        payload, _ = cache.lookup(src, "coverage")
+        assert payload == {"report": 1}
+        assert cache.stats["fast_hits"] == 0
+
+
+def test_version_change_invalidates(tmp_path, monkeypatch):
+    src = tmp_path / "mod.py"
+    src.write_text("x = 1\n")
+
+    with ResultCache(tmp_path / "cache") as cache:
+        _, token = cache.lookup(src, "coverage")
+        cache.store(token, "coverage", {"report": 1})
+
+    monkeypatch.setattr(cache_module, "CACHE_VERSION", "upgraded")
+    with ResultCache(tmp_path / "cache") as cache:
+        payload, _ = cache.lookup(src, "coverage")
+        assert payload is None
+
+
+def test_lru_eviction(tmp_path):
+    with ResultCache(tmp_path / "cache", max_bytes=300) as cache:
+        for i in range(5):
+            src = tmp_path / f"mod{i}.py"
+            src.write_text(f"x = {i}\n")
+            _, token = cache.lookup(src, "coverage")
+            cache.store(token, "coverage", {"blob": "x" * 80})
+
+        summary = cache.summary()
+        assert summary["evicted"] > 0
+        assert summary["bytes"] <= 300
+        # The most recent entry is always kept
+        payload, _ = cache.lookup(tmp_path / "mod4.py", "coverage")
+        assert payload is not None
+
+
+def test_memory_cache_in_front_of_disk(tmp_path):
+    src = tmp_path / "mod.py"
+    src.write_text("def f(): pass\n")
+
+    memory = MemoryCache(ResultCache(tmp_path / "cache"), max_entries=1)
+    payload, token = memory.lookup(src, "coverage")
+    memory.store(token, "coverage", {"report": 1})
+    assert memory.lookup(src, "coverage") == ({"report": 1}, None)
+    assert memory.stats["fast_hits"] == 1
+
+    src.write_text("def g(): pass\n")  # changed: stale in memory and on disk
+    assert memory.lookup(src, "coverage")[0] is None
+    memory.close()
+
+    # A new process finds the first result on disk through the content hash
+    src.write_text("def f(): pass\n")
+    memory = MemoryCache(ResultCache(tmp_path / "cache"))
+    assert memory.lookup(src, "coverage") == ({"report": 1}, None)
+    memory.close()
+
+
+def test_cached_results_stream_before_the_input_ends(tmp_path):
+    files = []
+    for i in range(40):
+        src = tmp_path / f"mod{i}.py"
+        src.write_text(f"def f{i}(): pass\n")
+        files.append(src)
+
+    with ResultCache(tmp_path / "cache") as cache:
+        run_checks(files, cache=cache)
+        for jobs in (1, 2):
+            files[30].write_text(f"def changed{jobs}(): pass\n")  # a late miss
+            taken = []
+
+            def source():
+                for f in files:
+                    taken.append(f)
+                    yield f
+
+            results = iter_checks(source(), jobs=jobs, cache=cache)
+            assert next(results)["path"] == files[0]
+            assert len(taken) == 1  # warm hits are not looked up ahead
+            assert [r["path"] for r in results] == files[1:]
@@ -0,0 +1,95 @@
+import subprocess
+import sys
+
+from autodocstring.changes import changed_lines, filter_changed, parse_diff
+from autodocstring.parser import parse_file
+
+ORIGINAL = """def untouched():
+    return 1
+
+
+def edited(a):
+    return a
+
+
+class Box:
+    def keep(self):
+        return 1
+
+    def change(self):
+        return 2
+"""
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "mod.py").write_text(ORIGINAL)
+    _git(tmp_path, "add", "mod.py")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    edited = ORIGINAL.replace("return a", "return a * 2").replace(
+        "return 2", "return 3"
+    )
+    (tmp_path / "mod.py").write_text(edited)
+    return tmp_path / "mod.py"
+
+
+def test_parse_diff_ranges(tmp_path):
+    diff = "+++ b/pkg/a.py\n@@ -3,2 +3,4 @@\n@@ -10 +12 @@\n@@ -20,3 +21,0 @@\n"
+    ranges = parse_diff(diff, tmp_path)
+    assert ranges == {(tmp_path / "pkg/a.py").resolve(): [(3, 6), (12, 12), (21, 21)]}
+
+
+def test_only_modified_functions_are_kept(tmp_path):
+    mod = _repo(tmp_path)
+
+    changed = changed_lines("HEAD", cwd=tmp_path)
+    ranges = changed[mod.resolve()]
+    parsed = filter_changed(parse_file(str(mod)), ranges)
+
+    assert [f["name"] for f in parsed["functions"]] == ["edited"]
+    assert [m["name"] for m in parsed["classes"][0]["methods"]] == ["change"]
+
+
+def test_staged_mode(tmp_path):
+    mod = _repo(tmp_path)
+    assert changed_lines(staged=True, cwd=tmp_path) == {}
+
+    _git(tmp_path, "add", "mod.py")
+    assert mod.resolve() in changed_lines(staged=True, cwd=tmp_path)
+
+
+def test_staged_lines_follow_unstaged_edits(tmp_path):
+    mod = _repo(tmp_path)
+    _git(tmp_path, "add", "mod.py")
+    # Unstaged: a new function above everything moves the staged lines down
+    mod.write_text("def added():\n    return 0\n\n\n" + mod.read_text())
+
+    ranges = changed_lines(staged=True, cwd=tmp_path)[mod.resolve()]
+    parsed = filter_changed(parse_file(str(mod)), ranges)
+
+    assert [f["name"] for f in parsed["functions"]] == ["edited"]
+    assert [m["name"] for m in parsed["classes"][0]["methods"]] == ["change"]
+
+
+def test_cli_changed_since(tmp_path):
+    _repo(tmp_path)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "autodocstring.cli", "--changed-since", "HEAD"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 1
+    assert "Checking 1 file(s)" in result.stdout
+    assert "mod.py: 0.00% - missing 2 items" in result.stdout
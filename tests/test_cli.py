@@ -31,3 +31,24 @@ def test_cli_default(tmp_path):
     assert "dummy.py: 0.00%" in result.stdout
     assert "missing 1 items" in result.stdout
     assert "Failed: 1 file(s)" in result.stdout
+
+
+def test_cli_skips_configured_and_excluded_paths(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.autodocstring]\nignore-dirs = ['generated']\n"
+    )
+    for rel in ["pkg/a.py", "pkg/generated/g.py", "pkg/old.py", "pkg/b_test.py"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('def f():\n    """Doc."""\n')
+    (tmp_path / "pkg" / ".gitignore").write_text("old.py\n")
+
+    result = subprocess.run(
+        [sys.executable, "-m", "autodocstring.cli", "pkg", "--exclude", "*_test.py"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stdout
+    assert "Checking 1 file(s)" in result.stdout
@@ -0,0 +1,77 @@
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+SAMPLES = Path(__file__).resolve().parent.parent / "samples"
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def run(tmp_path):
+    # A short private runtime dir keeps the socket path under the AF_UNIX limit
+    runtime = tempfile.mkdtemp(prefix="ads-")
+    env = {**os.environ, "XDG_RUNTIME_DIR": runtime}
+
+    def run(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "autodocstring", *args],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+    run.runtime = Path(runtime)
+    yield run
+    run("serve", "--stop")
+    shutil.rmtree(runtime, ignore_errors=True)
+
+
+def test_daemon_output_matches_cli(run, tmp_path):
+    shutil.copytree(SAMPLES, tmp_path / "samples")
+    (tmp_path / "samples" / "bad.py").write_text("def f():\n    pass\n")
+
+    for args in (["--verbose"], ["--format", "jsonl"], ["--bogus"]):
+        direct = run("samples", *args)
+        first = run("--daemon", "samples", *args)  # spawns the daemon
+        warm = run("--daemon", "samples", *args)
+        for result in (first, warm):
+            assert result.returncode == direct.returncode
+            assert result.stdout == direct.stdout
+            assert result.stderr == direct.stderr
+
+    # Edits are picked up through the file's mtime
+    (tmp_path / "samples" / "bad.py").write_text('def f():\n    """Doc."""\n')
+    assert run("--daemon", "samples").returncode == 0
+
+
+def test_stop_without_daemon(run):
+    result = run("serve", "--stop")
+    assert result.returncode == 1
+    assert "No daemon running." in result.stderr
+
+
+def test_socket_lives_in_a_private_dir(run, tmp_path):
+    from autodocstring import daemon
+
+    shutil.copytree(SAMPLES, tmp_path / "samples")
+    assert run("--daemon", "samples").returncode == 0
+
+    (private,) = run.runtime.iterdir()
+    assert private.stat().st_mode & 0o777 == 0o700
+    assert [p.suffix for p in private.iterdir()] == [".sock"]
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)
+    with pytest.raises(PermissionError):
+        daemon._private_dir(str(shared))
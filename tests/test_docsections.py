@@ -0,0 +1,85 @@
+from autodocstring.compliance import analyze_docstring
+from autodocstring.docsections import parse_docstring
+from autodocstring.records import FunctionRecord, ParamRecord
+
+GOOGLE = """Add two numbers.
+
+Args:
+    a (int): First.
+        Continued.
+    *args: Extra values.
+
+Returns:
+    int: The sum.
+
+Raises:
+    ValueError: If a is negative.
+"""
+
+NUMPY = """Add two numbers.
+
+Parameters
+----------
+a, b : int
+    Values.
+
+Yields
+------
+int
+"""
+
+REST = """Add two numbers.
+
+:param int a: First.
+:type a: int
+:returns: The sum.
+:raises ValueError: If a is negative.
+"""
+
+
+def test_parses_google_numpy_and_rest():
+    google = parse_docstring(GOOGLE)
+    assert google.summary == "Add two numbers."
+    assert google.entries("Parameters") == ("a", "args")
+    assert google.entries("Raises") == ("ValueError",)
+    assert google.styles == dict.fromkeys(["Parameters", "Returns", "Raises"], "Google")
+
+    numpy = parse_docstring(NUMPY)
+    assert numpy.entries("Parameters") == ("a", "b")
+    assert numpy.styles["Yields"] == "NumPy"
+
+    rest = parse_docstring(REST)
+    assert rest.entries("Parameters") == ("a",)
+    assert rest.documents("Returns") and rest.entries("Raises") == ("ValueError",)
+
+
+def test_prose_is_not_a_section():
+    parsed = parse_docstring("Returns the sum of the params.\n\nRaise it later.")
+    assert parsed.sections == {}
+    assert parse_docstring(GOOGLE) is parse_docstring(GOOGLE)
+
+
+def _method(docstring, params, returns=None):
+    return FunctionRecord(
+        "add",
+        class_name="Calc",
+        params=[ParamRecord(p) for p in params],
+        returns=returns,
+        has_docstring=True,
+        docstring=docstring,
+    )
+
+
+def test_analyze_uses_sections():
+    result = analyze_docstring(_method("Get the count.", ["self"], "None"))
+    assert result["pep257_compliant"] and result["warnings"] == []
+
+    result = analyze_docstring(_method(GOOGLE, ["self", "a", "b"], "int"), "Google")
+    assert result["missing_sections"] == []
+    assert result["warnings"] == ["param `b` declared but undocumented"]
+
+    result = analyze_docstring(_method(REST, ["self", "a"], "int"), "Google")
+    assert result["warnings"] == ["Google style expects 'Args:' section"]
+
+    result = analyze_docstring(_method("Return the params.", ["self", "a"], "int"))
+    assert result["missing_sections"] == ["Parameters", "Returns"]
@@ -0,0 +1,115 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from autodocstring.coverage import coverage_report
+from autodocstring.fastscan import NeedsFullParse, fast_coverage_report, scan_source
+from autodocstring.parser import parse_file
+
+SAMPLES = Path(__file__).resolve().parent.parent / "samples"
+KEYS = [
+    "Functions",
+    "Classes",
+    "Methods",
+    "Total",
+    "Documented",
+    "Missing",
+    "Coverage (%)",
+    "Function Coverage (%)",
+    "Method Coverage (%)",
+    "Class Coverage (%)",
+]
+
+TRICKY = [
+    'def f():\n    f"not {a} doc"\n',
+    'def f():\n    b"bytes"\n',
+    'def f():\n    "doc".strip()\n',
+    'def f(): "one line doc"\n',
+    'def f(): x = 1; "late"\n',
+    'def f():\n    "a" "b"  # concat\n',
+    'def f():\n    r"raw" ; pass\n',
+    'def f():\n    # comment\n\n    """doc"""\n',
+    'def f():\n    ("paren doc")\n',
+    'def f(a=lambda: 1, *, b: "ann" = {1: 2}) -> "R":\n    """doc"""\n',
+    "class A(B, metaclass=M):\n    x = 1\n    if X:\n        def m(self):\n"
+    '            """doc"""\n    def n(self):\n        def helper():\n'
+    '            "doc"\n',
+    "async def f():\n    '''doc'''\n\n@dec\nclass C: pass\n",
+    'def f():\n    """doc""" if x else None\n',
+    "def f():\n    s = 'def g(): pass'\n",
+    'class A:\n    x = 1\nif X:\n    def f():\n        "doc"\n',
+    'class A:\r\n    def m(self):\r\n        """doc"""\r\n',
+    'def f():\n    """\n    def g():\n        pass\n    """\n# class B:\n',
+    'def f(): \\\n    "doc"\n',
+    'class A: \\\n  "doc"\n',
+]
+
+
+def _full(source, tmp_path):
+    f = tmp_path / "mod.py"
+    f.write_bytes(source.encode())
+    return coverage_report(parse_file(str(f)))
+
+
+def _fast(source, tmp_path):
+    f = tmp_path / "mod.py"
+    f.write_bytes(source.encode())
+    return fast_coverage_report(str(f))
+
+
+@pytest.mark.parametrize("sample", sorted(SAMPLES.glob("*.py")), ids=lambda p: p.name)
+def test_samples_match_full_parser(sample):
+    full = coverage_report(parse_file(str(sample)))
+    fast = fast_coverage_report(str(sample))
+    assert {k: fast[k] for k in KEYS} == {k: full[k] for k in KEYS}
+
+
+@pytest.mark.parametrize("source", TRICKY)
+def test_tricky_sources_match_full_parser(source, tmp_path):
+    full, fast = _full(source, tmp_path), _fast(source, tmp_path)
+    assert {k: fast[k] for k in KEYS} == {k: full[k] for k in KEYS}
+
+
+def _synthetic_module(rng):
+    lines = []
+
+    def block(indent, depth):
+        for _ in range(rng.randint(1, 4)):
+            pad = "    " * indent
+            kind = rng.choice(["def", "def", "async def", "class", "if"])
+            if kind != "if" and rng.random() < 0.3:
+                lines.append(f"{pad}@decorator(arg=1)")
+            if kind == "if":
+                lines.append(f"{pad}if flag:")
+            elif kind == "class":
+                lines.append(f"{pad}class C{len(lines)}(Base):")
+            else:
+                lines.append(f"{pad}{kind} f{len(lines)}(a, b: int = 2) -> int:")
+            if kind != "if" and rng.random() < 0.6:
+                lines.append(f'{pad}    """Doc line.\n\n{pad}    More.\n{pad}    """')
+            if depth < 4 and rng.random() < 0.5:
+                block(indent + 1, depth + 1)
+            lines.append(f"{pad}    x = 1")
+
+    block(0, 0)
+    return "\n".join(lines) + "\n"
+
+
+def test_synthetic_corpus_matches_full_parser(tmp_path):
+    rng = random.Random(1234)
+    for _ in range(300):
+        source = _synthetic_module(rng)
+        full, fast = _full(source, tmp_path), _fast(source, tmp_path)
+        assert {k: fast[k] for k in KEYS} == {k: full[k] for k in KEYS}, source
+
+
+def test_syntax_errors_fall_back_to_parser(tmp_path):
+    with pytest.raises(SyntaxError):
+        _fast("def invalid syntax", tmp_path)
+    assert scan_source("class A:\n    pass\n")["classes"] == 1
+
+
+def test_backslash_after_header_needs_full_parse():
+    with pytest.raises(NeedsFullParse, match="backslash"):
+        scan_source('def f(): \\\n    "doc"\n')
@@ -0,0 +1,67 @@
+import ast
+import time
+import threading
+
+import pytest
+
+pytest.importorskip("requests")  # llm_generator's HTTP client
+
+from autodocstring import injector  # noqa: E402
+
+SOURCE = '''
+def outer(a):
+    def inner(b):
+        return b
+    return inner(a)
+
+
+class Box:
+    def keep(self):
+        """Old."""
+        return 1
+
+    def broken(self):
+        return 2
+'''
+
+
+def test_concurrent_generation_is_spliced_in_order(monkeypatch):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_llm(source, style, **options):
+        name = ast.parse(source).body[0].name
+        with lock:
+            active.append(name)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(name)
+        if name == "broken":
+            raise RuntimeError("server said no")
+        return f"Doc for {name}."
+
+    monkeypatch.setattr(injector, "generate_docstring_llm", fake_llm)
+    errors = []
+    result = injector.inject_docstrings(
+        SOURCE, concurrency=3, errors=errors, cache=None
+    )
+
+    tree = ast.parse(result)
+    docs = {
+        node.name: (ast.get_docstring(node) or "").strip() or None
+        for node in ast.walk(tree)
+        if isinstance(node, ast.FunctionDef)
+    }
+    assert docs == {
+        "outer": "Doc for outer.",
+        "inner": "Doc for inner.",
+        "keep": "Doc for keep.",
+        "broken": None,
+    }
+    assert errors == [("broken", 13, "RuntimeError: server said no")]
+    assert max(peak) == 3
+
+    # Same output, one request at a time
+    assert injector.inject_docstrings(SOURCE, concurrency=1, cache=None) == result
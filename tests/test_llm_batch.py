@@ -0,0 +1,117 @@
+import re
+
+import pytest
+
+pytest.importorskip("requests")  # llm_generator's HTTP client
+
+from autodocstring import injector, llm_generator  # noqa: E402
+from autodocstring.llm_cache import LLMCache  # noqa: E402
+from autodocstring.llm_generator import (  # noqa: E402
+    build_batch_prompt,
+    generate_docstrings_batch,
+    parse_batch_reply,
+    plan_batches,
+)
+
+
+class FakeClient:
+    """Answers batched prompts slot by slot; `garble` slots come back empty."""
+
+    model = "fake"
+
+    def __init__(self, garble=()):
+        self.garble = set(garble)
+        self.prompts = []
+
+    def generate(self, prompt, options=None, **kwargs):
+        self.prompts.append(prompt)
+        names = re.findall(r"def (\w+)", prompt)
+        if "<<<FUNCTION" not in prompt:
+            return f"Single {names[0]}."
+        return "\n".join(
+            f"<<<DOCSTRING {i}>>>\n"
+            f"{'' if name in self.garble else f'Batched {name}.'}\n<<<END {i}>>>"
+            for i, name in enumerate(names, 1)
+        )
+
+
+CODES = [f"def f{i}(x):\n    return x + {i}\n" for i in range(5)]
+
+
+def test_parse_batch_reply_flags_missing_slots():
+    reply = (
+        "Sure!\n<<<DOCSTRING 1>>>\nAdd one.\n\nArgs:\n    x: value.\n<<<END 1>>>\n"
+        "<<<DOCSTRING 3>>>\n<<<END 3>>>\n<<<DOCSTRING 2>>>\nSwap. <<<END 2>>>"
+    )
+    assert parse_batch_reply(reply, 4) == [
+        "Add one.\n\nArgs:\n    x: value.",
+        "Swap.",
+        None,
+        None,
+    ]
+    assert "<<<FUNCTION 2>>>" in build_batch_prompt(CODES[:2])
+
+
+def test_plan_batches_respects_the_budget():
+    assert plan_batches(CODES, budget=100_000) == [[0, 1, 2, 3, 4]]
+    assert plan_batches(CODES, budget=100_000, max_batch=2) == [[0, 1], [2, 3], [4]]
+    # Too small a budget degrades to one function per request
+    assert plan_batches(CODES, budget=1) == [[i] for i in range(5)]
+
+
+def test_batch_retries_garbled_slots_alone_and_caches(tmp_path):
+    client = FakeClient(garble=["f2"])
+    with LLMCache(tmp_path) as cache:
+        docs = generate_docstrings_batch(CODES, client=client, cache=cache)
+        assert len(client.prompts) == 2  # one batch + the garbled slot
+        assert "Single f2." in docs[2]
+        assert all(f"Batched f{i}." in docs[i] for i in (0, 1, 3, 4))
+
+        # Batched answers are cached per function, as single requests are
+        again = llm_generator.generate_docstring_llm(CODES[3], client=client)
+        assert "Single f3." in again
+        assert generate_docstrings_batch(CODES, client=client, cache=cache) == docs
+        assert len(client.prompts) == 3
+
+
+def test_prompt_version_covers_the_batch_prompt(monkeypatch):
+    assert llm_generator.prompt_version() == llm_generator.PROMPT_VERSION
+    original = llm_generator.build_batch_system_prompt
+    monkeypatch.setattr(
+        llm_generator,
+        "build_batch_system_prompt",
+        lambda style: original(style) + "Be brief.\n",
+    )
+    assert llm_generator.prompt_version() != llm_generator.PROMPT_VERSION
+
+
+def test_failed_batch_request_is_reported_per_function():
+    class Down(FakeClient):
+        def generate(self, prompt, options=None, **kwargs):
+            raise ConnectionError("no server")
+
+    docs = generate_docstrings_batch(CODES[:3], client=Down())
+    assert [type(d) for d in docs] == [ConnectionError] * 3
+
+
+def test_injector_batches_per_class(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(llm_generator, "_default_client", client)
+    source = (
+        "def top(a):\n    return a\n\n"
+        "class Box:\n"
+        "    def get(self):\n        return 1\n\n"
+        "    def put(self, v):\n        self.v = v\n"
+    )
+    seen = []
+    result = injector.inject_docstrings(
+        source,
+        cache=None,
+        batch_tokens=4096,
+        progress=lambda name, text: seen.append(name),
+    )
+    # Box's methods share one request; top() is alone in its scope
+    assert len(client.prompts) == 2
+    assert "Single top." in result
+    assert "Batched get." in result and "Batched put." in result
+    assert sorted(seen) == ["get", "put", "top"]
@@ -0,0 +1,98 @@
+import time
+import threading
+
+import pytest
+
+from autodocstring.llm_cache import LLMCache, cache_key, main
+
+
+def test_lookup_expiry_and_eviction(tmp_path):
+    with LLMCache(tmp_path, max_bytes=400, max_age=60) as cache:
+        cache.store("a", "Add two numbers.")
+        assert cache.lookup("a") == "Add two numbers."
+        assert cache.lookup("b") is None
+
+        cache.store("old", "Stale.", created=time.time() - 120)
+        assert cache.lookup("old") is None
+
+    # Expired entries are purged when the cache is opened
+    with LLMCache(tmp_path, max_bytes=400, max_age=60) as cache:
+        assert cache.summary()["expired"] == 1
+        for i in range(20):
+            cache.store(f"k{i}", "x" * 40)
+        stats = cache.summary()
+        assert stats["evicted"] > 0 and stats["bytes"] <= 400
+        assert cache.lookup("k19") == "x" * 40
+
+
+def test_concurrent_identical_requests_are_merged(tmp_path):
+    calls = []
+
+    def generate():
+        calls.append(1)
+        time.sleep(0.1)
+        return "Merged."
+
+    with LLMCache(tmp_path) as cache:
+        key = cache_key("def f(): ...", "Google", "model", "v1")
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get(key, generate)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["Merged."] * 5
+        assert len(calls) == 1
+        assert cache.stats["merged"] == 4
+
+        def fail():
+            raise RuntimeError("down")
+
+        with pytest.raises(RuntimeError):
+            cache.get("other", fail)
+        assert cache.lookup("other") is None  # failures are not cached
+
+
+def test_export_import_round_trip(tmp_path, capsys):
+    with LLMCache(tmp_path / "a") as cache:
+        cache.store("k1", "One.")
+        cache.store("k2", "Two.")
+    warm = tmp_path / "warm.jsonl"
+    assert main(["--dir", str(tmp_path / "a"), "export", str(warm)]) == 0
+    assert main(["--dir", str(tmp_path / "b"), "import", str(warm)]) == 0
+    assert "Imported 2 entries" in capsys.readouterr().out
+
+    with LLMCache(tmp_path / "b") as cache:
+        assert cache.lookup("k2") == "Two."
+        assert cache.import_entries(warm) == 0  # nothing newer
+
+
+def test_injector_reuses_cached_answers(tmp_path, monkeypatch):
+    pytest.importorskip("requests")
+    from autodocstring import llm_generator
+    from autodocstring.injector import inject_docstrings
+
+    prompts = []
+
+    class FakeClient:
+        model = "fake:1b"
+
+        def generate(self, prompt, options=None, **streaming):
+            prompts.append(prompt)
+            return "Return the value."
+
+    monkeypatch.setattr(llm_generator, "_default_client", FakeClient())
+    helper = "def clamp(x):\n    return max(0, x)\n"
+    with LLMCache(tmp_path) as cache:
+        first = inject_docstrings(helper + "\n" + helper, cache=cache)
+        assert len(prompts) == 1  # the duplicate was merged or hit
+        assert inject_docstrings(helper, cache=cache) in first
+        assert len(prompts) == 1
+
+        FakeClient.model = "fake:7b"
+        inject_docstrings(helper, cache=cache)
+        assert len(prompts) == 2
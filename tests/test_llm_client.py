@@ -0,0 +1,195 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from autodocstring import llm_generator  # noqa: E402
+from autodocstring.llm_generator import (  # noqa: E402
+    CircuitOpenError,
+    LLMClient,
+    LLMError,
+)
+
+
+@pytest.fixture
+def server():
+    """Local /api/generate answering with the queued (status, body) pairs."""
+    state = {"answers": [], "ports": set(), "prompts": [], "bodies": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            state["ports"].add(self.client_address[1])
+            state["prompts"].append(body["prompt"])
+            state["bodies"].append(body)
+            status, answer = state["answers"].pop(0) if state["answers"] else (200, "")
+            # A list is streamed as one NDJSON chunk per item
+            chunks = answer if isinstance(answer, list) else [answer]
+            done = {"done": True, "prompt_eval_count": 40, "prompt_eval_duration": 2e7}
+            if not body["stream"]:
+                data = json.dumps({"response": "".join(chunks), **done}).encode()
+            else:
+                data = b"".join(
+                    json.dumps({"response": c, "done": False}).encode() + b"\n"
+                    for c in chunks
+                )
+                data += json.dumps({"response": "", **done}).encode() + b"\n"
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{httpd.server_port}/api/generate"
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_retries_transient_errors_over_one_connection(server, monkeypatch):
+    monkeypatch.setattr(llm_generator.time, "sleep", lambda s: None)
+    server["answers"] = [(503, ""), (500, ""), (200, "Add numbers.")]
+    client = LLMClient(server["url"], retries=3)
+
+    doc = llm_generator.generate_docstring_llm("def add(a, b): ...", client=client)
+    assert doc == '"""\nAdd numbers.\n\n"""'
+    client.generate("again")
+    assert client.stats["retries"] == 2 and client.stats["requests"] == 4
+    assert len(server["ports"]) == 1  # every request reused the connection
+
+    server["answers"] = [(400, "")]
+    with pytest.raises(LLMError, match="rejected"):
+        client.generate("bad")
+    assert client.stats["retries"] == 2  # client errors are not retried
+
+
+def test_circuit_breaker_fails_fast_then_recovers(server, monkeypatch):
+    monkeypatch.setattr(llm_generator.time, "sleep", lambda s: None)
+    clock = [100.0]
+    monkeypatch.setattr(llm_generator.time, "monotonic", lambda: clock[0])
+    server["answers"] = [(503, "")] * 4
+    client = LLMClient(server["url"], retries=1, failure_threshold=2, reset_after=30)
+
+    for _ in range(2):
+        with pytest.raises(LLMError, match="HTTP 503"):
+            client.generate("p")
+    with pytest.raises(CircuitOpenError):
+        client.generate("p")
+    assert len(server["prompts"]) == 4  # the open circuit sent nothing
+
+    clock[0] += 31
+    server["answers"] = [(200, "ok")]
+    assert client.generate("p") == "ok"  # the half-open trial closes it
+    assert client.generate("p") == ""
+
+
+def test_non_retryable_server_errors_open_the_circuit(server, monkeypatch):
+    monkeypatch.setattr(llm_generator.time, "sleep", lambda s: None)
+    server["answers"] = [(501, ""), (507, "")]
+    client = LLMClient(server["url"], retries=3, failure_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(LLMError, match="failed"):
+            client.generate("p")
+    assert client.stats["retries"] == 0 and client.stats["failures"] == 2
+    with pytest.raises(CircuitOpenError):
+        client.generate("p")
+
+
+def test_unexpected_errors_end_the_half_open_trial(server, monkeypatch):
+    monkeypatch.setattr(llm_generator.time, "sleep", lambda s: None)
+    clock = [100.0]
+    monkeypatch.setattr(llm_generator.time, "monotonic", lambda: clock[0])
+    server["answers"] = [(503, "")]
+    client = LLMClient(server["url"], retries=0, failure_threshold=1, reset_after=30)
+    with pytest.raises(LLMError):
+        client.generate("p")
+
+    def broken(text):
+        raise RuntimeError("callback failed")
+
+    clock[0] += 31
+    server["answers"] = [(200, ["ok"])]
+    with pytest.raises(RuntimeError, match="callback"):
+        client.generate("p", on_text=broken)
+    with pytest.raises(CircuitOpenError):
+        client.generate("p")  # the failed trial reopened the circuit
+
+    clock[0] += 31
+    server["answers"] = [(200, ["ok"])]
+    assert client.generate("p") == "ok"  # ...and a new trial is let through
+
+
+def test_endpoint_and_model_from_config(monkeypatch):
+    monkeypatch.delenv(llm_generator.URL_ENV, raising=False)
+    monkeypatch.setenv(llm_generator.MODEL_ENV, "other:7b")
+    client = LLMClient.from_config({"llm_url": "http://gpu:11434/api/generate"})
+    assert client.url == "http://gpu:11434/api/generate"
+    assert client.model == "other:7b"
+    assert LLMClient.from_config({}).url == llm_generator.DEFAULT_URL
+    openai = LLMClient.from_config({"llm_backend": "openai"})
+    assert openai.url.endswith("/v1/chat/completions")
+    with pytest.raises(ValueError, match="Unknown LLM backend"):
+        LLMClient(backend="tgi")
+
+
+def test_streaming_stops_when_the_docstring_is_complete(server):
+    server["answers"] = [
+        (200, ["Add", " two numbers.\n", "\n", "```python\n", "def add(a, b):\n"]),
+        (200, ["Sub", "tract."]),
+    ]
+    client = LLMClient(server["url"])
+    seen = []
+
+    doc = llm_generator.generate_docstring_llm(
+        "def add(a, b): ...", client=client, on_progress=seen.append
+    )
+    assert doc == '"""\nAdd two numbers.\n\n"""'
+    assert seen[:2] == ["Add", "Add two numbers.\n"]
+    summary = client.stream_summary()
+    assert summary["stopped early"] == 1 and summary["tokens"] == 4
+    assert summary["tokens saved"] == llm_generator.GENERATE_OPTIONS["num_predict"] - 4
+    assert summary["mean first token ms"] is not None
+
+    # Without a stop check the whole answer is read
+    assert client.generate("p") == "Subtract."
+    assert client.stream_summary()["stopped early"] == 1
+
+
+def test_instructions_go_in_the_system_part(server):
+    server["answers"] = [(200, "Ready."), (200, "Add numbers.\n")]
+    client = LLMClient(server["url"], keep_alive=600)
+
+    assert client.warm_up(llm_generator.build_system_prompt("Google"))
+    llm_generator.generate_docstring_llm("def add(a, b): ...", client=client)
+    warm, real = server["bodies"]
+    assert warm["system"] == real["system"] and "Style: google" in real["system"]
+    assert not warm["stream"] and warm["options"] == {"num_predict": 1}
+    assert real["prompt"].startswith("Code:\ndef add(a, b)")
+    assert "MANDATORY" not in real["prompt"]
+    assert warm["keep_alive"] == real["keep_alive"] == 600
+
+    # A warm-up is sent once per system prompt
+    assert not client.warm_up(real["system"])
+    assert len(server["bodies"]) == 2
+    summary = client.prompt_summary()
+    assert summary["warm-ups"] == 1 and summary["prompt evals"] == 1
+    assert summary["mean prompt tokens"] == 40
+    assert summary["mean prompt eval ms"] == pytest.approx(20.0)
+
+
+def test_warm_up_failure_is_ignored(monkeypatch):
+    monkeypatch.setattr(llm_generator.time, "sleep", lambda s: None)
+    client = LLMClient("http://127.0.0.1:9/api/generate", retries=0)
+    assert not client.warm_up("system")
+    assert client.stats["failures"] == 0  # the circuit breaker is not fed
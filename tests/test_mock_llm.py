@@ -0,0 +1,60 @@
+import json
+import time
+
+import pytest
+
+pytest.importorskip("requests")  # llm_generator's HTTP client
+
+from autodocstring import injector, llm_generator  # noqa: E402
+from autodocstring.llm_generator import LLMClient, LLMError  # noqa: E402
+from autodocstring.mock_llm import MockLLMServer, load_responses  # noqa: E402
+
+
+@pytest.mark.parametrize("backend", ["ollama", "openai"])
+@pytest.mark.parametrize("stream", [True, False])
+def test_both_wire_formats(backend, stream):
+    with MockLLMServer(answer="Add two numbers.") as server:
+        client = LLMClient(server.url(backend), backend=backend, stream=stream)
+        seen = []
+        answer = client.generate(
+            "Code:\ndef add(a, b): ...", system="Be brief.", on_text=seen.append
+        )
+        assert answer == "Add two numbers."
+        assert seen[-1:] == (["Add two numbers."] if stream else [])
+        assert client.prompt_summary()["prompt evals"] == 1
+        assert server.stats["requests"] == 1 and server.stats["tokens"] == 3
+
+
+def test_recorded_answers_and_batch_slots(tmp_path):
+    recording = tmp_path / "answers.jsonl"
+    recording.write_text(json.dumps({"prompt": "p1", "response": "Recorded."}) + "\n")
+    with MockLLMServer(answer="Canned.", responses=load_responses(recording)) as s:
+        client = LLMClient(s.url())
+        assert client.generate("p1") == "Recorded."
+        assert client.generate("other") == "Canned."
+        docs = llm_generator.generate_docstrings_batch(
+            ["def a(): ...", "def b(): ..."], client=client
+        )
+        assert all("Canned." in d for d in docs)
+
+
+def test_injected_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(llm_generator.time, "sleep", lambda s: None)
+    with MockLLMServer(error_rate=1.0) as server:
+        client = LLMClient(server.url(), retries=2)
+        with pytest.raises(LLMError, match="HTTP 503"):
+            client.generate("p")
+        assert server.stats["errors"] == 3 and client.stats["retries"] == 2
+
+
+def test_slots_cap_the_injector_concurrency(monkeypatch):
+    source = "\n".join(f"def f{i}(x):\n    return x\n" for i in range(6))
+    with MockLLMServer(latency=0.05, slots=2) as server:
+        monkeypatch.setattr(llm_generator, "_default_client", LLMClient(server.url()))
+        started = time.perf_counter()
+        result = injector.inject_docstrings(source, concurrency=6, cache=None)
+        elapsed = time.perf_counter() - started
+    assert result.count("Do the thing.") == 6
+    assert server.stats["requests"] == 6
+    # Six requests of 50 ms through two slots take at least three rounds
+    assert elapsed >= 0.15
@@ -16,3 +16,96 @@ def test_syntax_error(tmp_path):
     f.write_text("def invalid syntax")
     with pytest.raises(SyntaxError):
         parse_file(str(f))
+
+
+def test_raises_and_yields_go_to_nearest_function(tmp_path):
+    f = tmp_path / "nested.py"
+    f.write_text(
+        "def outer():\n"
+        "    def inner():\n"
+        "        raise KeyError\n"
+        "        yield 1\n"
+        "    raise ValueError('x')\n"
+    )
+    result = parse_file(str(f))
+    outer, inner = result["functions"]
+    assert outer["raises"] == ["ValueError('x')"]
+    assert outer["is_generator"] is False
+    assert inner["raises"] == ["KeyError"]
+    assert inner["is_generator"] is True
+
+
+def test_async_functions_and_nested_classes(tmp_path):
+    f = tmp_path / "classes.py"
+    f.write_text(
+        "async def fetch():\n"
+        "    pass\n"
+        "class Outer:\n"
+        "    x = 1\n"
+        "    class Inner:\n"
+        "        async def run(self):\n"
+        "            pass\n"
+        "    def method(self):\n"
+        "        def helper():\n"
+        "            pass\n"
+    )
+    result = parse_file(str(f))
+    assert [fn["name"] for fn in result["functions"]] == ["fetch", "helper"]
+    outer, inner = result["classes"]
+    assert outer["attributes"] == ["x"]
+    assert [m["name"] for m in outer["methods"]] == ["method"]
+    assert inner["methods"][0]["class"] == "Inner"
+
+
+def test_deep_nesting_does_not_recurse():
+    import ast
+    import sys
+
+    from autodocstring.parser import CodeParser
+
+    depth = 90
+    lines = [f"{'    ' * i}def f{i}():" for i in range(depth)]
+    lines.append(f"{'    ' * depth}raise RuntimeError")
+    tree = ast.parse("\n".join(lines))
+
+    parser = CodeParser()
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(100)  # far below what a recursive visitor needs here
+    try:
+        parser.visit(tree)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    assert len(parser.functions) == depth
+    assert parser.functions[-1]["raises"] == ["RuntimeError"]
+    assert all(not fn["raises"] for fn in parser.functions[:-1])
+
+
+def test_records_keep_dict_view(tmp_path):
+    f = tmp_path / "mod.py"
+    f.write_text('class A:\n    def m(self, x: int) -> int:\n        """Doc."""\n')
+    method = parse_file(str(f))["classes"][0]["methods"][0]
+
+    assert method["class"] == method.class_name == "A"
+    assert method.get("missing", "default") == "default"
+    assert method["params"][1]["type"] == "int"
+    assert dict(method)["docstring"] == "Doc."
+    assert method.to_dict()["params"] == [
+        {"name": "self", "type": None},
+        {"name": "x", "type": "int"},
+    ]
+
+
+def test_coverage_only_drops_docstring_bodies(tmp_path):
+    from autodocstring.coverage import coverage_report
+
+    f = tmp_path / "mod.py"
+    f.write_text('def a():\n    """Doc."""\n\ndef b():\n    pass\n')
+    full = parse_file(str(f))
+    slim = parse_file(str(f), coverage_only=True)
+
+    a = slim["functions"][0]
+    assert a["has_docstring"] and a["docstring"] is None and a["docstring_hash"]
+    slim_report, full_report = coverage_report(slim), coverage_report(full)
+    assert slim_report["Coverage (%)"] == full_report["Coverage (%)"]
+    assert slim_report["PEP-257 Compliant"] is None
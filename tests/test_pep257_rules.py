@@ -0,0 +1,141 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from autodocstring.pep257_fixer import run_full_pep257
+from autodocstring.pep257_rules import check_file, check_source, format_violation
+
+SAMPLES = Path(__file__).resolve().parent.parent / "samples"
+
+BAD = '''\
+import os
+__all__ = ["Public", "public_function", "helper"]
+
+
+class Public:
+
+    """This class has a blank line before its docstring"""
+    def __init__(self):
+        pass
+
+    def method(self):
+        \'\'\'Returns something.\'\'\'
+
+        return 1
+
+    def __repr__(self):
+        return ""
+
+    @property
+    def value(self):
+        """The value."""
+
+    @value.setter
+    def value(self, new):
+        pass
+
+
+class Hidden:
+    def method(self):
+        pass
+
+
+def public_function(a, b):
+    """
+    public_function(a, b) -> int
+    Adds two numbers
+    """
+    def inner():
+        pass
+    return a + b
+
+
+def helper():
+    """   """
+
+
+def raw_needed():
+    """Split on \\t tabs."""
+
+
+def sections():
+    """Do things.
+
+    Args:
+
+        x: value
+
+    Todo:
+    """
+'''
+
+
+def _codes(source, filename="mod.py"):
+    return [(v["Line"], v["Code"]) for v in check_source(source, filename)]
+
+
+def test_reports_pydocstyle_codes():
+    codes = _codes(BAD)
+
+    assert (1, "D100") in codes
+    assert {(7, "D211"), (7, "D204"), (7, "D400")} <= set(codes)
+    assert (8, "D107") in codes
+    assert {(12, "D202"), (12, "D300"), (12, "D401")} <= set(codes)
+    assert (16, "D105") in codes
+    assert not any(line in (20, 21, 24, 25) for line, _ in codes)  # property
+    assert not any(line in (28, 29) for line, _ in codes)  # not in __all__
+    assert {(34, "D205"), (34, "D402")} <= set(codes)
+    assert (34, "D202") not in codes  # blank line before an inner def is fine
+    assert (44, "D419") in codes
+    assert (48, "D301") in codes
+    assert {(52, "D412"), (52, "D414")} <= set(codes)
+
+
+def test_messages_and_noqa():
+    source = "def f():  # noqa: D103\n    pass\n\n\ndef g(): pass\n"
+    violations = check_source(source, "pkg/__init__.py")
+
+    assert [v["Code"] for v in violations] == ["D104", "D103"]
+    assert format_violation(violations[1]) == (
+        "pkg/__init__.py:5 in public function `g`:\n"
+        "        D103: Missing docstring in public function"
+    )
+
+
+def test_run_full_pep257_categorizes(tmp_path):
+    f = tmp_path / "mod.py"
+    f.write_text(BAD)
+
+    issues = run_full_pep257(str(f))
+
+    missing = [i for i in issues if i["Code"] == "D107"]
+    assert missing == [
+        {
+            "File": str(f),
+            "Line": 8,
+            "Code": "D107",
+            "Category": "Missing Docstrings",
+            "Message": "Missing docstring in __init__",
+            "Fix": "Manual fix required",
+        }
+    ]
+
+
+def test_parity_with_pydocstyle(tmp_path):
+    pytest.importorskip("pydocstyle")
+    for sample in SAMPLES.glob("*.py"):
+        shutil.copy(sample, tmp_path / sample.name.replace("test_", "sample_"))
+    (tmp_path / "bad.py").write_text(BAD)
+    files = sorted(str(f) for f in tmp_path.glob("*.py"))
+
+    result = subprocess.run(
+        [sys.executable, "-m", "pydocstyle", "--convention=pep257", *files],
+        capture_output=True,
+        text=True,
+    )
+
+    ours = [format_violation(v) for f in files for v in check_file(f)]
+    assert "\n".join(ours) == result.stdout.rstrip("\n")
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from autodocstring import profiling
+
+SAMPLES = Path(__file__).resolve().parent.parent / "samples"
+
+
+def test_hooks_are_noops_when_disabled():
+    assert not profiling.enabled()
+    assert profiling.stage("parse") is profiling.stage("other")
+    profiling.count("files")
+    assert profiling.collect() is None
+
+    profile = profiling.enable()
+    try:
+        with profiling.stage("parse"):
+            profiling.count("files", 2)
+        profiling.file_done("a.py", 0.5)
+        assert profiling.collect()["counters"] == {"files": 2}
+    finally:
+        profiling.disable()
+    assert profile.stages["parse"][1] == 1
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_profile_json(tmp_path, jobs):
+    out = tmp_path / "profile.json"
+    result = subprocess.run(
+        [sys.executable, "-m", "autodocstring.cli", str(SAMPLES), "--no-cache"]
+        + ["--jobs", jobs, "--profile", "--profile-json", str(out)]
+        + ["--profile-top", "2"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Slowest 2 file(s):" in result.stdout
+
+    data = json.loads(out.read_text())
+    files = len(list(SAMPLES.glob("*.py")))
+    assert data["counters"]["files analyzed"] == files
+    assert data["stages"]["ast.parse"]["calls"] == files
+    assert len(data["slowest_files"]) == 2
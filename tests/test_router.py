@@ -0,0 +1,139 @@
+import ast
+
+import pytest
+
+pytest.importorskip("requests")  # llm_generator's HTTP client
+
+from autodocstring import injector, router  # noqa: E402
+from autodocstring.config import load_config  # noqa: E402
+from autodocstring.router import ModelRouter, Route, features  # noqa: E402
+from autodocstring.tiers import function_record  # noqa: E402
+
+SOURCE = """
+def size(box):
+    return box.size
+
+
+def parse(text, strict):
+    for line in text.splitlines():
+        if strict and not line:
+            raise ValueError("empty line")
+    return text
+"""
+
+GOOD = {
+    "size": '"""\nReturn the size.\n\nArgs:\n    box: The box.\n"""',
+    "parse": '"""\nParse text.\n\nArgs:\n    text: Input.\n    strict: Fail on '
+    'blanks.\n\nReturns:\n    The text.\n\nRaises:\n    ValueError: On blanks.\n"""',
+}
+
+
+class FakeClient:
+    def __init__(self, model="base"):
+        self.model = model
+
+    def with_model(self, model):
+        return FakeClient(model)
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Small models answer with a bare summary, "big" with a full docstring."""
+    asked = []
+
+    def fake_llm(code, style, client, **options):
+        name = ast.parse(code).body[0].name
+        asked.append((client.model, name))
+        return GOOD[name] if client.model == "big" else '"""\nDo it.\n"""'
+
+    monkeypatch.setattr(router, "generate_docstring_llm", fake_llm)
+    return asked
+
+
+def _target(name):
+    node = next(n for n in ast.parse(SOURCE).body if n.name == name)
+    return function_record(node), node
+
+
+def test_routes_by_size_and_escalates_on_rejection(answers):
+    routes = [
+        Route("tiny", max_lines=3, max_complexity=1),
+        Route("small", max_raises=0),
+        Route("big"),
+    ]
+    models = ModelRouter(routes, client=FakeClient())
+    record, node = _target("parse")
+    assert features(record, node)["complexity"] == 5
+    assert models.route(features(*_target("size"))) == 0
+    assert models.route(features(record, node)) == 2
+
+    doc = models.generate(ast.unparse(node), "Google", record=record, node=node)
+    assert doc == GOOD["parse"] and answers == [("big", "parse")]
+
+    record, node = _target("size")
+    models.generate(ast.unparse(node), "Google", record=record, node=node)
+    # "Do it." documents no parameters, so tiny's answer is rejected
+    assert answers[1:] == [("tiny", "size"), ("small", "size"), ("big", "size")]
+    summary = models.summary()
+    assert summary["tiny"]["acceptance"] == 0.0
+    assert summary["big"]["calls"] == 2 and summary["big"]["acceptance"] == 1.0
+    assert summary["small"]["mean ms"] is not None
+
+
+def test_without_escalation_the_first_answer_is_kept(answers):
+    models = ModelRouter([Route("tiny"), Route("big")], escalate=False)
+    models._client = FakeClient()
+    record, node = _target("size")
+    assert models.generate("def size(box): ...", record=record, node=node) == (
+        '"""\nDo it.\n"""'
+    )
+    assert models.stats["tiny"]["rejected"] == 1 and not models.stats["big"]
+
+
+def test_cache_hits_are_counted_apart_from_calls(monkeypatch, tmp_path):
+    from autodocstring.llm_cache import LLMCache
+
+    asked = []
+
+    def cached_llm(code, style, client, cache=None, **options):
+        def ask():
+            asked.append(client.model)
+            return GOOD["size"]
+
+        return cache.get(client.model + code, ask) if cache is not None else ask()
+
+    monkeypatch.setattr(router, "generate_docstring_llm", cached_llm)
+    models = ModelRouter([Route("tiny")], client=FakeClient())
+    record, node = _target("size")
+    with LLMCache(tmp_path) as cache:
+        for _ in range(3):
+            models.generate("def size(box): ...", record=record, node=node, cache=cache)
+    assert asked == ["tiny"]
+    summary = models.summary()["tiny"]
+    assert summary["calls"] == 1 and summary["cache hits"] == 2
+    assert models.stats["tiny"]["accepted"] == 1
+
+
+def test_router_from_config(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        "[tool.autodocstring]\nllm-routes = [\n"
+        "  { model = 'tiny', max-lines = 10 },\n  { model = 'big' },\n]\n"
+    )
+    models = ModelRouter.from_config(load_config(pyproject))
+    assert [r.model for r in models.routes] == ["tiny", "big"]
+    assert models.routes[0].limits == {"max_lines": 10}
+    assert ModelRouter.from_config(load_config(tmp_path / "none.toml")) is None
+    with pytest.raises(ValueError, match="max_width"):
+        Route("m", max_width=3)
+
+
+def test_injector_uses_the_router(answers):
+    models = ModelRouter(
+        [Route("tiny", max_complexity=1), Route("big")], client=FakeClient()
+    )
+    result = injector.inject_docstrings(
+        SOURCE, cache=None, concurrency=1, router=models
+    )
+    assert sorted(answers) == [("big", "parse"), ("big", "size"), ("tiny", "size")]
+    assert "ValueError: On blanks." in result
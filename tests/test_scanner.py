@@ -0,0 +1,89 @@
+import time
+import subprocess
+import sys
+
+from autodocstring import scanner
+from autodocstring.scanner import check_file, run_checks
+
+
+def _write_files(tmp_path):
+    files = []
+    for i in range(7):
+        f = tmp_path / f"mod{i}.py"
+        if i % 2:
+            f.write_text(f'def f{i}():\n    """Doc."""\n')
+        else:
+            f.write_text(f"def f{i}():\n    pass\n")
+        files.append(f)
+    bad = tmp_path / "bad.py"
+    bad.write_text("def invalid syntax")
+    files.insert(3, bad)
+    return files
+
+
+def test_parallel_matches_serial(tmp_path):
+    files = _write_files(tmp_path)
+
+    serial = run_checks(files, jobs=1)
+    parallel = run_checks(files, jobs=3)
+
+    assert [r["path"] for r in parallel] == files
+    assert [r["error"] for r in parallel] == [r["error"] for r in serial]
+    assert [r["report"] for r in parallel] == [r["report"] for r in serial]
+    assert parallel[3]["error"].startswith("SyntaxError")
+
+
+def test_check_file_timeout(tmp_path, monkeypatch):
+    f = tmp_path / "slow.py"
+    f.write_text("def f(): pass")
+    monkeypatch.setattr(scanner, "parse_file", lambda path: time.sleep(2))
+
+    result = check_file(f, timeout=0.2)
+
+    assert result["report"] is None
+    assert result["error"].startswith("TimeoutError")
+
+
+def test_cli_jobs_keeps_summary(tmp_path):
+    files = _write_files(tmp_path)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "autodocstring.cli", str(tmp_path), "--jobs", "2"],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 1
+    assert f"Checking {len(files)} file(s)" in result.stdout
+    assert "Error processing" in result.stdout
+    assert "Failed: 5 file(s)" in result.stdout
+
+
+def test_iter_scan_streams_results(tmp_path):
+    from autodocstring import iter_scan
+
+    files = _write_files(tmp_path)
+    results = iter_scan([tmp_path])
+
+    first = next(results)  # available before the rest of the tree is scanned
+    rest = list(results)
+    assert len(rest) + 1 == len(files)
+    assert {str(r["path"]) for r in [first, *rest]} == {str(f) for f in files}
+
+
+def test_cli_jsonl_output(tmp_path):
+    import json
+
+    files = _write_files(tmp_path)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "autodocstring.cli", str(tmp_path), "--format=jsonl"],
+        capture_output=True,
+        text=True,
+    )
+
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert result.returncode == 1
+    assert len(records) == len(files)
+    assert {r["status"] for r in records} == {"passed", "failed", "error"}
+    assert "Failed: 5 file(s)" in result.stderr
@@ -0,0 +1,122 @@
+import ast
+
+import pytest
+
+from autodocstring.config import load_config
+from autodocstring.tiers import TierPolicy, complexity, function_record
+
+SOURCE = '''
+class Box:
+    def size(self):
+        return self._size
+
+    def documented(self, value):
+        """
+        Store a value.
+
+        Args:
+            value: What to store.
+        """
+        self.value = value
+
+    def parse(self, text):
+        def clean(line):
+            return line.strip()
+
+        for line in text.splitlines():
+            if not line:
+                raise ValueError("empty line")
+            yield clean(line)
+'''
+
+
+def _defs(source):
+    return {
+        node.name: node
+        for node in ast.walk(ast.parse(source))
+        if isinstance(node, ast.FunctionDef)
+    }
+
+
+def test_complexity_ignores_nested_defs():
+    defs = _defs(SOURCE)
+    assert complexity(defs["size"]) == 1
+    assert complexity(defs["clean"]) == 1
+    # for, if, raise, yield
+    assert complexity(defs["parse"]) == 5
+    assert complexity(_defs("def f(a, b, c):\n    return a and b or c\n")["f"]) == 3
+
+
+def test_policy_tiers():
+    defs = _defs(SOURCE)
+    policy = TierPolicy()
+
+    def tier(name, nested=False):
+        record = function_record(defs[name], "Box")
+        return policy.choose(record, defs[name], "Google", nested)
+
+    assert tier("documented") == "kept"
+    assert tier("size") == "templated"
+    assert tier("parse") == "llm"
+    assert tier("clean", nested=True) == "templated"
+    assert (
+        TierPolicy(nested="skip").choose(
+            function_record(defs["clean"]), defs["clean"], "Google", True
+        )
+        == "skipped"
+    )
+    with pytest.raises(ValueError, match="nested"):
+        TierPolicy(nested="never")
+
+
+def test_existing_docstrings_are_never_templated():
+    defs = _defs(
+        "def outer(x):\n    'todo'\n"
+        "    def inner(y):\n        'helper'\n        return y\n"
+        "    return inner(x)\n"
+    )
+    policy = TierPolicy()
+
+    def tier(name, nested=False):
+        return policy.choose(function_record(defs[name]), defs[name], "Google", nested)
+
+    # Simple, but its (failing) docstring is a human's: the LLM rewrites it
+    assert tier("outer") == "llm"
+    assert tier("inner", nested=True) == "skipped"
+
+
+def test_policy_from_config(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        "[tool.autodocstring]\ntiers = true\ntier-template-below = 4\n"
+        "tier-nested = 'llm'\n"
+    )
+    policy = TierPolicy.from_config(load_config(pyproject))
+    assert policy.template_below == 4 and policy.nested == "llm"
+    assert TierPolicy.from_config(load_config(tmp_path / "none.toml")) is None
+
+
+def test_injector_sends_only_the_llm_tier(monkeypatch):
+    pytest.importorskip("requests")  # llm_generator's HTTP client
+    from autodocstring import injector
+
+    asked = []
+
+    def fake_llm(source, style, **options):
+        asked.append(ast.parse(source).body[0].name)
+        return "Parse the lines."
+
+    monkeypatch.setattr(injector, "generate_docstring_llm", fake_llm)
+    tiers = {}
+    result = injector.inject_docstrings(
+        SOURCE, cache=None, concurrency=1, policy=TierPolicy(), tiers=tiers
+    )
+    assert asked == ["parse"]
+    assert tiers == {"templated": 2, "kept": 1, "llm": 1}
+    defs = _defs(result)
+    assert ast.get_docstring(defs["size"]).strip() == (
+        "Generate documentation for Box.size."
+    )
+    assert "line (Any)" in ast.get_docstring(defs["clean"])
+    assert ast.get_docstring(defs["documented"]).startswith("Store a value.")
+    assert ast.get_docstring(defs["parse"]).strip() == "Parse the lines."
@@ -0,0 +1,157 @@
+import time
+from pathlib import Path
+
+from autodocstring import walker
+from autodocstring.config import load_config
+from autodocstring.walker import Matcher, RuleSet, iter_files
+
+
+def _tree(root, paths):
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+
+
+def _found(root, matcher, **kwargs):
+    return sorted(
+        p.relative_to(root).as_posix() for p in iter_files([root], matcher, **kwargs)
+    )
+
+
+def test_prunes_ignore_dirs_and_gitignore(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _tree(
+        tmp_path,
+        [
+            "pkg/a.py",
+            "pkg/gen/out.py",
+            "pkg/notes.txt",
+            ".venv/lib/site.py",
+            "node_modules/x/y.py",
+            "demo.egg-info/z.py",
+            "build/b.py",
+            "scratch_1.py",
+            "keep/scratch_2.py",
+        ],
+    )
+    (tmp_path / ".gitignore").write_text("scratch_*.py\n!keep/scratch_2.py\n")
+    (tmp_path / "pkg" / ".gitignore").write_text("gen/\n")
+
+    assert _found(tmp_path, Matcher()) == ["keep/scratch_2.py", "pkg/a.py"]
+    assert _found(tmp_path, Matcher(gitignore=False, ignore_dirs=[".venv"])) == [
+        "build/b.py",
+        "demo.egg-info/z.py",
+        "keep/scratch_2.py",
+        "node_modules/x/y.py",
+        "pkg/a.py",
+        "pkg/gen/out.py",
+        "scratch_1.py",
+    ]
+
+
+def test_pruned_directories_are_never_listed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _tree(tmp_path, ["src/a.py", ".venv/lib/b.py"])
+    listed = []
+    scan = Matcher._scan
+
+    def spy(self, directory, *args):
+        listed.append(Path(directory).name)
+        return scan(self, directory, *args)
+
+    monkeypatch.setattr(Matcher, "_scan", spy)
+    assert _found(tmp_path, Matcher()) == ["src/a.py"]
+    assert ".venv" not in listed and "lib" not in listed
+
+
+def test_exclude_and_include_globs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _tree(tmp_path, ["src/a.py", "src/a_test.py", "src/migrations/m.py", "c.pyi"])
+
+    matcher = Matcher(exclude=["*_test.py", "src/migrations"])
+    assert _found(tmp_path, matcher) == ["src/a.py"]
+    # Relative to the current directory, also when walking a subfolder
+    assert _found(tmp_path, matcher) == _found(
+        tmp_path, Matcher(exclude=["/src/migrations/", "a_test.py"])
+    )
+    assert [p.name for p in iter_files(["src"], matcher)] == ["a.py"]
+    assert _found(tmp_path, Matcher(include=["*.pyi"])) == ["c.pyi"]
+    assert not matcher.wants("src/a_test.py") and matcher.wants("src/b.py")
+    assert matcher.skips("src/migrations") and matcher.skips("x/.venv")
+
+
+def test_outer_gitignore_applies_to_subfolder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("/src/vendored/\n")
+    _tree(tmp_path, ["src/a.py", "src/vendored/v.py"])
+
+    assert [p.name for p in iter_files([tmp_path / "src"])] == ["a.py"]
+
+
+def test_ruleset_last_match_wins():
+    rules = RuleSet(["# comment", "*.py", "!keep.py", "logs/", "/top.txt"])
+    assert rules.match("a/b.py", False) is True
+    assert rules.match("a/keep.py", False) is False
+    assert rules.match("x/logs", True) is True
+    assert rules.match("x/logs", False) is None
+    assert rules.match("top.txt", False) and not rules.match("a/top.txt", False)
+
+
+def test_parallel_walk_finds_the_same_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = [f"d{i}/s{j}/m{k}.py" for i in range(4) for j in range(3) for k in "ab"]
+    _tree(tmp_path, paths)
+    (tmp_path / "d1" / ".gitignore").write_text("s2/\n")
+
+    serial = _found(tmp_path, Matcher(), jobs=1)
+    assert len(serial) == 22
+    assert _found(tmp_path, Matcher(), jobs=4) == serial
+
+
+def test_parallel_walk_keeps_the_serial_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _tree(tmp_path, [f"d{i}/s{j}/m.py" for i in range(4) for j in range(3)])
+    scan = Matcher._scan
+
+    def slow_first(self, directory, *args):
+        # Early folders finish last, so completion order would differ
+        if Path(directory).name in ("d0", "s0"):
+            time.sleep(0.05)
+        return scan(self, directory, *args)
+
+    monkeypatch.setattr(Matcher, "_scan", slow_first)
+    serial = list(Matcher().walk(tmp_path, jobs=1))
+    assert list(Matcher().walk(tmp_path, jobs=4)) == serial
+    assert list(iter_files([tmp_path], jobs=4)) == list(iter_files([tmp_path], jobs=1))
+
+
+def test_network_mounts_walk_in_parallel(monkeypatch):
+    mounts = [("/", "ext4"), ("/mnt/share", "nfs4"), ("/mnt/share/local", "tmpfs")]
+    monkeypatch.setattr(walker, "_mounts", lambda: mounts)
+    monkeypatch.setattr(walker.sys, "platform", "linux")
+    monkeypatch.setattr(walker.os.path, "realpath", lambda p: p)
+
+    assert walker.resolve_walk_jobs("/mnt/share/repo") == walker.NETWORK_WALK_JOBS
+    assert walker.resolve_walk_jobs("/mnt/share/local/repo") == 1
+    assert walker.resolve_walk_jobs("/mnt/sharemore") == 1
+    assert walker.resolve_walk_jobs("/mnt/share/repo", jobs=2) == 2
+
+
+def test_load_config_reads_tool_autodocstring(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        "[tool.autodoc]\nstyle = 'NumPy'\nmin_coverage = 50\n\n"
+        "[tool.autodocstring]\nmin-coverage = 90.0\n"
+        "ignore-dirs = ['generated']\nexclude = ['*_pb2.py']\n"
+    )
+    config = load_config(pyproject)
+    assert config["style"] == "NumPy"
+    assert config["min_coverage"] == 90.0
+    assert config["ignore_dirs"] == ["generated"]
+    assert config["include"] == ["*.py"]
+
+    matcher = Matcher.from_config(config, exclude=["old/"])
+    assert {"generated", ".venv"} <= matcher.dir_names
+    assert load_config(tmp_path / "missing.toml")["ignore_dirs"] == []
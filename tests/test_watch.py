@@ -0,0 +1,93 @@
+import sys
+import errno
+
+import pytest
+
+from autodocstring.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    Totals,
+    _Roots,
+    format_delta,
+)
+
+
+def _report(total, documented, compliant=0):
+    return {"Total": total, "Documented": documented, "PEP-257 Compliant": compliant}
+
+
+def test_totals_update_incrementally():
+    totals = Totals()
+    totals.update("a.py", _report(4, 2))
+    totals.update("b.py", _report(6, 4, 3))
+    before = totals.state()
+    assert before["Coverage (%)"] == 60
+
+    totals.update("a.py", _report(4, 4, 1))  # replaces a.py's numbers
+    totals.update("b.py")  # deleted
+    after = totals.state()
+    assert after == {
+        "Total": 4,
+        "Documented": 4,
+        "Coverage (%)": 100,
+        "PEP-257 Compliance (%)": 25,
+    }
+    assert format_delta(before, after) == (
+        "-2 documented, -6 items, coverage 60.0% → 100.0%, PEP-257 30.0% → 25.0%"
+    )
+
+
+def _watcher(kind, tmp_path):
+    if kind == "polling":
+        return PollingWatcher(_Roots([tmp_path]), interval=0.01)
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify needs Linux")
+    return InotifyWatcher(_Roots([tmp_path]), debounce=0.05)
+
+
+@pytest.mark.parametrize("kind", ["polling", "inotify"])
+def test_watchers_report_edits_renames_and_new_folders(tmp_path, kind):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    watcher = _watcher(kind, tmp_path)
+    try:
+        # An editor saving through a temp file and rename
+        (tmp_path / ".a.py.swp").write_text("x = 22\n")
+        (tmp_path / ".a.py.swp").rename(tmp_path / "a.py")
+        assert watcher.changes() == {tmp_path / "a.py"}
+
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "b.py").write_text("y = 1\n")
+        (tmp_path / "notes.txt").write_text("ignored\n")
+        assert tmp_path / "pkg" / "b.py" in watcher.changes()
+
+        (tmp_path / "a.py").unlink()
+        assert tmp_path / "a.py" in watcher.changes()
+    finally:
+        watcher.close()
+
+
+def test_unwatchable_folders_are_polled(tmp_path, monkeypatch):
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify needs Linux")
+    add = InotifyWatcher._add
+
+    def limited(self, directory):
+        if directory.name.startswith("full"):
+            raise OSError(errno.ENOSPC, "inotify watch limit reached")
+        add(self, directory)
+
+    monkeypatch.setattr(InotifyWatcher, "_add", limited)
+    (tmp_path / "full").mkdir()
+    watcher = InotifyWatcher(_Roots([tmp_path]), debounce=0.05, poll_interval=0.05)
+    try:
+        assert set(watcher.unwatched) == {tmp_path / "full"}
+        (tmp_path / "full" / "a.py").write_text("x = 1\n")
+        assert watcher.changes() == {tmp_path / "full" / "a.py"}
+
+        # A new folder past the limit is polled too, instead of crashing
+        (tmp_path / "full2").mkdir()
+        (tmp_path / "full2" / "b.py").write_text("y = 1\n")
+        assert watcher.changes() == {tmp_path / "full2" / "b.py"}
+        assert tmp_path / "full2" in watcher.unwatched
+    finally:
+        watcher.close()